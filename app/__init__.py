@@ -1 +1 @@
-# Aplicación con Arquitectura en Capas
+# Aplicación con Arquitectura en Capas
@@ -1,97 +1,166 @@
-"""
-Configuración del Admin - ARQUITECTURA EN CAPAS
-"""
-
-from django.contrib import admin
-from .data.models import CustomUser, Lugar, Evento
-
-
-@admin.register(CustomUser)
-class CustomUserAdmin(admin.ModelAdmin):
-    """Admin para usuarios personalizados"""
-    list_display = ('username', 'email', 'is_staff', 'is_active', 'date_joined')
-    list_filter = ('is_staff', 'is_active', 'date_joined')
-    search_fields = ('username', 'email', 'bio')
-    ordering = ('-date_joined',)
-    
-    fieldsets = (
-        ('Información Básica', {
-            'fields': ('username', 'email', 'password')
-        }),
-        ('Información Personal', {
-            'fields': ('bio', 'telefono')
-        }),
-        ('Permisos', {
-            'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')
-        }),
-        ('Fechas', {
-            'fields': ('last_login', 'date_joined')
-        }),
-    )
-    
-    readonly_fields = ('last_login', 'date_joined')
-
-
-@admin.register(Lugar)
-class LugarAdmin(admin.ModelAdmin):
-    """Admin para lugares"""
-    list_display = ('nombre', 'direccion', 'activo', 'creado_por', 'fecha_creacion')
-    list_filter = ('activo', 'fecha_creacion')
-    search_fields = ('nombre', 'descripcion', 'direccion')
-    ordering = ('-fecha_creacion',)
-    
-    fieldsets = (
-        ('Información Básica', {
-            'fields': ('nombre', 'descripcion', 'direccion')
-        }),
-        ('Ubicación', {
-            'fields': ('latitud', 'longitud', 'url_mapa'),
-            'description': 'Coordenadas geográficas del lugar'
-        }),
-        ('Metadata', {
-            'fields': ('activo', 'creado_por', 'fecha_creacion')
-        }),
-    )
-    
-    readonly_fields = ('fecha_creacion',)
-    
-    def save_model(self, request, obj, form, change):
-        """Asignar usuario creador si es nuevo"""
-        if not change:  # Si es un objeto nuevo
-            obj.creado_por = request.user
-        super().save_model(request, obj, form, change)
-
-
-@admin.register(Evento)
-class EventoAdmin(admin.ModelAdmin):
-    """Admin para eventos"""
-    list_display = ('titulo', 'lugar', 'fecha_inicio', 'capacidad_maxima', 'plazas_disponibles', 'esta_lleno', 'activo')
-    list_filter = ('activo', 'fecha_inicio', 'lugar')
-    search_fields = ('titulo', 'descripcion', 'lugar__nombre')
-    ordering = ('-fecha_inicio',)
-    filter_horizontal = ('inscritos',)
-    
-    fieldsets = (
-        ('Información Básica', {
-            'fields': ('titulo', 'descripcion', 'lugar')
-        }),
-        ('Fechas', {
-            'fields': ('fecha_inicio', 'fecha_fin')
-        }),
-        ('Capacidad', {
-            'fields': ('capacidad_maxima', 'inscritos'),
-            'description': 'Gestión de capacidad y participantes'
-        }),
-        ('Estado', {
-            'fields': ('activo',)
-        }),
-    )
-    
-    readonly_fields = ('plazas_disponibles', 'esta_lleno')
-    
-    def get_readonly_fields(self, request, obj=None):
-        """Campos de solo lectura dinámicos"""
-        readonly = list(self.readonly_fields)
-        if obj:  # Si está editando
-            readonly.extend(['plazas_disponibles', 'esta_lleno'])
-        return readonly
+"""
+Configuración del Admin - ARQUITECTURA EN CAPAS
+"""
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count
+from django.template.response import TemplateResponse
+from django.urls import path
+from .business.importacion_logic import ImportacionLogic
+from .data.models import CustomUser, Lugar, Evento, EventoArchivado
+from .presentation.forms import ImportarLugaresForm
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    """Admin para usuarios personalizados"""
+    list_display = ('username', 'email', 'is_staff', 'is_active', 'date_joined')
+    list_filter = ('is_staff', 'is_active', 'date_joined')
+    search_fields = ('username', 'email', 'bio')
+    ordering = ('-date_joined',)
+
+    fieldsets = (
+        ('Información Básica', {
+            'fields': ('username', 'email', 'password')
+        }),
+        ('Información Personal', {
+            'fields': ('bio', 'telefono')
+        }),
+        ('Permisos', {
+            'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')
+        }),
+        ('Fechas', {
+            'fields': ('last_login', 'date_joined')
+        }),
+    )
+
+    readonly_fields = ('last_login', 'date_joined')
+
+
+@admin.register(Lugar)
+class LugarAdmin(admin.ModelAdmin):
+    """Admin para lugares"""
+    list_display = ('nombre', 'direccion', 'activo', 'creado_por', 'fecha_creacion')
+    list_filter = ('activo', 'fecha_creacion')
+    search_fields = ('nombre', 'descripcion', 'direccion')
+    ordering = ('-fecha_creacion',)
+    change_list_template = 'admin/app/lugar/change_list.html'  # Botón "Importar"
+
+    fieldsets = (
+        ('Información Básica', {
+            'fields': ('nombre', 'descripcion', 'direccion')
+        }),
+        ('Ubicación', {
+            'fields': ('latitud', 'longitud', 'url_mapa'),
+            'description': 'Coordenadas geográficas del lugar'
+        }),
+        ('Metadata', {
+            'fields': ('activo', 'creado_por', 'fecha_creacion')
+        }),
+    )
+
+    readonly_fields = ('fecha_creacion',)
+
+    def save_model(self, request, obj, form, change):
+        """Asignar usuario creador si es nuevo"""
+        if not change:  # Si es un objeto nuevo
+            obj.creado_por = request.user
+        super().save_model(request, obj, form, change)
+
+    def get_urls(self):
+        """URL extra para la importación masiva (lugar/importar/)"""
+        extra = [
+            path('importar/', self.admin_site.admin_view(self.importar_view), name='app_lugar_importar'),
+        ]
+        return extra + super().get_urls()
+
+    def importar_view(self, request):
+        """Subir un CSV o GeoJSON de lugares y mostrar el informe por fila"""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = ImportarLugaresForm(request.POST or None, request.FILES or None)
+        resultado = None
+        if request.method == 'POST' and form.is_valid():
+            archivo = form.cleaned_data['archivo']
+            formato = ImportacionLogic.formato_de(archivo.name)
+            if formato is None:
+                form.add_error('archivo', 'Extensión no soportada: use .csv, .geojson o .json')
+            else:
+                # Llamar a la CAPA DE NEGOCIO
+                resultado = ImportacionLogic.importar_lugares(
+                    archivo, formato,
+                    usuario=request.user,
+                    simular=form.cleaned_data['simular']
+                )
+                if not resultado['exito']:
+                    nivel = messages.ERROR
+                elif resultado['errores']:
+                    nivel = messages.WARNING
+                else:
+                    nivel = messages.SUCCESS
+                self.message_user(request, resultado['mensaje'], nivel)
+
+        return TemplateResponse(request, 'admin/app/lugar/importar.html', {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Importar lugares',
+            'form': form,
+            'resultado': resultado,
+        })
+
+
+@admin.register(Evento)
+class EventoAdmin(admin.ModelAdmin):
+    """Admin para eventos"""
+    list_display = ('titulo', 'lugar', 'fecha_inicio', 'capacidad_maxima', 'plazas_disponibles', 'esta_lleno', 'activo')
+    list_filter = ('activo', 'fecha_inicio', 'lugar')
+    search_fields = ('titulo', 'descripcion', 'lugar__nombre')
+    ordering = ('-fecha_inicio',)
+    filter_horizontal = ('inscritos',)
+    list_select_related = ('lugar',)
+
+    fieldsets = (
+        ('Información Básica', {
+            'fields': ('titulo', 'descripcion', 'lugar')
+        }),
+        ('Fechas', {
+            'fields': ('fecha_inicio', 'fecha_fin')
+        }),
+        ('Capacidad', {
+            'fields': ('capacidad_maxima', 'inscritos'),
+            'description': 'Gestión de capacidad y participantes'
+        }),
+        ('Estado', {
+            'fields': ('activo',)
+        }),
+    )
+
+    readonly_fields = ('plazas_disponibles', 'esta_lleno')
+
+    def get_readonly_fields(self, request, obj=None):
+        """Campos de solo lectura dinámicos"""
+        readonly = list(self.readonly_fields)
+        if obj:  # Si está editando
+            readonly.extend(['plazas_disponibles', 'esta_lleno'])
+        return readonly
+
+    def get_queryset(self, request):
+        """Anotar num_inscritos: plazas_disponibles/esta_lleno sin consulta por fila"""
+        return super().get_queryset(request).annotate(num_inscritos=Count('inscritos'))
+
+
+@admin.register(EventoArchivado)
+class EventoArchivadoAdmin(admin.ModelAdmin):
+    """Admin de solo lectura para el historial de eventos"""
+    list_display = ('titulo', 'lugar_nombre', 'fecha_inicio', 'total_inscritos', 'activo', 'fecha_archivado')
+    list_filter = ('activo', 'fecha_archivado')
+    search_fields = ('titulo', 'lugar_nombre')
+    ordering = ('-fecha_inicio',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
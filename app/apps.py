@@ -1,11 +1,43 @@
-"""
-Configuración de la aplicación
-"""
-
-from django.apps import AppConfig
-
-
-class AppConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'app'
-    verbose_name = 'Aplicación en Capas'
+"""
+Configuración de la aplicación
+"""
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+class AppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app'
+    verbose_name = 'Aplicación en Capas'
+
+    def ready(self):
+        from . import checks  # Registra los chequeos de rendimiento (--deploy)
+        from .data.sqlite_pragmas import aplicar_pragmas
+
+        # PRAGMAs de SQLite por conexión (perfil de producción)
+        connection_created.connect(aplicar_pragmas, dispatch_uid='app_sqlite_pragmas')
+
+        # Caché de listas: nueva versión al cambiar lugares, eventos o inscripciones
+        from .business import cache_versionada
+        cache_versionada.conectar_senales()
+
+        # Tombstones de la sincronización incremental para lo eliminado o archivado
+        from .business import sync_logic
+        sync_logic.conectar_senales()
+
+        # Registro de consultas lentas (JSONL rotativo)
+        if getattr(settings, 'CONSULTAS_LENTAS_MS', None) is not None:
+            connection_created.connect(_instalar_consultas_lentas, dispatch_uid='app_consultas_lentas')
+
+        # Métricas de la capa de negocio (opt-in)
+        if getattr(settings, 'INSTRUMENTAR_LOGICA', False):
+            from .business import metricas
+            metricas.activar()
+
+
+def _instalar_consultas_lentas(sender, connection, **kwargs):
+    """Receptor de connection_created: el módulo se importa con la primera conexión, no al arrancar"""
+    from .data import consultas_lentas
+    consultas_lentas.instalar(sender, connection, **kwargs)
@@ -1 +1 @@
-# Capa de Negocio - Lógica de negocio y validaciones
+# Capa de Negocio - Lógica de negocio y validaciones
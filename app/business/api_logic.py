@@ -0,0 +1,176 @@
+"""
+CAPA DE NEGOCIO - Lógica de la API de lectura
+Listados para clientes móviles y kioscos: filas planas (values()), selección
+de campos (?fields=) y paginación por cursor sobre el ID, que no se degrada
+con el número de página como OFFSET
+"""
+
+import base64
+from ..data.repositories import LugarRepository, EventoRepository
+
+
+class ApiLogic:
+    """
+    Lógica de negocio para los listados de la API
+    """
+
+    # Recurso → (repositorio, campos permitidos, campos por defecto)
+    # Los calculados (lugar_nombre, num_inscritos, plazas_disponibles) solo se
+    # consultan si se piden
+    _CAMPOS_EVENTO = (
+        'id', 'titulo', 'descripcion', 'fecha_inicio', 'fecha_fin', 'lugar_id', 'lugar_nombre',
+        'capacidad_maxima', 'num_inscritos', 'plazas_disponibles', 'fecha_actualizacion',
+    )
+    RECURSOS = {
+        'lugares': (
+            LugarRepository,
+            ('id', 'nombre', 'descripcion', 'direccion', 'latitud', 'longitud', 'url_mapa',
+             'fecha_actualizacion'),
+            ('id', 'nombre', 'direccion', 'latitud', 'longitud'),
+        ),
+        'eventos': (
+            EventoRepository,
+            _CAMPOS_EVENTO,
+            ('id', 'titulo', 'fecha_inicio', 'fecha_fin', 'lugar_id', 'capacidad_maxima'),
+        ),
+        'mis_inscripciones': (
+            EventoRepository,
+            _CAMPOS_EVENTO,
+            ('id', 'titulo', 'fecha_inicio', 'fecha_fin', 'lugar_id'),
+        ),
+    }
+
+    LIMITE_MAXIMO = 500
+
+    @staticmethod
+    def listar(recurso, campos=None, cursor=None, limite=50, query='', user_id=None):
+        """
+        Una página de un recurso a partir del cursor
+
+        Args:
+            recurso (str): 'lugares', 'eventos' o 'mis_inscripciones'
+            campos (str, optional): Campos separados por comas (?fields=)
+            cursor (str, optional): Cursor devuelto por la página anterior
+            limite (int): Máximo de resultados
+            query (str): Término de búsqueda
+            user_id (int): Usuario (obligatorio en 'mis_inscripciones')
+
+        Returns:
+            dict: {'exito': bool, 'mensaje': str, 'resultados': list,
+                   'cursor': str, 'hay_mas': bool}
+        """
+        consulta = ApiLogic._preparar(recurso, campos, cursor, limite, query, user_id)
+        if not consulta['exito']:
+            return consulta
+
+        filas = consulta['repositorio'].obtener_filas(*consulta['argumentos'], **consulta['filtros'])
+        return ApiLogic._resultado(filas, consulta['limite'])
+
+    @staticmethod
+    async def alistar(recurso, campos=None, cursor=None, limite=50, query='', user_id=None):
+        """listar() con el ORM async (mismos argumentos y resultado)"""
+        consulta = ApiLogic._preparar(recurso, campos, cursor, limite, query, user_id)
+        if not consulta['exito']:
+            return consulta
+
+        filas = [
+            fila async for fila in
+            consulta['repositorio'].consulta_filas(*consulta['argumentos'], **consulta['filtros'])
+        ]
+        return ApiLogic._resultado(filas, consulta['limite'])
+
+    @staticmethod
+    def _preparar(recurso, campos, cursor, limite, query, user_id):
+        """
+        LÓGICA PRIVADA: validar la petición y armar los argumentos del repositorio
+
+        Returns:
+            dict: {'exito', 'mensaje'} o {'exito', 'repositorio', 'argumentos',
+                   'filtros', 'limite'}
+        """
+        # VALIDACIÓN 1: Recurso conocido
+        if recurso not in ApiLogic.RECURSOS:
+            return {
+                'exito': False,
+                'mensaje': f'Recurso desconocido: {recurso}'
+            }
+        repositorio, permitidos, por_defecto = ApiLogic.RECURSOS[recurso]
+
+        # VALIDACIÓN 2: Campos permitidos (el ID siempre viaja: es el cursor)
+        if campos:
+            pedidos = [campo.strip() for campo in campos.split(',') if campo.strip()]
+            desconocidos = [campo for campo in pedidos if campo not in permitidos]
+            if desconocidos:
+                return {
+                    'exito': False,
+                    'mensaje': f'Campos desconocidos: {", ".join(desconocidos)}. '
+                               f'Disponibles: {", ".join(permitidos)}'
+                }
+            campos = ['id'] + [campo for campo in dict.fromkeys(pedidos) if campo != 'id']
+        else:
+            campos = list(por_defecto)
+
+        # VALIDACIÓN 3: Límite razonable
+        if limite < 1:
+            return {
+                'exito': False,
+                'mensaje': 'El límite debe ser al menos 1'
+            }
+        limite = min(limite, ApiLogic.LIMITE_MAXIMO)
+
+        # VALIDACIÓN 4: Cursor válido
+        despues_de = 0
+        if cursor:
+            try:
+                despues_de = ApiLogic._decodificar_cursor(cursor)
+            except ValueError:
+                return {
+                    'exito': False,
+                    'mensaje': 'Cursor inválido'
+                }
+
+        filtros = {'query': (query or '').strip()}
+        if recurso == 'mis_inscripciones':
+            filtros['user_id'] = user_id
+
+        # Una fila de más para saber si hay otra página
+        return {
+            'exito': True,
+            'repositorio': repositorio,
+            'argumentos': (campos, despues_de, limite + 1),
+            'filtros': filtros,
+            'limite': limite
+        }
+
+    @staticmethod
+    def _resultado(filas, limite):
+        """LÓGICA PRIVADA: página de resultados y cursor a partir de las filas (limite + 1)"""
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+
+        return {
+            'exito': True,
+            'mensaje': f'{len(filas)} resultados',
+            'resultados': filas,
+            'cursor': ApiLogic._codificar_cursor(filas[-1]['id']) if hay_mas else '',
+            'hay_mas': hay_mas
+        }
+
+    @staticmethod
+    def _codificar_cursor(ultimo_id):
+        """LÓGICA PRIVADA: cursor opaco a partir del último ID entregado"""
+        return base64.urlsafe_b64encode(f'id|{ultimo_id}'.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decodificar_cursor(cursor):
+        """LÓGICA PRIVADA: último ID a partir del cursor; ValueError si es inválido"""
+        try:
+            relleno = '=' * (-len(cursor) % 4)
+            prefijo, ultimo_id = base64.urlsafe_b64decode(cursor + relleno).decode().split('|')
+            ultimo_id = int(ultimo_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError('Cursor inválido') from e
+
+        if prefijo != 'id' or ultimo_id < 0:
+            raise ValueError('Cursor inválido')
+        return ultimo_id
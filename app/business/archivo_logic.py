@@ -0,0 +1,110 @@
+"""
+CAPA DE NEGOCIO - Lógica del Archivo de Eventos
+Decide QUÉ eventos se archivan y CUÁNDO; el movimiento de filas
+lo hace ArchivoRepository
+"""
+
+from datetime import datetime
+from django.utils import timezone
+from ..data.repositories import ArchivoRepository
+
+
+class ArchivoLogic:
+    """
+    Lógica de negocio para el historial de eventos
+    """
+
+    # Inicio de cada semestre académico (mes, día)
+    INICIO_SEMESTRES = ((3, 1), (8, 1))
+
+    @staticmethod
+    def inicio_semestre_actual(ahora=None):
+        """
+        LÓGICA DE NEGOCIO: Fecha de inicio del semestre en curso
+
+        Los semestres empiezan en marzo y agosto; entre enero y febrero
+        se considera que sigue vigente el semestre de agosto anterior.
+
+        Returns:
+            datetime: Inicio del semestre (con zona horaria)
+        """
+        ahora = timezone.localtime(ahora or timezone.now())
+
+        anio = ahora.year
+        inicio = None
+        for mes, dia in ArchivoLogic.INICIO_SEMESTRES:
+            if (ahora.month, ahora.day) >= (mes, dia):
+                inicio = (anio, mes, dia)
+
+        if inicio is None:
+            mes, dia = ArchivoLogic.INICIO_SEMESTRES[-1]
+            inicio = (anio - 1, mes, dia)
+
+        return timezone.make_aware(datetime(*inicio), ahora.tzinfo)
+
+    @staticmethod
+    def archivar_antiguos(fecha_corte=None, tamano_lote=500, max_lotes=None, simular=False):
+        """
+        Mover al archivo los eventos terminados antes del corte
+        y los desactivados (soft delete), por lotes
+
+        Args:
+            fecha_corte (datetime, optional): Por defecto, inicio del semestre
+            tamano_lote (int): Eventos por transacción
+            max_lotes (int, optional): Detenerse tras N lotes
+            simular (bool): Solo contar, sin mover nada
+
+        Returns:
+            dict: {'exito': bool, 'mensaje': str, 'eventos': int, 'inscripciones': int}
+        """
+        if tamano_lote < 1:
+            return {
+                'exito': False,
+                'mensaje': 'El tamaño de lote debe ser al menos 1',
+                'eventos': 0,
+                'inscripciones': 0
+            }
+
+        fecha_corte = fecha_corte or ArchivoLogic.inicio_semestre_actual()
+
+        if simular:
+            pendientes = ArchivoRepository.contar_archivables(fecha_corte)
+            return {
+                'exito': True,
+                'mensaje': f'{pendientes} eventos se archivarían (corte: {fecha_corte:%Y-%m-%d})',
+                'eventos': pendientes,
+                'inscripciones': 0
+            }
+
+        total_eventos = 0
+        total_inscripciones = 0
+        lotes = 0
+
+        while max_lotes is None or lotes < max_lotes:
+            ids = ArchivoRepository.obtener_ids_archivables(fecha_corte, tamano_lote)
+            if not ids:
+                break
+
+            eventos, inscripciones = ArchivoRepository.archivar_lote(ids)
+            total_eventos += eventos
+            total_inscripciones += inscripciones
+            lotes += 1
+
+        return {
+            'exito': True,
+            'mensaje': (
+                f'{total_eventos} eventos y {total_inscripciones} inscripciones '
+                f'archivados en {lotes} lotes (corte: {fecha_corte:%Y-%m-%d})'
+            ),
+            'eventos': total_eventos,
+            'inscripciones': total_inscripciones
+        }
+
+    @staticmethod
+    def obtener_historial(query='', usuario=None):
+        """Obtener eventos archivados (solo lectura)"""
+        query = (query or '').strip()
+        return ArchivoRepository.obtener_historial(
+            query=query if len(query) >= 2 else None,
+            usuario=usuario
+        )
@@ -0,0 +1,278 @@
+"""
+CAPA DE NEGOCIO - Caché versionada por modelo
+Cada entrada declara de qué modelos depende ('lugar', 'evento') y su clave
+incluye la versión actual de cada uno. Guardar o borrar un Lugar o un
+Evento, o cambiar inscripciones, sube la versión (señales post_save,
+post_delete y m2m_changed): las claves anteriores dejan de leerse y
+caducan solas, sin tener que buscarlas ni borrarlas.
+
+Las versiones se guardan por campus y por base de datos, así dos shards
+(o una base de pruebas) nunca comparten entradas.
+
+@memorizar('evento', ...) aplica lo mismo a un método de las clases Logic,
+y estadisticas() da aciertos/fallos por prefijo (por proceso).
+"""
+
+import functools
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models.query import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from ..data.models import Lugar, Evento
+from ..data.routers import bd_de_campus, campus_actual, replicas_de, usar_primaria
+
+
+_FALTA = object()
+
+# True dentro de sin_cache(): se calcula siempre, sin leer ni escribir la caché
+_sin_cache = ContextVar('sin_cache', default=False)
+
+# Modelo → nombre de dependencia (las inscripciones cuentan como 'evento')
+DEPENDENCIAS = {
+    Lugar: 'lugar',
+    Evento: 'evento',
+    Evento.inscritos.through: 'evento',
+}
+
+# Prefijo → [aciertos, fallos] de este proceso
+_contadores = {}
+_lock_contadores = threading.Lock()
+
+
+def _espacio(campus=None):
+    """Campus y base de datos de las claves del flujo actual"""
+    campus = campus or campus_actual()
+    conexion = connections[bd_de_campus(campus)]
+    nombre = str(conexion.settings_dict['NAME'])
+    if getattr(conexion, 'is_in_memory_db', lambda: False)():
+        # Una base en memoria (pruebas) vive lo que el proceso: la caché
+        # compartida en disco no debe devolverle datos de otra ejecución
+        nombre += f':{os.getpid()}'
+    return f'{campus}@{hashlib.md5(nombre.encode()).hexdigest()[:8]}'
+
+
+def _version_inicial():
+    # Si una versión se pierde (desalojo, reinicio) se retoma desde el reloj,
+    # nunca desde 1: una versión anterior no vuelve a usarse
+    return time.time_ns() // 1000
+
+
+def versiones(modelos, campus=None):
+    """Versión actual de cada modelo (se crea si no existe)"""
+    espacio = _espacio(campus)
+    claves = [f'version:{espacio}:{modelo}' for modelo in modelos]
+    actuales = cache.get_many(claves)
+
+    for clave in claves:
+        if clave not in actuales:
+            inicial = _version_inicial()
+            # add: si otro proceso la creó primero, se usa la suya
+            actuales[clave] = inicial if cache.add(clave, inicial, timeout=None) else cache.get(clave, inicial)
+
+    return [actuales[clave] for clave in claves]
+
+
+def invalidar(*modelos, campus=None):
+    """Subir la versión de los modelos: todas sus entradas quedan obsoletas"""
+    espacio = _espacio(campus)
+    for modelo in modelos:
+        clave = f'version:{espacio}:{modelo}'
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.set(clave, _version_inicial(), timeout=None)
+
+
+def clave(prefijo, partes, modelos, campus=None):
+    """Clave de una entrada: prefijo, campus/base, versiones y resumen de los argumentos"""
+    version = '.'.join(str(v) for v in versiones(modelos, campus))
+    resumen = hashlib.md5(repr(partes).encode()).hexdigest()
+    return f'{prefijo}:{_espacio(campus)}:{version}:{resumen}'
+
+
+def obtener_o_calcular(prefijo, partes, modelos, calcular, timeout=None):
+    """
+    Valor en caché o calcular() si no está (o si cambió algún modelo)
+
+    calcular() debe devolver datos ya evaluados (listas, dicts), nunca
+    QuerySets perezosos.
+    """
+    if _sin_cache.get():
+        return calcular()
+
+    clave_entrada = clave(prefijo, partes, modelos)
+    valor = cache.get(clave_entrada, _FALTA)
+    anotar(prefijo, valor is not _FALTA)
+    if valor is not _FALTA:
+        return valor
+
+    if replicas_de(bd_de_campus()):
+        # Una réplica atrasada guardaría datos viejos con la versión nueva
+        with usar_primaria():
+            valor = calcular()
+    else:
+        valor = calcular()
+
+    cache.set(clave_entrada, valor, timeout or settings.CACHE_LISTAS_SEGUNDOS)
+    return valor
+
+
+async def aobtener_o_calcular(prefijo, partes, modelos, calcular, timeout=None):
+    """
+    obtener_o_calcular() para las vistas async: calcular es una corrutina
+
+    Comparte claves con la versión síncrona (mismo prefijo y partes → misma
+    entrada). Las versiones y la caché se leen fuera del bucle de eventos.
+    """
+    if _sin_cache.get():
+        return await calcular()
+
+    clave_entrada = await sync_to_async(clave)(prefijo, partes, modelos)
+    valor = await cache.aget(clave_entrada, _FALTA)
+    anotar(prefijo, valor is not _FALTA)
+    if valor is not _FALTA:
+        return valor
+
+    if replicas_de(bd_de_campus()):
+        with usar_primaria():
+            valor = await calcular()
+    else:
+        valor = await calcular()
+
+    await cache.aset(clave_entrada, valor, timeout or settings.CACHE_LISTAS_SEGUNDOS)
+    return valor
+
+
+@contextmanager
+def sin_cache():
+    """
+    Context manager: obtener_o_calcular() y los métodos con @memorizar
+    calculan siempre (el benchmark mide así las consultas, no los aciertos)
+    """
+    token = _sin_cache.set(True)
+    try:
+        yield
+    finally:
+        _sin_cache.reset(token)
+
+
+def _evaluado(valor):
+    """QuerySets → listas, también dentro de dicts, listas y tuplas"""
+    if isinstance(valor, QuerySet):
+        return list(valor)
+    if isinstance(valor, dict):
+        return {k: _evaluado(v) for k, v in valor.items()}
+    if type(valor) in (list, tuple):
+        return type(valor)(_evaluado(v) for v in valor)
+    return valor
+
+
+def memorizar(*modelos, segundos=None):
+    """
+    Cachear un método de las clases Logic según sus argumentos
+
+    Se coloca debajo de @staticmethod. Los argumentos forman la clave, así
+    que deben ser valores simples (ids, textos, números). Los QuerySets
+    del resultado se evalúan antes de guardarse: el método pasa a devolver
+    listas. La función original queda en .sin_cache.
+
+    También acepta métodos async, que deben devolver datos ya evaluados
+    (el ORM síncrono no puede usarse dentro del bucle de eventos).
+
+        @staticmethod
+        @cache_versionada.memorizar('evento', 'lugar', segundos=60)
+        def obtener_proximos():
+            ...
+    """
+    desconocidos = set(modelos) - set(DEPENDENCIAS.values())
+    if not modelos or desconocidos:
+        raise ValueError(f'Dependencias no válidas: {sorted(desconocidos) or "ninguna"}')
+
+    def decorador(funcion):
+        prefijo = f'memo:{funcion.__qualname__}'
+
+        if iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura(*args, **kwargs):
+                return await aobtener_o_calcular(
+                    prefijo, (args, sorted(kwargs.items())), modelos,
+                    lambda: funcion(*args, **kwargs), segundos,
+                )
+        else:
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                return obtener_o_calcular(
+                    prefijo, (args, sorted(kwargs.items())), modelos,
+                    lambda: _evaluado(funcion(*args, **kwargs)), segundos,
+                )
+
+        envoltura.sin_cache = funcion
+        return envoltura
+    return decorador
+
+
+def anotar(prefijo, acierto):
+    """Contar un acierto o un fallo de la caché para el prefijo"""
+    with _lock_contadores:
+        _contadores.setdefault(prefijo, [0, 0])[0 if acierto else 1] += 1
+
+
+def estadisticas():
+    """{prefijo: {'aciertos', 'fallos', 'ratio'}} de este proceso"""
+    with _lock_contadores:
+        copia = {prefijo: tuple(valores) for prefijo, valores in _contadores.items()}
+    return {
+        prefijo: {
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'ratio': aciertos / (aciertos + fallos) if aciertos + fallos else 0.0,
+        }
+        for prefijo, (aciertos, fallos) in sorted(copia.items())
+    }
+
+
+def reiniciar_estadisticas():
+    with _lock_contadores:
+        _contadores.clear()
+
+
+def exportar_prometheus():
+    """Aciertos y fallos por prefijo en formato de texto de Prometheus"""
+    datos = estadisticas()
+    lineas = []
+    for nombre, campo, ayuda in (
+        ('cache_aciertos_total', 'aciertos', 'Lecturas servidas desde la caché'),
+        ('cache_fallos_total', 'fallos', 'Lecturas que tuvieron que calcularse'),
+    ):
+        lineas += [f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} counter']
+        lineas += [f'{nombre}{{prefijo="{prefijo}"}} {d[campo]}' for prefijo, d in datos.items()]
+    return '\n'.join(lineas) + '\n'
+
+
+def _al_cambiar(sender, using=None, **kwargs):
+    """Receptor de señales: invalidar ahora y otra vez al confirmar la transacción"""
+    if not kwargs.get('action', 'post_').startswith('post_'):
+        return  # m2m_changed: solo post_add/post_remove/post_clear
+
+    modelo = DEPENDENCIAS[sender]
+    campus = campus_actual()
+    invalidar(modelo, campus=campus)
+    # Una lectura entre la primera invalidación y el commit pudo guardar
+    # datos aún sin confirmar con la versión nueva
+    transaction.on_commit(lambda: invalidar(modelo, campus=campus), using=using)
+
+
+def conectar_senales():
+    """Conectar la invalidación a los modelos (AppConfig.ready)"""
+    for modelo in (Lugar, Evento):
+        post_save.connect(_al_cambiar, sender=modelo, dispatch_uid=f'cache_{modelo.__name__}_save')
+        post_delete.connect(_al_cambiar, sender=modelo, dispatch_uid=f'cache_{modelo.__name__}_delete')
+    m2m_changed.connect(_al_cambiar, sender=Evento.inscritos.through, dispatch_uid='cache_inscritos')
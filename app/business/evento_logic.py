@@ -1,270 +1,375 @@
-"""
-CAPA DE NEGOCIO - Lógica de Eventos
-"""
-
-from datetime import datetime
-from django.utils import timezone
-from ..data.repositories import EventoRepository, LugarRepository
-
-
-class EventoLogic:
-    """
-    Lógica de negocio para Eventos
-    """
-    
-    @staticmethod
-    def crear(titulo, descripcion, fecha_inicio, fecha_fin, lugar_id, capacidad_maxima, usuario=None):
-        """
-        Crear un evento con validaciones de negocio
-        
-        Returns:
-            dict: {'exito': bool, 'mensaje': str, 'evento': Evento}
-        """
-        # VALIDACIÓN 1: Título mínimo
-        if not titulo or len(titulo.strip()) < 5:
-            return {
-                'exito': False,
-                'mensaje': 'El título debe tener al menos 5 caracteres',
-                'evento': None
-            }
-        
-        # VALIDACIÓN 2: Descripción
-        if not descripcion or len(descripcion.strip()) < 20:
-            return {
-                'exito': False,
-                'mensaje': 'La descripción debe tener al menos 20 caracteres',
-                'evento': None
-            }
-        
-        # VALIDACIÓN 3: Fecha inicio en el futuro
-        if fecha_inicio < timezone.now():
-            return {
-                'exito': False,
-                'mensaje': 'La fecha de inicio debe ser en el futuro',
-                'evento': None
-            }
-        
-        # VALIDACIÓN 4: Fecha fin después de inicio
-        if fecha_fin <= fecha_inicio:
-            return {
-                'exito': False,
-                'mensaje': 'La fecha de fin debe ser posterior a la de inicio',
-                'evento': None
-            }
-        
-        # VALIDACIÓN 5: Capacidad mínima
-        if capacidad_maxima < 1:
-            return {
-                'exito': False,
-                'mensaje': 'La capacidad debe ser al menos 1 persona',
-                'evento': None
-            }
-        
-        # VALIDACIÓN 6: Lugar existe
-        lugar = LugarRepository.obtener_por_id(lugar_id)
-        if not lugar:
-            return {
-                'exito': False,
-                'mensaje': 'El lugar especificado no existe',
-                'evento': None
-            }
-        
-        # CREAR evento
-        evento = EventoRepository.crear(
-            titulo=titulo.strip(),
-            descripcion=descripcion.strip(),
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin,
-            lugar=lugar,
-            capacidad_maxima=capacidad_maxima,
-            creado_por=usuario
-        )
-        
-        return {
-            'exito': True,
-            'mensaje': f'Evento "{titulo}" creado exitosamente',
-            'evento': evento
-        }
-    
-    @staticmethod
-    def obtener_proximos():
-        """Obtener eventos próximos"""
-        return EventoRepository.obtener_proximos()
-    
-    @staticmethod
-    def obtener_todos():
-        """Obtener todos los eventos activos"""
-        return EventoRepository.obtener_activos()
-    
-    @staticmethod
-    def obtener_disponibles():
-        """Obtener eventos con plazas disponibles"""
-        eventos = EventoRepository.obtener_activos()
-        return [e for e in eventos if not e.esta_lleno]
-    
-    @staticmethod
-    def obtener_por_id(evento_id):
-        """Obtener evento por ID"""
-        evento = EventoRepository.obtener_por_id(evento_id)
-        if evento:
-            return {
-                'exito': True,
-                'mensaje': 'Evento encontrado',
-                'evento': evento
-            }
-        return {
-            'exito': False,
-            'mensaje': 'Evento no encontrado',
-            'evento': None
-        }
-    
-    @staticmethod
-    def obtener_por_usuario(user_id):
-        """Obtener eventos donde el usuario está inscrito"""
-        from ..data.models import Evento
-        return Evento.objects.filter(inscritos__id=user_id, activo=True)
-    
-    @staticmethod
-    def buscar(query):
-        """Buscar eventos por título o descripción"""
-        return EventoRepository.buscar(query)
-    
-    @staticmethod
-    def actualizar(evento_id, **kwargs):
-        """Actualizar un evento"""
-        evento = EventoRepository.obtener_por_id(evento_id)
-        if not evento:
-            return {
-                'exito': False,
-                'mensaje': 'Evento no encontrado'
-            }
-        
-        EventoRepository.actualizar(evento, **kwargs)
-        return {
-            'exito': True,
-            'mensaje': 'Evento actualizado correctamente',
-            'evento': evento
-        }
-    
-    @staticmethod
-    def eliminar(evento_id, permanente=False):
-        """Eliminar un evento"""
-        evento = EventoRepository.obtener_por_id(evento_id)
-        if not evento:
-            return {
-                'exito': False,
-                'mensaje': 'Evento no encontrado'
-            }
-        
-        if permanente:
-            EventoRepository.eliminar_permanente(evento)
-            mensaje = 'Evento eliminado permanentemente'
-        else:
-            EventoRepository.eliminar_logico(evento)
-            mensaje = 'Evento desactivado correctamente'
-        
-        return {
-            'exito': True,
-            'mensaje': mensaje
-        }
-    
-    @staticmethod
-    def inscribir_usuario(evento_id, user_id):
-        """
-        Inscribir un usuario en un evento con validaciones
-        
-        Returns:
-            dict: Resultado de la operación
-        """
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        
-        # Obtener usuario
-        try:
-            usuario = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return {
-                'exito': False,
-                'mensaje': 'Usuario no encontrado'
-            }
-        # Obtener usuario
-        try:
-            usuario = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return {
-                'exito': False,
-                'mensaje': 'Usuario no encontrado'
-            }
-        
-        # VALIDACIÓN 1: Evento existe
-        evento = EventoRepository.obtener_por_id(evento_id)
-        if not evento:
-            return {
-                'exito': False,
-                'mensaje': 'Evento no encontrado'
-            }
-        
-        # VALIDACIÓN 2: Evento no está lleno
-        if evento.esta_lleno:
-            return {
-                'exito': False,
-                'mensaje': f'El evento está lleno (capacidad: {evento.capacidad_maxima})'
-            }
-        
-        # VALIDACIÓN 3: Usuario no inscrito previamente
-        if evento.inscritos.filter(id=usuario.id).exists():
-            return {
-                'exito': False,
-                'mensaje': 'Ya estás inscrito en este evento'
-            }
-        
-        # VALIDACIÓN 4: Evento no ha pasado
-        if evento.fecha_inicio < timezone.now():
-            return {
-                'exito': False,
-                'mensaje': 'Este evento ya ha comenzado'
-            }
-        
-        # INSCRIBIR
-        EventoRepository.inscribir_usuario(evento, usuario)
-        
-        return {
-            'exito': True,
-            'mensaje': f'Te has inscrito en "{evento.titulo}" correctamente'
-        }
-    
-    @staticmethod
-    def desinscribir_usuario(evento_id, user_id):
-        """Desinscribir usuario de un evento"""
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        
-        # Obtener usuario
-        try:
-            usuario = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return {
-                'exito': False,
-                'mensaje': 'Usuario no encontrado'
-            }
-        
-        evento = EventoRepository.obtener_por_id(evento_id)
-        
-        if not evento:
-            return {
-                'exito': False,
-                'mensaje': 'Evento no encontrado'
-            }
-        
-        if not evento.inscritos.filter(id=usuario.id).exists():
-            return {
-                'exito': False,
-                'mensaje': 'No estás inscrito en este evento'
-            }
-        
-        EventoRepository.desinscribir_usuario(evento, usuario)
-        
-        return {
-            'exito': True,
-            'mensaje': 'Te has desinscrito correctamente'
-        }
+"""
+CAPA DE NEGOCIO - Lógica de Eventos
+"""
+
+from datetime import datetime
+from django.utils import timezone
+from ..data.paralelo import en_paralelo
+from ..data.repositories import EventoRepository, LugarRepository
+from . import cache_versionada
+
+
+class EventoLogic:
+    """
+    Lógica de negocio para Eventos
+    """
+
+    @staticmethod
+    def crear(titulo, descripcion, fecha_inicio, fecha_fin, lugar_id, capacidad_maxima, usuario=None):
+        """
+        Crear un evento con validaciones de negocio
+
+        Returns:
+            dict: {'exito': bool, 'mensaje': str, 'evento': Evento}
+        """
+        # VALIDACIÓN 1: Título mínimo
+        if not titulo or len(titulo.strip()) < 5:
+            return {
+                'exito': False,
+                'mensaje': 'El título debe tener al menos 5 caracteres',
+                'evento': None
+            }
+
+        # VALIDACIÓN 2: Descripción
+        if not descripcion or len(descripcion.strip()) < 20:
+            return {
+                'exito': False,
+                'mensaje': 'La descripción debe tener al menos 20 caracteres',
+                'evento': None
+            }
+
+        # VALIDACIÓN 3: Fecha inicio en el futuro
+        if fecha_inicio < timezone.now():
+            return {
+                'exito': False,
+                'mensaje': 'La fecha de inicio debe ser en el futuro',
+                'evento': None
+            }
+
+        # VALIDACIÓN 4: Fecha fin después de inicio
+        if fecha_fin <= fecha_inicio:
+            return {
+                'exito': False,
+                'mensaje': 'La fecha de fin debe ser posterior a la de inicio',
+                'evento': None
+            }
+
+        # VALIDACIÓN 5: Capacidad mínima
+        if capacidad_maxima < 1:
+            return {
+                'exito': False,
+                'mensaje': 'La capacidad debe ser al menos 1 persona',
+                'evento': None
+            }
+
+        # VALIDACIÓN 6: Lugar existe
+        lugar = LugarRepository.obtener_por_id(lugar_id)
+        if not lugar:
+            return {
+                'exito': False,
+                'mensaje': 'El lugar especificado no existe',
+                'evento': None
+            }
+
+        # CREAR evento
+        evento = EventoRepository.crear(
+            titulo=titulo.strip(),
+            descripcion=descripcion.strip(),
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            lugar=lugar,
+            capacidad_maxima=capacidad_maxima,
+            creado_por=usuario
+        )
+
+        return {
+            'exito': True,
+            'mensaje': f'Evento "{titulo}" creado exitosamente',
+            'evento': evento
+        }
+
+    @staticmethod
+    @cache_versionada.memorizar('evento', 'lugar', segundos=60)
+    def obtener_proximos():
+        """Obtener eventos próximos (lista, como mucho un minuto en caché)"""
+        return EventoRepository.obtener_proximos()
+
+    @staticmethod
+    def obtener_todos():
+        """Obtener todos los eventos activos"""
+        return EventoRepository.obtener_activos()
+
+    @staticmethod
+    @cache_versionada.memorizar('evento', 'lugar')
+    def obtener_disponibles():
+        """Obtener eventos con plazas disponibles (lista en caché)"""
+        return EventoRepository.obtener_con_cupo()
+
+    @staticmethod
+    def obtener_pagina(filtro='todos', query='', pagina=1, por_pagina=12):
+        """
+        Una página de la lista de eventos, en caché hasta que cambien
+        eventos, inscripciones o lugares
+
+        Args:
+            filtro (str): 'todos', 'proximos' o 'disponibles'
+            query (str): Término de búsqueda (tiene prioridad sobre el filtro)
+            pagina (int): Número de página (se ajusta al rango válido)
+            por_pagina (int): Eventos por página
+
+        Returns:
+            dict: {'eventos': list, 'total': int, 'pagina': int, 'paginas': int}
+        """
+        def calcular():
+            # QuerySets del repositorio: se cuenta y se corta en la base
+            eventos = EventoLogic._consulta_lista(filtro, query)
+
+            total = eventos.count()
+            paginas = max(1, -(-total // por_pagina))
+            numero = min(max(pagina, 1), paginas)
+            inicio = (numero - 1) * por_pagina
+            return {
+                'eventos': list(eventos[inicio:inicio + por_pagina]),
+                'total': total,
+                'pagina': numero,
+                'paginas': paginas,
+            }
+
+        partes = EventoLogic._partes_pagina(filtro, query, pagina, por_pagina)
+        return cache_versionada.obtener_o_calcular('eventos_pagina', partes, ('evento', 'lugar'), calcular)
+
+    @staticmethod
+    async def aobtener_pagina(filtro='todos', query='', pagina=1, por_pagina=12):
+        """
+        obtener_pagina() para las vistas async (comparte la entrada de caché)
+
+        El total y la página son consultas independientes y se hacen a la
+        vez: se pide la página solicitada y, solo si resultó estar fuera de
+        rango, después la última.
+        """
+        async def calcular():
+            eventos = EventoLogic._consulta_lista(filtro, query)
+
+            solicitada = max(pagina, 1)
+            inicio = (solicitada - 1) * por_pagina
+            total, lista = await en_paralelo(
+                eventos.count,
+                lambda: list(eventos[inicio:inicio + por_pagina])
+            )
+
+            paginas = max(1, -(-total // por_pagina))
+            numero = min(solicitada, paginas)
+            if numero != solicitada:
+                inicio = (numero - 1) * por_pagina
+                lista = [evento async for evento in eventos[inicio:inicio + por_pagina]]
+            return {
+                'eventos': lista,
+                'total': total,
+                'pagina': numero,
+                'paginas': paginas,
+            }
+
+        partes = EventoLogic._partes_pagina(filtro, query, pagina, por_pagina)
+        return await cache_versionada.aobtener_o_calcular('eventos_pagina', partes, ('evento', 'lugar'), calcular)
+
+    @staticmethod
+    def _partes_pagina(filtro, query, pagina, por_pagina):
+        """LÓGICA PRIVADA: partes de la clave de caché de una página"""
+        partes = (filtro, query, pagina, por_pagina)
+        if filtro == 'proximos' and not query:
+            # Depende de la hora: como mucho un minuto en caché
+            partes += (timezone.now().strftime('%Y%m%d%H%M'),)
+        return partes
+
+    @staticmethod
+    def _consulta_lista(filtro, query):
+        """LÓGICA PRIVADA: QuerySet de la lista según búsqueda o filtro"""
+        if query:
+            return EventoRepository.buscar(query)
+        if filtro == 'proximos':
+            return EventoRepository.obtener_proximos()
+        if filtro == 'disponibles':
+            return EventoRepository.obtener_con_cupo()
+        return EventoRepository.obtener_activos()
+
+    @staticmethod
+    def obtener_por_id(evento_id):
+        """Obtener evento por ID"""
+        evento = EventoRepository.obtener_por_id(evento_id)
+        if evento:
+            return {
+                'exito': True,
+                'mensaje': 'Evento encontrado',
+                'evento': evento
+            }
+        return {
+            'exito': False,
+            'mensaje': 'Evento no encontrado',
+            'evento': None
+        }
+
+    @staticmethod
+    def obtener_por_usuario(user_id):
+        """Obtener eventos donde el usuario está inscrito"""
+        return EventoRepository.obtener_por_usuario(user_id)
+
+    @staticmethod
+    def esta_inscrito(evento, user_id):
+        """Verificar si un usuario está inscrito en un evento"""
+        return EventoRepository.esta_inscrito(evento, user_id)
+
+    @staticmethod
+    def marca_cambios():
+        """Marcador de cambios en los eventos: {'total', 'modificado'}"""
+        return EventoRepository.marca_cambios()
+
+    @staticmethod
+    def marca_inscripciones(user_id=None):
+        """Marcador de cambios en las inscripciones (de un usuario o de todos): {'total', 'ultimo'}"""
+        return EventoRepository.marca_inscripciones(user_id)
+
+    @staticmethod
+    def ids_inscritos(user_id, eventos):
+        """Ids de los eventos de la lista en los que el usuario está inscrito (una consulta)"""
+        ids = [evento.id for evento in eventos]
+        if not user_id or not ids:
+            return set()
+        return EventoRepository.ids_inscritos(user_id, ids)
+
+    @staticmethod
+    @cache_versionada.memorizar('evento', 'lugar')
+    def buscar(query):
+        """Buscar eventos por título o descripción (lista en caché)"""
+        return EventoRepository.buscar(query)
+
+    @staticmethod
+    def actualizar(evento_id, **kwargs):
+        """Actualizar un evento"""
+        evento = EventoRepository.obtener_por_id(evento_id)
+        if not evento:
+            return {
+                'exito': False,
+                'mensaje': 'Evento no encontrado'
+            }
+
+        EventoRepository.actualizar(evento, **kwargs)
+        return {
+            'exito': True,
+            'mensaje': 'Evento actualizado correctamente',
+            'evento': evento
+        }
+
+    @staticmethod
+    def eliminar(evento_id, permanente=False):
+        """Eliminar un evento"""
+        evento = EventoRepository.obtener_por_id(evento_id)
+        if not evento:
+            return {
+                'exito': False,
+                'mensaje': 'Evento no encontrado'
+            }
+
+        if permanente:
+            EventoRepository.eliminar_permanente(evento)
+            mensaje = 'Evento eliminado permanentemente'
+        else:
+            EventoRepository.eliminar_logico(evento)
+            mensaje = 'Evento desactivado correctamente'
+
+        return {
+            'exito': True,
+            'mensaje': mensaje
+        }
+
+    @staticmethod
+    def inscribir_usuario(evento_id, user_id):
+        """
+        Inscribir un usuario en un evento con validaciones
+
+        Returns:
+            dict: Resultado de la operación
+        """
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
+        # Obtener usuario
+        try:
+            usuario = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return {
+                'exito': False,
+                'mensaje': 'Usuario no encontrado'
+            }
+
+        # VALIDACIÓN 1: Evento existe
+        evento = EventoRepository.obtener_por_id(evento_id)
+        if not evento:
+            return {
+                'exito': False,
+                'mensaje': 'Evento no encontrado'
+            }
+
+        # VALIDACIÓN 2: Evento no está lleno
+        if evento.esta_lleno:
+            return {
+                'exito': False,
+                'mensaje': f'El evento está lleno (capacidad: {evento.capacidad_maxima})'
+            }
+
+        # VALIDACIÓN 3: Usuario no inscrito previamente
+        if EventoRepository.esta_inscrito(evento, usuario.id):
+            return {
+                'exito': False,
+                'mensaje': 'Ya estás inscrito en este evento'
+            }
+
+        # VALIDACIÓN 4: Evento no ha pasado
+        if evento.fecha_inicio < timezone.now():
+            return {
+                'exito': False,
+                'mensaje': 'Este evento ya ha comenzado'
+            }
+
+        # INSCRIBIR
+        EventoRepository.inscribir_usuario(evento, usuario)
+
+        return {
+            'exito': True,
+            'mensaje': f'Te has inscrito en "{evento.titulo}" correctamente'
+        }
+
+    @staticmethod
+    def desinscribir_usuario(evento_id, user_id):
+        """Desinscribir usuario de un evento"""
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
+        # Obtener usuario
+        try:
+            usuario = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return {
+                'exito': False,
+                'mensaje': 'Usuario no encontrado'
+            }
+
+        evento = EventoRepository.obtener_por_id(evento_id)
+
+        if not evento:
+            return {
+                'exito': False,
+                'mensaje': 'Evento no encontrado'
+            }
+
+        if not EventoRepository.esta_inscrito(evento, usuario.id):
+            return {
+                'exito': False,
+                'mensaje': 'No estás inscrito en este evento'
+            }
+
+        EventoRepository.desinscribir_usuario(evento, usuario)
+
+        return {
+            'exito': True,
+            'mensaje': 'Te has desinscrito correctamente'
+        }
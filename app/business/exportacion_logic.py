@@ -0,0 +1,226 @@
+"""
+CAPA DE NEGOCIO - Lógica de Exportación
+Exporta lugares, eventos e inscripciones a CSV o NDJSON (una línea JSON
+por fila) como un generador de texto: las filas se leen del cursor por
+lotes y se escriben lote a lote, así la memoria no crece con el total
+(millones de inscripciones incluidas)
+"""
+
+import csv
+import io
+from datetime import date, time
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from ..data.repositories import LugarRepository, EventoRepository, UserRepository
+from ..data.routers import campus_actual, usar_campus
+
+
+# Un solo codificador para los dos formatos: las fechas salen idénticas
+# (ISO 8601 en milisegundos y 'Z' para UTC) en CSV y en NDJSON
+_CODIFICADOR = DjangoJSONEncoder(ensure_ascii=False)
+
+
+class ExportacionLogic:
+    """
+    Lógica de negocio para exportar datos
+    """
+
+    # Recurso → (iterador del repositorio, columna → campo de values(), columna con el ID de usuario)
+    # Los campos relacionados (lugar__nombre, evento__titulo) salen del JOIN de la
+    # misma consulta; los usuarios viven en la base compartida (sharding por campus)
+    # y su username se resuelve con una consulta por lote
+    RECURSOS = {
+        'lugares': (
+            LugarRepository.iterar_filas,
+            {
+                'id': 'id',
+                'nombre': 'nombre',
+                'descripcion': 'descripcion',
+                'direccion': 'direccion',
+                'latitud': 'latitud',
+                'longitud': 'longitud',
+                'url_mapa': 'url_mapa',
+                'activo': 'activo',
+                'creado_por_id': 'creado_por_id',
+                'fecha_creacion': 'fecha_creacion',
+                'fecha_actualizacion': 'fecha_actualizacion',
+            },
+            'creado_por_id',
+        ),
+        'eventos': (
+            EventoRepository.iterar_filas,
+            {
+                'id': 'id',
+                'titulo': 'titulo',
+                'descripcion': 'descripcion',
+                'fecha_inicio': 'fecha_inicio',
+                'fecha_fin': 'fecha_fin',
+                'lugar_id': 'lugar_id',
+                'lugar_nombre': 'lugar__nombre',
+                'capacidad_maxima': 'capacidad_maxima',
+                'activo': 'activo',
+                'creado_por_id': 'creado_por_id',
+                'fecha_creacion': 'fecha_creacion',
+                'fecha_actualizacion': 'fecha_actualizacion',
+            },
+            'creado_por_id',
+        ),
+        'inscripciones': (
+            EventoRepository.iterar_inscripciones,
+            {
+                'id': 'id',
+                'evento_id': 'evento_id',
+                'evento_titulo': 'evento__titulo',
+                'evento_fecha_inicio': 'evento__fecha_inicio',
+                'lugar_id': 'evento__lugar_id',
+                'lugar_nombre': 'evento__lugar__nombre',
+                'usuario_id': 'customuser_id',
+            },
+            'usuario_id',
+        ),
+    }
+
+    # Formato → (tipo de contenido, extensión)
+    FORMATOS = {
+        'csv': ('text/csv; charset=utf-8', 'csv'),
+        'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+    }
+
+    TAMANO_LOTE = 2000
+
+    @staticmethod
+    def exportar(recurso, formato='csv', solo_activos=True, tamano_lote=None):
+        """
+        Preparar la exportación de un recurso
+
+        El contenido es un generador: no consulta nada hasta que se recorre.
+        Queda ligado al campus activo al llamar, porque una respuesta en
+        streaming se recorre después de que el middleware lo restaura.
+
+        Args:
+            recurso (str): 'lugares', 'eventos' o 'inscripciones'
+            formato (str): 'csv' o 'ndjson'
+            solo_activos (bool): Omitir lugares/eventos desactivados
+            tamano_lote (int, optional): Filas por lectura del cursor
+
+        Returns:
+            dict: {'exito': bool, 'mensaje': str, 'contenido': generador de str,
+                   'tipo_contenido': str, 'nombre_archivo': str}
+        """
+        # VALIDACIÓN 1: Recurso conocido
+        if recurso not in ExportacionLogic.RECURSOS:
+            return {
+                'exito': False,
+                'mensaje': f'Recurso desconocido: {recurso}. '
+                           f'Disponibles: {", ".join(ExportacionLogic.RECURSOS)}'
+            }
+
+        # VALIDACIÓN 2: Formato conocido
+        if formato not in ExportacionLogic.FORMATOS:
+            return {
+                'exito': False,
+                'mensaje': f'Formato desconocido: {formato}. '
+                           f'Disponibles: {", ".join(ExportacionLogic.FORMATOS)}'
+            }
+
+        # VALIDACIÓN 3: Lote razonable
+        tamano_lote = tamano_lote or ExportacionLogic.TAMANO_LOTE
+        if tamano_lote < 1:
+            return {
+                'exito': False,
+                'mensaje': 'El tamaño de lote debe ser al menos 1'
+            }
+
+        tipo_contenido, extension = ExportacionLogic.FORMATOS[formato]
+        escribir = ExportacionLogic._lote_csv if formato == 'csv' else ExportacionLogic._lote_ndjson
+
+        return {
+            'exito': True,
+            'mensaje': f'Exportación de {recurso} en {formato}',
+            'contenido': ExportacionLogic._generar(
+                recurso, escribir, solo_activos, tamano_lote, campus_actual()
+            ),
+            'tipo_contenido': tipo_contenido,
+            'nombre_archivo': f'{recurso}-{timezone.localdate():%Y%m%d}.{extension}',
+        }
+
+    @staticmethod
+    def _generar(recurso, escribir, solo_activos, tamano_lote, campus):
+        """LÓGICA PRIVADA: cabecera y luego un bloque de texto por lote"""
+        with usar_campus(campus):
+            columnas = ExportacionLogic._columnas(recurso)
+            encabezado = escribir(columnas, None)
+            if encabezado:
+                yield encabezado
+            for lote in ExportacionLogic._lotes(recurso, solo_activos, tamano_lote):
+                yield escribir(columnas, lote)
+
+    @staticmethod
+    def _columnas(recurso):
+        """LÓGICA PRIVADA: columnas de salida, con el username tras el ID de usuario"""
+        _, campos, columna_usuario = ExportacionLogic.RECURSOS[recurso]
+        columnas = []
+        for columna in campos:
+            columnas.append(columna)
+            if columna == columna_usuario:
+                columnas.append(columna_usuario.removesuffix('_id'))
+        return columnas
+
+    @staticmethod
+    def _lotes(recurso, solo_activos, tamano_lote):
+        """LÓGICA PRIVADA: listas de filas (dicts por columna) de tamano_lote"""
+        iterador, campos, columna_usuario = ExportacionLogic.RECURSOS[recurso]
+        campo_usuario = campos[columna_usuario]
+        columna_nombre = columna_usuario.removesuffix('_id')
+
+        filas = iterador(list(campos.values()), solo_activos=solo_activos, tamano_lote=tamano_lote)
+        while True:
+            lote = list(islice(filas, tamano_lote))
+            if not lote:
+                return
+
+            # Una consulta por lote para los usernames, no una por fila
+            nombres = UserRepository.nombres_por_id(
+                {fila[campo_usuario] for fila in lote if fila[campo_usuario] is not None}
+            )
+            salida = []
+            for fila in lote:
+                registro = {}
+                for columna, campo in campos.items():
+                    registro[columna] = fila[campo]
+                    if columna == columna_usuario:
+                        registro[columna_nombre] = nombres.get(fila[campo], '')
+                salida.append(registro)
+            yield salida
+
+    @staticmethod
+    def _lote_csv(columnas, lote):
+        """LÓGICA PRIVADA: un lote como texto CSV (la cabecera si lote es None)"""
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        if lote is None:
+            escritor.writerow(columnas)
+        else:
+            escritor.writerows(
+                [_valor_csv(fila[columna]) for columna in columnas] for fila in lote
+            )
+        return buffer.getvalue()
+
+    @staticmethod
+    def _lote_ndjson(columnas, lote):
+        """LÓGICA PRIVADA: un lote como líneas JSON (NDJSON no lleva cabecera)"""
+        if lote is None:
+            return ''
+        return ''.join(
+            _CODIFICADOR.encode(fila) + '\n' for fila in lote
+        )
+
+
+def _valor_csv(valor):
+    """Fechas con el mismo formato que NDJSON y None como celda vacía"""
+    if valor is None:
+        return ''
+    if isinstance(valor, (date, time)):  # datetime es subclase de date
+        return _CODIFICADOR.default(valor)
+    return valor
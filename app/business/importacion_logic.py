@@ -0,0 +1,257 @@
+"""
+CAPA DE NEGOCIO - Lógica de Importación de Lugares
+Carga masiva desde CSV o GeoJSON: el archivo se lee en streaming, cada lote
+pasa por las mismas reglas que LugarLogic.crear, los duplicados (mismo
+nombre en las mismas coordenadas) se descartan con un índice en memoria y
+las filas válidas se insertan con bulk_create, un lote por transacción
+"""
+
+import csv
+import io
+import json
+from itertools import chain, islice
+from ..data.repositories import LugarRepository
+from . import cache_versionada
+from .lugar_logic import LugarLogic
+
+try:
+    import ijson
+except ImportError:  # Opcional: sin ijson el GeoJSON se carga completo con json
+    ijson = None
+
+# Errores de un archivo mal formado (se informan, no se propagan)
+ERRORES_ARCHIVO = (ValueError, csv.Error) + ((ijson.JSONError,) if ijson is not None else ())
+
+
+class ImportacionLogic:
+    """
+    Lógica de negocio para la importación masiva de lugares
+    """
+
+    FORMATOS = {
+        '.csv': 'csv',
+        '.geojson': 'geojson',
+        '.json': 'geojson',
+    }
+
+    COLUMNAS_OBLIGATORIAS = ('nombre', 'descripcion', 'direccion', 'latitud', 'longitud')
+
+    # Longitud máxima de las columnas de texto (un valor más largo haría
+    # fallar el INSERT de todo el lote en bases estrictas)
+    LONGITUDES_MAXIMAS = {'nombre': 200, 'direccion': 255, 'url_mapa': 200}
+
+    TAMANO_LOTE = 500
+
+    # Errores por fila que se conservan en el informe (se cuentan todos)
+    MAX_ERRORES = 1000
+
+    @staticmethod
+    def formato_de(nombre_archivo):
+        """Formato ('csv' o 'geojson') según la extensión del archivo, o None"""
+        nombre = (nombre_archivo or '').lower()
+        for extension, formato in ImportacionLogic.FORMATOS.items():
+            if nombre.endswith(extension):
+                return formato
+        return None
+
+    @staticmethod
+    def importar_lugares(archivo, formato, usuario=None, tamano_lote=None, simular=False):
+        """
+        Importar lugares desde un archivo CSV o GeoJSON
+
+        CSV: columnas nombre, descripcion, direccion, latitud, longitud y
+        url_mapa (opcional), separadas por coma o punto y coma.
+        GeoJSON: FeatureCollection de Point con esas mismas propiedades.
+
+        Args:
+            archivo: Archivo binario abierto (se lee en streaming)
+            formato (str): 'csv' o 'geojson'
+            usuario (User, optional): Usuario que importa (creado_por)
+            tamano_lote (int, optional): Filas por lote de validación e INSERT
+            simular (bool): Solo validar, sin insertar nada
+
+        Returns:
+            dict: {'exito': bool, 'mensaje': str, 'creados': int, 'duplicados': int,
+                   'invalidos': int, 'errores': [{'fila': int, 'mensaje': str}]}
+        """
+        resumen = {'creados': 0, 'duplicados': 0, 'invalidos': 0, 'errores': []}
+
+        # VALIDACIÓN 1: Formato conocido
+        lectores = {'csv': ImportacionLogic._leer_csv, 'geojson': ImportacionLogic._leer_geojson}
+        if formato not in lectores:
+            return {
+                'exito': False,
+                'mensaje': f'Formato desconocido: {formato}. Disponibles: csv, geojson',
+                **resumen
+            }
+
+        # VALIDACIÓN 2: Lote razonable
+        tamano_lote = tamano_lote or ImportacionLogic.TAMANO_LOTE
+        if tamano_lote < 1:
+            return {
+                'exito': False,
+                'mensaje': 'El tamaño de lote debe ser al menos 1',
+                **resumen
+            }
+
+        def anotar_error(numero, mensaje):
+            if len(resumen['errores']) < ImportacionLogic.MAX_ERRORES:
+                resumen['errores'].append({'fila': numero, 'mensaje': mensaje})
+
+        indice = ImportacionLogic._indice_existentes()
+        filas = lectores[formato](archivo)
+        try:
+            while True:
+                lote = list(islice(filas, tamano_lote))
+                if not lote:
+                    break
+
+                validos = []
+                for numero, crudo, error in lote:
+                    # VALIDACIÓN 3: Reglas de LugarLogic, fila por fila
+                    datos, error = (None, error) if error else ImportacionLogic._preparar(crudo)
+                    if error:
+                        resumen['invalidos'] += 1
+                        anotar_error(numero, error)
+                        continue
+
+                    # VALIDACIÓN 4: Duplicados (en la base o antes en el mismo archivo)
+                    clave = ImportacionLogic._clave(datos['nombre'], datos['latitud'], datos['longitud'])
+                    if clave in indice:
+                        resumen['duplicados'] += 1
+                        anotar_error(numero, f'Duplicado: ya existe "{datos["nombre"]}" en esas coordenadas')
+                        continue
+
+                    indice.add(clave)
+                    validos.append(datos)
+
+                # CREAR usando la capa de datos (un INSERT por lote)
+                if validos and not simular:
+                    LugarRepository.crear_lote(validos, creado_por=usuario, tamano_lote=tamano_lote)
+                resumen['creados'] += len(validos)
+        except ERRORES_ARCHIVO as e:
+            # Archivo mal formado: los lotes anteriores ya se guardaron
+            return {
+                'exito': False,
+                'mensaje': f'Archivo inválido: {e}' + (
+                    f' ({resumen["creados"]} lugares creados antes del error)' if resumen['creados'] and not simular else ''
+                ),
+                **resumen
+            }
+        finally:
+            # bulk_create no envía señales
+            if resumen['creados'] and not simular:
+                cache_versionada.invalidar('lugar')
+
+        verbo = 'se crearían' if simular else 'creados'
+        return {
+            'exito': True,
+            'mensaje': (
+                f'{resumen["creados"]} lugares {verbo}, {resumen["duplicados"]} duplicados '
+                f'y {resumen["invalidos"]} filas con errores'
+            ),
+            **resumen
+        }
+
+    @staticmethod
+    def _indice_existentes():
+        """LÓGICA PRIVADA: conjunto de claves de los lugares activos (búsqueda O(1) por fila)"""
+        return {
+            ImportacionLogic._clave(nombre, latitud, longitud)
+            for nombre, latitud, longitud in LugarRepository.iterar_nombres_coordenadas()
+        }
+
+    @staticmethod
+    def _clave(nombre, latitud, longitud):
+        """LÓGICA PRIVADA: nombre normalizado y coordenadas a 4 decimales (~11 m)"""
+        return ' '.join(nombre.casefold().split()), round(latitud, 4), round(longitud, 4)
+
+    @staticmethod
+    def _preparar(crudo):
+        """
+        LÓGICA PRIVADA: datos de un lugar a partir de una fila del archivo
+
+        Returns:
+            tuple: (dict para crear_lote, None) o (None, mensaje de error)
+        """
+        texto = {
+            campo: str(crudo.get(campo) or '').strip()
+            for campo in ('nombre', 'descripcion', 'direccion', 'url_mapa')
+        }
+        coordenadas = {}
+        for campo in ('latitud', 'longitud'):
+            try:
+                coordenadas[campo] = float(str(crudo.get(campo)).strip().replace(',', '.'))
+            except (TypeError, ValueError):
+                return None, f'{campo.capitalize()} no numérica: {crudo.get(campo)!r}'
+
+        error = LugarLogic.validar(
+            texto['nombre'], texto['descripcion'], texto['direccion'],
+            coordenadas['latitud'], coordenadas['longitud']
+        )
+        if error:
+            return None, error
+
+        for campo, maximo in ImportacionLogic.LONGITUDES_MAXIMAS.items():
+            if len(texto[campo]) > maximo:
+                return None, f'El campo {campo} supera los {maximo} caracteres'
+
+        if not texto['url_mapa']:
+            texto['url_mapa'] = LugarLogic.url_mapa(coordenadas['latitud'], coordenadas['longitud'])
+
+        return {**texto, **coordenadas}, None
+
+    @staticmethod
+    def _leer_csv(archivo):
+        """LÓGICA PRIVADA: (número de línea, fila, None) de un CSV, línea a línea"""
+        # utf-8-sig: Excel antepone un BOM al guardar como "CSV UTF-8"
+        texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+        primera = texto.readline()
+        # Las hojas de cálculo en español exportan con ';'
+        separador = ';' if primera.count(';') > primera.count(',') else ','
+        lector = csv.reader(chain([primera], texto), delimiter=separador)
+
+        columnas = [columna.strip().lower() for columna in next(lector, [])]
+        faltantes = [columna for columna in ImportacionLogic.COLUMNAS_OBLIGATORIAS if columna not in columnas]
+        if faltantes:
+            raise ValueError(f'Faltan columnas: {", ".join(faltantes)}')
+
+        for valores in lector:
+            if not any(valor.strip() for valor in valores):
+                continue  # Filas vacías al final de la hoja
+            yield lector.line_num, dict(zip(columnas, valores)), None
+
+    @staticmethod
+    def _leer_geojson(archivo):
+        """LÓGICA PRIVADA: (número de feature, propiedades con coordenadas, error) de un GeoJSON"""
+        if ijson is not None:
+            features = ijson.items(archivo, 'features.item', use_float=True)
+        else:
+            datos = json.load(archivo)
+            if not isinstance(datos, dict) or datos.get('type') != 'FeatureCollection':
+                raise ValueError('Se esperaba un FeatureCollection')
+            features = datos.get('features') or []
+
+        for numero, feature in enumerate(features, start=1):
+            if not isinstance(feature, dict):
+                yield numero, None, 'Cada feature debe ser un objeto'
+                continue
+            geometria = feature.get('geometry')
+            if not isinstance(geometria, dict):
+                geometria = {}
+            coordenadas = geometria.get('coordinates')
+            if geometria.get('type') != 'Point' or not isinstance(coordenadas, list) or len(coordenadas) < 2:
+                yield numero, None, 'La geometría debe ser un Point [longitud, latitud]'
+                continue
+            propiedades = feature.get('properties')
+            if propiedades is None:
+                propiedades = {}
+            elif not isinstance(propiedades, dict):
+                yield numero, None, 'Las propiedades de la feature deben ser un objeto'
+                continue
+            # GeoJSON ordena las coordenadas como [longitud, latitud]
+            yield numero, {
+                **propiedades,
+                'longitud': coordenadas[0],
+                'latitud': coordenadas[1],
+            }, None
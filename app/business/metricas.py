@@ -0,0 +1,242 @@
+"""
+CAPA DE NEGOCIO - Métricas de la lógica de negocio
+Instrumentación opcional de los métodos públicos de LugarLogic,
+EventoLogic y UserLogic: llamadas, latencia y éxito/fallo según
+el dict {'exito': ...} que devuelven
+"""
+
+import functools
+import re
+import threading
+import time
+from asgiref.sync import iscoroutinefunction
+
+
+# Límites superiores de los buckets del histograma (segundos)
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIJO = 'logica'
+
+
+class RegistroMetricas:
+    """
+    Contadores e histogramas por (clase, método), seguros entre hilos
+    Cada proceso (worker) tiene su propio registro
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._datos = {}
+
+    def registrar(self, clase, metodo, duracion, resultado):
+        """Anotar una llamada; resultado: 'exito', 'fallo' o 'error'"""
+        with self._lock:
+            datos = self._datos.get((clase, metodo))
+            if datos is None:
+                datos = self._datos[(clase, metodo)] = {
+                    'resultados': {},
+                    'buckets': [0] * len(self.buckets),
+                    'suma': 0.0,
+                    'cuenta': 0,
+                }
+
+            datos['resultados'][resultado] = datos['resultados'].get(resultado, 0) + 1
+            datos['suma'] += duracion
+            datos['cuenta'] += 1
+            for i, limite in enumerate(self.buckets):
+                if duracion <= limite:
+                    datos['buckets'][i] += 1
+                    break
+
+    def instantanea(self):
+        """Copia de los datos: {(clase, metodo): {...}} con buckets acumulados"""
+        with self._lock:
+            copia = {}
+            for clave, datos in self._datos.items():
+                acumulado, total = [], 0
+                for valor in datos['buckets']:
+                    total += valor
+                    acumulado.append(total)
+                copia[clave] = {
+                    'resultados': dict(datos['resultados']),
+                    'buckets': list(zip(self.buckets, acumulado)),
+                    'suma': datos['suma'],
+                    'cuenta': datos['cuenta'],
+                }
+            return copia
+
+    def reiniciar(self):
+        with self._lock:
+            self._datos.clear()
+
+
+registro = RegistroMetricas()
+
+
+def _resultado_de(valor):
+    """'exito'/'fallo' según el dict de respuesta; otros retornos cuentan como éxito"""
+    if isinstance(valor, dict) and 'exito' in valor:
+        return 'exito' if valor['exito'] else 'fallo'
+    return 'exito'
+
+
+def _envolver(clase, metodo, funcion):
+    if iscoroutinefunction(funcion):
+        # Métodos async: se mide hasta que la corrutina termina, no solo su creación
+        @functools.wraps(funcion)
+        async def envoltura_async(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                valor = await funcion(*args, **kwargs)
+            except Exception:
+                registro.registrar(clase, metodo, time.perf_counter() - inicio, 'error')
+                raise
+            registro.registrar(clase, metodo, time.perf_counter() - inicio, _resultado_de(valor))
+            return valor
+
+        envoltura_async.__instrumentado__ = True
+        return envoltura_async
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            valor = funcion(*args, **kwargs)
+        except Exception:
+            registro.registrar(clase, metodo, time.perf_counter() - inicio, 'error')
+            raise
+        registro.registrar(clase, metodo, time.perf_counter() - inicio, _resultado_de(valor))
+        return valor
+
+    envoltura.__instrumentado__ = True
+    return envoltura
+
+
+def instrumentar(cls):
+    """Envolver todos los @staticmethod públicos de una clase Logic (idempotente)"""
+    for nombre, atributo in list(vars(cls).items()):
+        if nombre.startswith('_') or not isinstance(atributo, staticmethod):
+            continue
+        funcion = atributo.__func__
+        if getattr(funcion, '__instrumentado__', False):
+            continue
+        setattr(cls, nombre, staticmethod(_envolver(cls.__name__, nombre, funcion)))
+    return cls
+
+
+def activar():
+    """Instrumentar las clases de la capa de negocio (llamado desde AppConfig.ready)"""
+    from .lugar_logic import LugarLogic
+    from .evento_logic import EventoLogic
+    from .user_logic import UserLogic
+
+    for cls in (LugarLogic, EventoLogic, UserLogic):
+        instrumentar(cls)
+
+
+def exportar_prometheus(datos=None):
+    """Formato de texto de Prometheus (text/plain; version=0.0.4)"""
+    datos = registro.instantanea() if datos is None else datos
+    lineas = [
+        f'# HELP {PREFIJO}_llamadas_total Llamadas a métodos de la capa de negocio',
+        f'# TYPE {PREFIJO}_llamadas_total counter',
+    ]
+    for (clase, metodo), d in sorted(datos.items()):
+        for resultado, valor in sorted(d['resultados'].items()):
+            lineas.append(
+                f'{PREFIJO}_llamadas_total{{clase="{clase}",metodo="{metodo}",resultado="{resultado}"}} {valor}'
+            )
+
+    lineas += [
+        f'# HELP {PREFIJO}_duracion_segundos Latencia de los métodos de la capa de negocio',
+        f'# TYPE {PREFIJO}_duracion_segundos histogram',
+    ]
+    for (clase, metodo), d in sorted(datos.items()):
+        etiquetas = f'clase="{clase}",metodo="{metodo}"'
+        for limite, acumulado in d['buckets']:
+            lineas.append(f'{PREFIJO}_duracion_segundos_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+        lineas.append(f'{PREFIJO}_duracion_segundos_bucket{{{etiquetas},le="+Inf"}} {d["cuenta"]}')
+        lineas.append(f'{PREFIJO}_duracion_segundos_sum{{{etiquetas}}} {d["suma"]:.6f}')
+        lineas.append(f'{PREFIJO}_duracion_segundos_count{{{etiquetas}}} {d["cuenta"]}')
+
+    return '\n'.join(lineas) + '\n'
+
+
+_RE_MUESTRA = re.compile(r'^(?P<nombre>[a-zA-Z_:][\w:]*)\{(?P<etiquetas>[^}]*)\}\s+(?P<valor>\S+)$')
+_RE_ETIQUETA = re.compile(r'(\w+)="([^"]*)"')
+
+
+def parsear_prometheus(texto):
+    """Inverso de exportar_prometheus(): mismo formato que instantanea()"""
+    datos = {}
+
+    def entrada(clase, metodo):
+        return datos.setdefault((clase, metodo), {
+            'resultados': {}, 'buckets': [], 'suma': 0.0, 'cuenta': 0
+        })
+
+    for linea in texto.splitlines():
+        coincidencia = _RE_MUESTRA.match(linea.strip())
+        if not coincidencia:
+            continue
+        nombre = coincidencia['nombre']
+        etiquetas = dict(_RE_ETIQUETA.findall(coincidencia['etiquetas']))
+        valor = float(coincidencia['valor'])
+        if 'clase' not in etiquetas or 'metodo' not in etiquetas:
+            continue
+        d = entrada(etiquetas['clase'], etiquetas['metodo'])
+
+        if nombre == f'{PREFIJO}_llamadas_total':
+            d['resultados'][etiquetas.get('resultado', 'exito')] = int(valor)
+        elif nombre == f'{PREFIJO}_duracion_segundos_bucket' and etiquetas.get('le') != '+Inf':
+            d['buckets'].append((float(etiquetas['le']), int(valor)))
+        elif nombre == f'{PREFIJO}_duracion_segundos_sum':
+            d['suma'] = valor
+        elif nombre == f'{PREFIJO}_duracion_segundos_count':
+            d['cuenta'] = int(valor)
+
+    return datos
+
+
+def cuantil(buckets, cuenta, q):
+    """
+    Estimar un cuantil (0-1) desde buckets acumulados, interpolando
+    linealmente dentro del bucket (como histogram_quantile de Prometheus)
+    """
+    if not cuenta:
+        return 0.0
+
+    objetivo = q * cuenta
+    limite_anterior, acumulado_anterior = 0.0, 0
+    for limite, acumulado in sorted(buckets):
+        if acumulado >= objetivo:
+            en_bucket = acumulado - acumulado_anterior
+            if en_bucket == 0:
+                return limite
+            return limite_anterior + (limite - limite_anterior) * (objetivo - acumulado_anterior) / en_bucket
+        limite_anterior, acumulado_anterior = limite, acumulado
+
+    # Por encima del último bucket: el límite más alto es la mejor cota conocida
+    return limite_anterior
+
+
+def resumen(datos=None):
+    """Filas por método ordenadas por p99 (descendente)"""
+    datos = registro.instantanea() if datos is None else datos
+    filas = []
+    for (clase, metodo), d in datos.items():
+        cuenta = d['cuenta']
+        filas.append({
+            'metodo': f'{clase}.{metodo}',
+            'llamadas': cuenta,
+            'fallos': d['resultados'].get('fallo', 0),
+            'errores': d['resultados'].get('error', 0),
+            'media_ms': (d['suma'] / cuenta * 1000) if cuenta else 0.0,
+            'p50_ms': cuantil(d['buckets'], cuenta, 0.50) * 1000,
+            'p95_ms': cuantil(d['buckets'], cuenta, 0.95) * 1000,
+            'p99_ms': cuantil(d['buckets'], cuenta, 0.99) * 1000,
+            'total_ms': d['suma'] * 1000,
+        })
+    filas.sort(key=lambda f: f['p99_ms'], reverse=True)
+    return filas
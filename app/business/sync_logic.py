@@ -0,0 +1,166 @@
+"""
+CAPA DE NEGOCIO - Lógica de Sincronización Incremental
+Permite a los clientes móviles descargar solo lo que cambió
+desde su última sincronización
+
+Lo que ya no tiene fila (eliminado o archivado) se envía como tombstone
+a partir de RegistroEliminacion, que llenan archivar_lote y post_delete
+"""
+
+import base64
+from datetime import datetime, timedelta
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from ..data.models import Lugar, Evento
+from ..data.repositories import LugarRepository, EventoRepository, RegistroEliminacionRepository
+
+
+class SyncLogic:
+    """
+    Lógica de negocio para la sincronización "cambios desde"
+    """
+
+    # Recurso → (repositorio, campos enviados al cliente)
+    RECURSOS = {
+        'lugares': (
+            LugarRepository,
+            ('id', 'nombre', 'descripcion', 'direccion', 'latitud', 'longitud',
+             'url_mapa', 'activo', 'fecha_actualizacion'),
+        ),
+        'eventos': (
+            EventoRepository,
+            ('id', 'titulo', 'descripcion', 'fecha_inicio', 'fecha_fin', 'lugar_id',
+             'capacidad_maxima', 'activo', 'fecha_actualizacion'),
+        ),
+    }
+
+    LIMITE_MAXIMO = 1000
+
+    # Las filas modificadas en los últimos segundos se dejan para la próxima
+    # sincronización: una transacción aún abierta podría confirmar una fila
+    # con una fecha_actualizacion anterior al cursor entregado
+    MARGEN_SEGUNDOS = 2
+
+    @staticmethod
+    def cambios_desde(recurso, cursor=None, limite=500):
+        """
+        Obtener los registros de un recurso modificados después del cursor
+
+        Args:
+            recurso (str): 'lugares' o 'eventos'
+            cursor (str, optional): Cursor devuelto por la llamada anterior
+            limite (int): Máximo de registros por respuesta
+
+        Returns:
+            dict: {'exito': bool, 'mensaje': str, 'cambios': list,
+                   'eliminados': list, 'cursor': str, 'hay_mas': bool}
+        """
+        # VALIDACIÓN 1: Recurso conocido
+        if recurso not in SyncLogic.RECURSOS:
+            return {
+                'exito': False,
+                'mensaje': f'Recurso desconocido: {recurso}'
+            }
+
+        # VALIDACIÓN 2: Límite razonable
+        if limite < 1:
+            return {
+                'exito': False,
+                'mensaje': 'El límite debe ser al menos 1'
+            }
+        limite = min(limite, SyncLogic.LIMITE_MAXIMO)
+
+        # VALIDACIÓN 3: Cursor válido
+        marca, ultimo_id = None, 0
+        if cursor:
+            try:
+                marca, ultimo_id = SyncLogic._decodificar_cursor(cursor)
+            except ValueError:
+                return {
+                    'exito': False,
+                    'mensaje': 'Cursor inválido'
+                }
+
+        repositorio, campos = SyncLogic.RECURSOS[recurso]
+        hasta = timezone.now() - timedelta(seconds=SyncLogic.MARGEN_SEGUNDOS)
+        filas = repositorio.obtener_cambios_desde(
+            campos,
+            marca=marca,
+            ultimo_id=ultimo_id,
+            hasta=hasta,
+            limite=limite + 1
+        )
+
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+
+        # LÓGICA DE NEGOCIO: los desactivados viajan como tombstones (solo ID)
+        cambios = [fila for fila in filas if fila['activo']]
+        eliminados = [fila['id'] for fila in filas if not fila['activo']]
+
+        siguiente = (filas[-1]['fecha_actualizacion'], filas[-1]['id']) if filas else None
+
+        # LÓGICA DE NEGOCIO: eliminados y archivados ya no tienen fila; se toman
+        # del registro hasta donde llega esta página (o hasta el margen si es la última)
+        registros = []
+        if marca is not None:
+            registros = RegistroEliminacionRepository.obtener_desde(
+                recurso, marca, siguiente[0] if hay_mas else hasta
+            )
+            eliminados = list(dict.fromkeys(eliminados + [objeto_id for objeto_id, _ in registros]))
+            if registros and not hay_mas and (siguiente is None or registros[-1][1] > siguiente[0]):
+                siguiente = (registros[-1][1], 0)
+
+        if siguiente:
+            cursor = SyncLogic._codificar_cursor(*siguiente)
+
+        return {
+            'exito': True,
+            'mensaje': f'{len(filas) + len(registros)} cambios',
+            'cambios': cambios,
+            'eliminados': eliminados,
+            'cursor': cursor or '',
+            'hay_mas': hay_mas
+        }
+
+    @staticmethod
+    def _codificar_cursor(marca, ultimo_id):
+        """LÓGICA PRIVADA: cursor opaco a partir de (fecha, id)"""
+        texto = f'{marca.isoformat()}|{ultimo_id}'
+        return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decodificar_cursor(cursor):
+        """LÓGICA PRIVADA: (fecha, id) a partir del cursor; ValueError si es inválido"""
+        try:
+            relleno = '=' * (-len(cursor) % 4)
+            texto = base64.urlsafe_b64decode(cursor + relleno).decode()
+            marca, ultimo_id = texto.split('|')
+            marca = datetime.fromisoformat(marca)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError('Cursor inválido') from e
+
+        if timezone.is_naive(marca):
+            raise ValueError('Cursor inválido')
+
+        return marca, int(ultimo_id)
+
+
+# Modelo → recurso de la sincronización
+RECURSO_DE_MODELO = {
+    Lugar: 'lugares',
+    Evento: 'eventos',
+}
+
+
+def _al_eliminar(sender, instance, using=None, **kwargs):
+    """Receptor de post_delete: tombstone del lugar o evento (también los de CASCADE)"""
+    if RegistroEliminacionRepository.registrando_en_bloque():
+        return  # archivar_lote ya los registró con un solo INSERT
+    RegistroEliminacionRepository.registrar(RECURSO_DE_MODELO[sender], [instance.pk], using=using)
+
+
+def conectar_senales():
+    """Conectar el registro de eliminaciones a los modelos (AppConfig.ready)"""
+    for modelo in RECURSO_DE_MODELO:
+        post_delete.connect(_al_eliminar, sender=modelo, dispatch_uid=f'sync_{modelo.__name__}_delete')
@@ -0,0 +1,209 @@
+"""
+Chequeos de rendimiento (estilo `manage.py check --deploy`)
+Configuraciones que no fallan pero hacen lento el sistema en producción:
+
+    python manage.py check --deploy --tag rendimiento
+
+Se registran en AppConfig.ready (app/apps.py).
+"""
+
+import ast
+import os
+from django.apps import apps
+from django.conf import settings
+from django.core.checks import Warning, register
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+
+
+TAG = 'rendimiento'
+
+CARGADOR_CACHE = 'django.template.loaders.cached.Loader'
+
+# Búsquedas en las que un índice B-tree no ayuda (LIKE '%...%', regex, ...)
+BUSQUEDAS_SIN_INDICE = {
+    'contains', 'icontains', 'endswith', 'iendswith', 'iexact', 'regex', 'iregex', 'isnull',
+}
+
+
+@register(TAG, deploy=True)
+def revisar_debug(app_configs, **kwargs):
+    """DEBUG guarda cada consulta en connection.queries y sirve páginas de error pesadas"""
+    if not settings.DEBUG:
+        return []
+    return [Warning(
+        'DEBUG = True: Django guarda en memoria cada consulta SQL de cada petición '
+        '(connection.queries) y genera páginas de error con todo el contexto.',
+        hint='Desactive DEBUG en producción.',
+        id='app.W001',
+    )]
+
+
+@register(TAG, deploy=True)
+def revisar_cache_plantillas(app_configs, **kwargs):
+    """Cargadores de plantillas explícitos sin el cargador con caché"""
+    avisos = []
+    for motor in settings.TEMPLATES:
+        if motor['BACKEND'] != 'django.template.backends.django.DjangoTemplates':
+            continue
+        cargadores = motor.get('OPTIONS', {}).get('loaders')
+        # Sin 'loaders' Django ya usa cached.Loader
+        if cargadores is not None and not any(
+            (cargador[0] if isinstance(cargador, (list, tuple)) else cargador) == CARGADOR_CACHE
+            for cargador in cargadores
+        ):
+            avisos.append(Warning(
+                'TEMPLATES define OPTIONS["loaders"] sin el cargador con caché: '
+                'cada render vuelve a leer y compilar las plantillas.',
+                hint=f"Envuelva los cargadores en ('{CARGADOR_CACHE}', [...]) o quite 'loaders'.",
+                id='app.W002',
+            ))
+    return avisos
+
+
+@register(TAG, deploy=True)
+def revisar_conexiones_persistentes(app_configs, **kwargs):
+    """CONN_MAX_AGE = 0 abre (y aplica los PRAGMAs a) una conexión por petición"""
+    sin_persistencia = sorted(
+        alias for alias, bd in settings.DATABASES.items() if not bd.get('CONN_MAX_AGE')
+    )
+    if not sin_persistencia:
+        return []
+    return [Warning(
+        f'CONN_MAX_AGE = 0 en {", ".join(sin_persistencia)}: se abre una conexión nueva '
+        'en cada petición.',
+        hint='Use DJANGO_PERFIL_BD=produccion (CONN_MAX_AGE = 600) o defina CONN_MAX_AGE.',
+        id='app.W003',
+    )]
+
+
+@register(TAG, deploy=True)
+def revisar_directorios(app_configs, **kwargs):
+    """Directorios de estáticos/plantillas fuera del proyecto o inexistentes"""
+    candidatos = [('STATICFILES_DIRS', ruta) for ruta in getattr(settings, 'STATICFILES_DIRS', [])]
+    for motor in settings.TEMPLATES:
+        candidatos += [('TEMPLATES DIRS', ruta) for ruta in motor.get('DIRS', [])]
+
+    base = os.path.realpath(settings.BASE_DIR)
+    avisos = []
+    for ajuste, ruta in candidatos:
+        ruta = ruta[1] if isinstance(ruta, (list, tuple)) else ruta  # (prefijo, ruta)
+        real = os.path.realpath(ruta)
+        if not os.path.isdir(real):
+            problema = 'no existe'
+        elif os.path.commonpath([base, real]) != base:
+            problema = 'está fuera de BASE_DIR y puede no existir al desplegar'
+        else:
+            continue
+        avisos.append(Warning(
+            f'{ajuste}: {ruta} {problema}; cada búsqueda de estáticos o plantillas '
+            'la recorre igualmente.',
+            hint='Quite la entrada o apúntela a un directorio dentro del proyecto.',
+            id='app.W004',
+        ))
+    return avisos
+
+
+@register(TAG, deploy=True)
+def revisar_indices_repositorios(app_configs, **kwargs):
+    """Campos usados en filter/exclude/get de los repositorios que no tienen índice"""
+    from .data import repositories
+
+    modelos = {modelo.__name__: modelo for modelo in apps.get_app_config('app').get_models()}
+    with open(repositories.__file__, encoding='utf-8') as archivo:
+        arbol = ast.parse(archivo.read())
+
+    sin_indice = {}
+    for modelo, campo, linea, iguales in _filtros_de_repositorio(arbol, modelos):
+        if not _tiene_indice(modelo, campo, iguales):
+            sin_indice.setdefault((modelo.__name__, campo), []).append(linea)
+
+    avisos = []
+    for (modelo, campo), lineas in sorted(sin_indice.items()):
+        lineas = sorted(set(lineas))
+        donde = f'línea {lineas[0]}' if len(lineas) == 1 else f'líneas {", ".join(map(str, lineas))}'
+        avisos.append(Warning(
+            f'{modelo}.{campo} se filtra sin índice en repositories.py ({donde}): '
+            'SQLite recorre la tabla completa.',
+            hint='Agregue db_index=True o un models.Index en Meta.indexes que empiece por ese campo '
+                 '(o por campos comparados por igualdad en el mismo filtro).',
+            id='app.W005',
+        ))
+    return avisos
+
+
+def _filtros_de_repositorio(arbol, modelos):
+    """
+    (modelo, campo, línea, campos por igualdad) de cada argumento de
+    <Modelo>.objects...filter/exclude/get; los campos comparados por igualdad
+    en la misma llamada permiten usar un índice compuesto que empiece por ellos
+    """
+    for nodo in ast.walk(arbol):
+        if not (isinstance(nodo, ast.Call) and isinstance(nodo.func, ast.Attribute)
+                and nodo.func.attr in ('filter', 'exclude', 'get')):
+            continue
+        modelo = _modelo_de_cadena(nodo.func.value, modelos)
+        if modelo is None:
+            continue
+
+        argumentos = list(nodo.keywords)
+        for arg in ast.walk(nodo):
+            # Q(campo__busqueda=...) dentro del filtro
+            if isinstance(arg, ast.Call) and isinstance(arg.func, ast.Name) and arg.func.id == 'Q':
+                argumentos += arg.keywords
+
+        iguales = {
+            argumento.arg.removesuffix('__exact') for argumento in nodo.keywords
+            if argumento.arg is not None and '__' not in argumento.arg.removesuffix('__exact')
+        }
+        for argumento in argumentos:
+            if argumento.arg is None:  # **kwargs
+                continue
+            campo, _, busqueda = argumento.arg.partition('__')
+            if busqueda.rsplit('__', 1)[-1] in BUSQUEDAS_SIN_INDICE:
+                continue
+            yield modelo, campo, argumento.lineno, iguales
+
+
+def _modelo_de_cadena(nodo, modelos):
+    """Modelo de una cadena Modelo.objects.filter(...).order_by(...)..., o None"""
+    while True:
+        if isinstance(nodo, ast.Call):
+            nodo = nodo.func
+        elif isinstance(nodo, ast.Attribute):
+            if nodo.attr == 'objects' and isinstance(nodo.value, ast.Name):
+                return modelos.get(nodo.value.id)
+            nodo = nodo.value
+        else:
+            return None
+
+
+def _tiene_indice(modelo, nombre, iguales=()):
+    """
+    ¿Existe un índice que empiece por el campo? (PK, unique, db_index, FK, Meta)
+    En Meta.indexes también vale uno cuyas columnas anteriores estén en `iguales`
+    """
+    if nombre == 'pk':
+        return True
+    try:
+        campo = modelo._meta.get_field(nombre)
+    except FieldDoesNotExist:
+        return True  # Anotaciones: no es una columna
+
+    # Relaciones (joins por índice) y booleanos (un índice casi nunca ayuda)
+    if campo.is_relation and not campo.concrete or isinstance(campo, models.BooleanField):
+        return True
+    if campo.primary_key or campo.unique or campo.db_index:
+        return True
+
+    primeras = [indice.fields[0].lstrip('-') for indice in modelo._meta.indexes if indice.fields]
+    for indice in modelo._meta.indexes:
+        columnas = [columna.lstrip('-') for columna in indice.fields]
+        if nombre in columnas and set(columnas[:columnas.index(nombre)]) <= set(iguales):
+            return True
+    primeras += [campos[0] for campos in modelo._meta.unique_together]
+    primeras += [
+        restriccion.fields[0] for restriccion in modelo._meta.constraints
+        if isinstance(restriccion, models.UniqueConstraint) and restriccion.fields
+    ]
+    return nombre in primeras
@@ -1 +1 @@
-# Capa de Datos - Acceso a base de datos
+# Capa de Datos - Acceso a base de datos
@@ -0,0 +1,289 @@
+"""
+CAPA DE DATOS - Caché de dos niveles
+Backend de caché de Django con:
+
+- L1: LRU acotada en memoria del proceso (objetos vivos, sin pickle)
+- L2: otra caché configurada y compartida entre procesos (por defecto
+  FileBasedCache), la que ven todos los workers
+
+Cada escritura guarda junto al valor un sello (clave~sello) en L2. Un
+acierto de L1 solo se usa si el sello de L2 sigue siendo el mismo: si
+otro proceso escribió o borró la clave, el sello cambia y el valor se
+vuelve a leer de L2. Leer el sello (unos bytes) es mucho más barato que
+leer y deserializar el valor, que es lo que ahorra L1.
+
+Los valores devueltos desde L1 son los mismos objetos para todas las
+peticiones del proceso: tratarlos como de solo lectura.
+
+Las claves con prefijo en SOLO_L2 (por defecto las versiones de
+cache_versionada) van directo a L2, sin sello ni copia en L1: se leen en
+cada petición y son un número, validarlas costaría lo mismo que leerlas.
+incr/decr se delegan a L2 (atómicos en Redis/Memcached; con CacheArchivos,
+bajo un bloqueo de archivo entre procesos).
+
+Configuración:
+    CACHES = {
+        'default': {
+            'BACKEND': 'app.data.cache_dos_niveles.CacheDosNiveles',
+            'OPTIONS': {'L2': 'compartida', 'MAX_ENTRADAS_L1': 1000},
+        },
+        'compartida': {'BACKEND': 'app.data.cache_dos_niveles.CacheArchivos', ...},
+    }
+"""
+
+import itertools
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+
+_FALTA = object()
+
+
+class CacheDosNiveles(BaseCache):
+    """LRU por proceso delante de una caché compartida, validada por sellos"""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        opciones = params.get('OPTIONS', {})
+        self._alias_l2 = opciones.get('L2', 'compartida')
+        self._max_l1 = int(opciones.get('MAX_ENTRADAS_L1', 1000))
+        self._prefijos_l2 = tuple(opciones.get('SOLO_L2', ('version:',)))
+        self._l1 = OrderedDict()  # clave → (sello, valor, expira)
+        self._lock = threading.Lock()
+        self.estadisticas = {'l1': 0, 'l2': 0, 'fallos': 0}
+
+    @property
+    def l2(self):
+        return caches[self._alias_l2]
+
+    # --- L1 -----------------------------------------------------------------
+
+    def _expira(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return None if timeout is None else time.monotonic() + timeout
+
+    def _guardar_l1(self, clave, sello, valor, expira):
+        with self._lock:
+            self._l1[clave] = (sello, valor, expira)
+            self._l1.move_to_end(clave)
+            while len(self._l1) > self._max_l1:
+                self._l1.popitem(last=False)
+
+    def _leer_l1(self, clave):
+        with self._lock:
+            entrada = self._l1.get(clave)
+            if entrada is None:
+                return None
+            if entrada[2] is not None and entrada[2] <= time.monotonic():
+                del self._l1[clave]
+                return None
+            self._l1.move_to_end(clave)
+            return entrada
+
+    def _quitar_l1(self, clave):
+        with self._lock:
+            self._l1.pop(clave, None)
+
+    def _contar(self, tipo, cantidad=1):
+        with self._lock:
+            self.estadisticas[tipo] += cantidad
+
+    def _solo_l2(self, key):
+        return key.startswith(self._prefijos_l2)
+
+    def _timeout(self, timeout):
+        return self.get_backend_timeout(timeout) if timeout is DEFAULT_TIMEOUT else timeout
+
+    # --- API de BaseCache ---------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        if self._solo_l2(key):
+            valor = self.l2.get(key, _FALTA, version=version)
+            self._contar('fallos' if valor is _FALTA else 'l2')
+            return default if valor is _FALTA else valor
+
+        entrada = self._leer_l1(clave)
+        if entrada is not None:
+            if self.l2.get(f'{key}~sello', version=version) == entrada[0]:
+                self._contar('l1')
+                return entrada[1]
+            self._quitar_l1(clave)  # Otro proceso la cambió o borró
+
+        guardado = self.l2.get(key, _FALTA, version=version)
+        if guardado is _FALTA:
+            self._contar('fallos')
+            return default
+
+        self._contar('l2')
+        sello, valor = guardado
+        # Sin el timeout original: L1 lo acota con el de este backend
+        self._guardar_l1(clave, sello, valor, self._expira(DEFAULT_TIMEOUT))
+        return valor
+
+    def get_many(self, keys, version=None):
+        """Aciertos de L1 validados con una sola lectura de sellos; el resto, de una vez en L2"""
+        keys = list(keys)
+        directas = [key for key in keys if self._solo_l2(key)]
+        resultado = self.l2.get_many(directas, version=version) if directas else {}
+        self._contar('l2', len(resultado))
+        self._contar('fallos', len(directas) - len(resultado))
+
+        en_l1 = {}
+        for key in keys:
+            if not self._solo_l2(key):
+                entrada = self._leer_l1(self.make_and_validate_key(key, version=version))
+                if entrada is not None:
+                    en_l1[key] = entrada
+        sellos = self.l2.get_many([f'{key}~sello' for key in en_l1], version=version) if en_l1 else {}
+
+        pendientes = []
+        for key in keys:
+            if self._solo_l2(key):
+                continue
+            entrada = en_l1.get(key)
+            if entrada is not None and sellos.get(f'{key}~sello') == entrada[0]:
+                self._contar('l1')
+                resultado[key] = entrada[1]
+                continue
+            if entrada is not None:
+                self._quitar_l1(self.make_and_validate_key(key, version=version))
+            pendientes.append(key)
+
+        guardados = self.l2.get_many(pendientes, version=version) if pendientes else {}
+        self._contar('fallos', len(pendientes) - len(guardados))
+        self._contar('l2', len(guardados))
+        expira = self._expira(DEFAULT_TIMEOUT)
+        for key, (sello, valor) in guardados.items():
+            self._guardar_l1(self.make_and_validate_key(key, version=version), sello, valor, expira)
+            resultado[key] = valor
+        return resultado
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        if self._solo_l2(key):
+            self.l2.set(key, value, timeout, version=version)
+            return
+        sello = time.time_ns()
+        self.l2.set_many({key: (sello, value), f'{key}~sello': sello}, timeout, version=version)
+        self._guardar_l1(clave, sello, value, self._expira(timeout))
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        """Una sola escritura en L2 para todas las claves (y sus sellos)"""
+        timeout = self._timeout(timeout)
+        sello = time.time_ns()
+        escritura = {}
+        for key, value in data.items():
+            self.make_and_validate_key(key, version=version)
+            if self._solo_l2(key):
+                escritura[key] = value
+            else:
+                escritura[key] = (sello, value)
+                escritura[f'{key}~sello'] = sello
+        fallidas = self.l2.set_many(escritura, timeout, version=version)
+
+        expira = self._expira(timeout)
+        for key, value in data.items():
+            if not self._solo_l2(key) and key not in fallidas:
+                self._guardar_l1(self.make_and_validate_key(key, version=version), sello, value, expira)
+        return [key for key in fallidas if key in data]
+
+    def incr(self, key, delta=1, version=None):
+        if self._solo_l2(key):
+            return self.l2.incr(key, delta, version=version)
+        # Valores con sello: get + set como BaseCache (sello nuevo para los demás procesos)
+        return super().incr(key, delta, version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        if self._solo_l2(key):
+            return self.l2.add(key, value, timeout, version=version)
+        sello = time.time_ns()
+        if not self.l2.add(key, (sello, value), timeout, version=version):
+            return False
+        self.l2.set(f'{key}~sello', sello, timeout, version=version)
+        self._guardar_l1(clave, sello, value, self._expira(timeout))
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        if self._solo_l2(key):
+            return self.l2.touch(key, timeout, version=version)
+        if not self.l2.touch(key, timeout, version=version):
+            return False
+        self.l2.touch(f'{key}~sello', timeout, version=version)
+        entrada = self._leer_l1(clave)
+        if entrada is not None:
+            self._guardar_l1(clave, entrada[0], entrada[1], self._expira(timeout))
+        return True
+
+    def delete(self, key, version=None):
+        clave = self.make_and_validate_key(key, version=version)
+        if self._solo_l2(key):
+            return self.l2.delete(key, version=version)
+        self._quitar_l1(clave)
+        existia = self.l2.has_key(key, version=version)
+        self.l2.delete_many([key, f'{key}~sello'], version=version)
+        return existia
+
+    def has_key(self, key, version=None):
+        return self.get(key, _FALTA, version=version) is not _FALTA
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        self.l2.clear()
+
+
+class CacheArchivos(FileBasedCache):
+    """
+    FileBasedCache para L2 compartida entre workers
+
+    - incr atómico entre procesos (el de FileBasedCache es get + set sin
+      bloqueo: dos invalidaciones simultáneas podían dejar la misma versión)
+    - La limpieza (_cull) lista el directorio completo; se hace una vez cada
+      CULL_CADA escrituras en vez de en cada una (MAX_ENTRIES se puede
+      superar en ese margen)
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_cada = max(1, int(params.get('OPTIONS', {}).get('CULL_CADA', 100)))
+        self._escrituras = itertools.count(1)
+
+    def _cull(self):
+        if next(self._escrituras) % self._cull_cada == 0:
+            super()._cull()
+
+    def incr(self, key, delta=1, version=None):
+        self._createdir()
+        with open(os.path.join(self._dir, 'incr.lock'), 'ab') as bloqueo:
+            locks.lock(bloqueo, locks.LOCK_EX)
+            try:
+                valor = self.get(key, _FALTA, version=version)
+                if valor is _FALTA:
+                    raise ValueError(f"Key '{key}' not found")
+                nuevo = valor + delta
+                # set() reemplaza el archivo de forma atómica; se conserva la expiración
+                self.set(key, nuevo, self._restante(key, version), version=version)
+                return nuevo
+            finally:
+                locks.unlock(bloqueo)
+
+    def _restante(self, key, version):
+        """Segundos de vida que le quedan a la clave (None si no expira)"""
+        try:
+            with open(self._key_to_file(key, version), 'rb') as archivo:
+                expira = pickle.load(archivo)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            return DEFAULT_TIMEOUT
+        return None if expira is None else max(expira - time.time(), 1)
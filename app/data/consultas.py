@@ -0,0 +1,107 @@
+"""
+CAPA DE DATOS - Instrumentación de consultas SQL
+Envoltorios para connection.execute_wrapper() que cuentan, miden
+y agrupan por huella las consultas que hace el ORM
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+
+_RE_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_LISTAS = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_RE_ESPACIOS = re.compile(r'\s+')
+
+_DIR_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Módulos de instrumentación: nunca son el origen de una consulta
+_INSTRUMENTACION = (
+    os.path.abspath(__file__),
+    os.path.join(_DIR_APP, 'data', 'consultas_lentas.py'),
+)
+_ORIGENES_PREFERIDOS = (
+    os.path.join(_DIR_APP, 'data', 'repositories.py'),
+    os.path.join(_DIR_APP, 'business') + os.sep,
+)
+
+
+def huella_sql(sql):
+    """
+    Normalizar una sentencia para agrupar consultas "iguales"
+
+    Reemplaza literales y listas IN (...) por marcadores:
+    WHERE id IN (%s, %s, %s) AND nombre = 'x'  →  WHERE id IN (?) AND nombre = ?
+    """
+    huella = _RE_CADENAS.sub('?', sql)
+    huella = _RE_NUMEROS.sub('?', huella)
+    huella = _RE_LISTAS.sub('(?)', huella.replace('%s', '?'))
+    return _RE_ESPACIOS.sub(' ', huella).strip()
+
+
+def origen_consulta():
+    """
+    Función de la aplicación que originó la consulta actual
+
+    Prefiere el repositorio o la lógica de negocio más interna de la pila
+    (p. ej. 'EventoLogic.obtener_disponibles'); si no hay, cualquier otro
+    módulo de app/ (vistas, modelos). Devuelve '?' si la consulta no viene
+    de la aplicación.
+    """
+    frame = sys._getframe(1)
+    otro = None
+
+    while frame is not None:
+        archivo = os.path.abspath(frame.f_code.co_filename)
+        if archivo.startswith(_DIR_APP) and archivo not in _INSTRUMENTACION:
+            nombre = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+            nombre = nombre.split('.<locals>')[0]  # Comprensiones y funciones internas
+            if archivo.startswith(_ORIGENES_PREFERIDOS):
+                return nombre
+            if otro is None:
+                otro = nombre
+        frame = frame.f_back
+
+    return otro or '?'
+
+
+class RegistroConsultas:
+    """
+    Envoltorio de execute que acumula estadísticas de una petición
+
+    Uso:
+        registro = RegistroConsultas()
+        with connection.execute_wrapper(registro):
+            ...
+        registro.total, registro.tiempo, registro.repetidas(5)
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.tiempo = 0.0
+        self.huellas = Counter()
+        self.origenes = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo += time.perf_counter() - inicio
+            self.total += 1
+
+            huella = huella_sql(sql)
+            self.huellas[huella] += 1
+            if huella not in self.origenes:
+                # Recorrer la pila solo la primera vez que aparece cada huella
+                self.origenes[huella] = origen_consulta()
+
+    def repetidas(self, umbral):
+        """Huellas ejecutadas al menos `umbral` veces (probable N+1)"""
+        return [
+            {'huella': huella, 'veces': veces, 'origen': self.origenes.get(huella, '?')}
+            for huella, veces in self.huellas.most_common()
+            if veces >= umbral
+        ]
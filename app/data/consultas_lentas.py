@@ -0,0 +1,119 @@
+"""
+CAPA DE DATOS - Registro de consultas lentas
+Envoltorio permanente de execute (se instala en cada conexión al crearse)
+que anota en un JSONL rotativo las sentencias que superan
+settings.CONSULTAS_LENTAS_MS: SQL, parámetros, método que la originó y
+EXPLAIN QUERY PLAN de SQLite.
+
+El comando analizar_consultas_lentas agrupa el archivo por huella.
+"""
+
+import json
+import logging
+import os
+import time
+from django.conf import settings
+from django.utils import timezone
+from .consultas import huella_sql, origen_consulta
+
+
+# Un JSON por línea; va a su propio archivo (LOGGING en settings)
+logger = logging.getLogger('app.consultas_lentas')
+errores = logging.getLogger(__name__)
+
+# Sentencias cuyo plan interesa (el de un INSERT ... VALUES no dice nada)
+_EXPLICABLES = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+# Parámetros guardados por registro (un bulk_create puede tener miles)
+MAX_PARAMS = 50
+
+
+def plan_consulta(conexion, sql, params):
+    """
+    EXPLAIN QUERY PLAN de una sentencia, con sangría según el árbol
+
+    Usa un cursor crudo aparte (sin envoltorios de Django) para no
+    registrarse a sí mismo ni pisar el resultado de la consulta original.
+
+    Returns:
+        list: Líneas del plan (vacía si no se puede explicar)
+    """
+    if conexion.vendor != 'sqlite' or not sql.lstrip().upper().startswith(_EXPLICABLES):
+        return []
+
+    cursor = conexion.create_cursor()
+    try:
+        filas = cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params or ()).fetchall()
+    except Exception as e:
+        return [f'(sin plan: {e})']
+    finally:
+        cursor.close()
+
+    # Filas (id, padre, -, detalle); la sangría refleja la profundidad
+    profundidad = {0: -1}
+    lineas = []
+    for id_nodo, padre, _, detalle in filas:
+        profundidad[id_nodo] = profundidad.get(padre, -1) + 1
+        lineas.append('  ' * profundidad[id_nodo] + detalle)
+    return lineas
+
+
+def es_escaneo_completo(linea):
+    """¿La línea del plan recorre la tabla entera (SCAN sin índice)?"""
+    linea = linea.strip()
+    return linea.startswith('SCAN') and 'USING' not in linea and 'CONSTANT ROW' not in linea
+
+
+class RegistroLento:
+    """
+    Envoltorio de execute que registra las sentencias lentas
+
+    El umbral se lee una vez; si es None no se instala (ver instalar).
+    """
+
+    def __init__(self, umbral_ms):
+        self.umbral = umbral_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            if duracion >= self.umbral:
+                self._registrar(sql, params, many, context['connection'], duracion)
+
+    def _registrar(self, sql, params, many, conexion, duracion):
+        try:
+            registro = {
+                'fecha': timezone.now().isoformat(),
+                'bd': conexion.alias,
+                'ms': round(duracion * 1000, 2),
+                'sql': sql,
+                # executemany: solo el primer juego de parámetros
+                'params': list(next(iter(params), ()) if many else params or ())[:MAX_PARAMS],
+                'many': many,
+                'origen': origen_consulta(),
+                'huella': huella_sql(sql),
+                'plan': [] if many else plan_consulta(conexion, sql, params),
+            }
+            logger.warning(json.dumps(registro, ensure_ascii=False, default=str))
+        except Exception:
+            # El registro nunca debe romper la consulta que se está midiendo
+            errores.exception('No se pudo registrar una consulta lenta')
+
+
+def instalar(sender, connection, **kwargs):
+    """
+    Receptor de connection_created: agrega RegistroLento a la conexión
+
+    Se inserta al principio de execute_wrappers: los execute_wrapper()
+    temporales (ConsultasMiddleware) sacan el último al salir.
+    """
+    umbral = getattr(settings, 'CONSULTAS_LENTAS_MS', None)
+    if umbral is None:
+        return
+    if not any(isinstance(envoltorio, RegistroLento) for envoltorio in connection.execute_wrappers):
+        # El handler abre el archivo con la primera consulta lenta (delay=True)
+        os.makedirs(os.path.dirname(settings.CONSULTAS_LENTAS_LOG), exist_ok=True)
+        connection.execute_wrappers.insert(0, RegistroLento(umbral))
@@ -1,85 +1,173 @@
-"""
-CAPA DE DATOS - Models
-Contiene SOLO la estructura de datos, sin lógica de negocio
-"""
-
-from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.utils import timezone
-
-
-class CustomUser(AbstractUser):
-    """Usuario personalizado - puede extenderse con campos adicionales"""
-    bio = models.TextField(blank=True, null=True)
-    telefono = models.CharField(max_length=15, blank=True, null=True)
-    
-    def __str__(self):
-        return self.username
-
-
-class Lugar(models.Model):
-    """Modelo de datos para Lugares de bienestar mental"""
-    nombre = models.CharField(max_length=200)
-    descripcion = models.TextField(blank=True, null=True)
-    direccion = models.CharField(max_length=255)
-    latitud = models.FloatField()
-    longitud = models.FloatField()
-    url_mapa = models.URLField(blank=True, null=True)
-    fecha_creacion = models.DateTimeField(default=timezone.now)
-    activo = models.BooleanField(default=True)  # Para soft delete
-    creado_por = models.ForeignKey(
-        CustomUser, 
-        on_delete=models.SET_NULL, 
-        null=True, 
-        related_name='lugares_creados'
-    )
-    
-    class Meta:
-        ordering = ['-fecha_creacion']
-        verbose_name = "Lugar"
-        verbose_name_plural = "Lugares"
-    
-    def __str__(self):
-        return self.nombre
-    
-    @property
-    def coordenadas(self):
-        """Helper para obtener coordenadas formateadas"""
-        return f"{self.latitud},{self.longitud}"
-
-
-class Evento(models.Model):
-    """Modelo de datos para Eventos de bienestar"""
-    titulo = models.CharField(max_length=200)
-    descripcion = models.TextField()
-    fecha_inicio = models.DateTimeField()
-    fecha_fin = models.DateTimeField()
-    lugar = models.ForeignKey(Lugar, on_delete=models.CASCADE, related_name='eventos')
-    capacidad_maxima = models.IntegerField()
-    inscritos = models.ManyToManyField(CustomUser, related_name='eventos_inscritos', blank=True)
-    activo = models.BooleanField(default=True)
-    creado_por = models.ForeignKey(
-        CustomUser, 
-        on_delete=models.SET_NULL, 
-        null=True, 
-        related_name='eventos_creados'
-    )
-    fecha_creacion = models.DateTimeField(default=timezone.now)
-    
-    class Meta:
-        ordering = ['fecha_inicio']
-        verbose_name = "Evento"
-        verbose_name_plural = "Eventos"
-    
-    def __str__(self):
-        return self.titulo
-    
-    @property
-    def esta_lleno(self):
-        """Helper para verificar si el evento está lleno"""
-        return self.inscritos.count() >= self.capacidad_maxima
-    
-    @property
-    def plazas_disponibles(self):
-        """Helper para obtener plazas disponibles"""
-        return self.capacidad_maxima - self.inscritos.count()
+"""
+CAPA DE DATOS - Models
+Contiene SOLO la estructura de datos, sin lógica de negocio
+"""
+
+from django.contrib.auth.models import AbstractUser
+from django.db import models
+from django.utils import timezone
+
+
+class CustomUser(AbstractUser):
+    """Usuario personalizado - puede extenderse con campos adicionales"""
+    bio = models.TextField(blank=True, null=True)
+    telefono = models.CharField(max_length=15, blank=True, null=True)
+    campus = models.CharField(max_length=50, blank=True, default='')  # Shard de Lugar/Evento
+
+    def __str__(self):
+        return self.username
+
+
+class Lugar(models.Model):
+    """Modelo de datos para Lugares de bienestar mental"""
+    nombre = models.CharField(max_length=200)
+    descripcion = models.TextField(blank=True, null=True)
+    direccion = models.CharField(max_length=255)
+    latitud = models.FloatField()
+    longitud = models.FloatField()
+    url_mapa = models.URLField(blank=True, null=True)
+    fecha_creacion = models.DateTimeField(default=timezone.now)
+    fecha_actualizacion = models.DateTimeField(auto_now=True, db_index=True)  # Cursor de sincronización
+    activo = models.BooleanField(default=True)  # Para soft delete
+    creado_por = models.ForeignKey(
+        CustomUser, 
+        on_delete=models.SET_NULL, 
+        null=True, 
+        related_name='lugares_creados',
+        db_constraint=False  # Usuarios en la base compartida (sharding por campus)
+    )
+
+    class Meta:
+        ordering = ['-fecha_creacion']
+        verbose_name = "Lugar"
+        verbose_name_plural = "Lugares"
+
+    def __str__(self):
+        return self.nombre
+
+    @property
+    def coordenadas(self):
+        """Helper para obtener coordenadas formateadas"""
+        return f"{self.latitud},{self.longitud}"
+
+
+class Evento(models.Model):
+    """Modelo de datos para Eventos de bienestar"""
+    titulo = models.CharField(max_length=200)
+    descripcion = models.TextField()
+    fecha_inicio = models.DateTimeField(db_index=True)  # Próximos eventos y orden de las listas
+    fecha_fin = models.DateTimeField(db_index=True)  # Corte de archivar_eventos
+    lugar = models.ForeignKey(Lugar, on_delete=models.CASCADE, related_name='eventos')
+    capacidad_maxima = models.IntegerField()
+    inscritos = models.ManyToManyField(
+        CustomUser,
+        related_name='eventos_inscritos',
+        blank=True,
+        db_constraint=False  # Usuarios en la base compartida (sharding por campus)
+    )
+    activo = models.BooleanField(default=True)
+    creado_por = models.ForeignKey(
+        CustomUser, 
+        on_delete=models.SET_NULL, 
+        null=True, 
+        related_name='eventos_creados',
+        db_constraint=False  # Usuarios en la base compartida (sharding por campus)
+    )
+    fecha_creacion = models.DateTimeField(default=timezone.now)
+    fecha_actualizacion = models.DateTimeField(auto_now=True, db_index=True)  # Cursor de sincronización
+
+    class Meta:
+        ordering = ['fecha_inicio']
+        verbose_name = "Evento"
+        verbose_name_plural = "Eventos"
+
+    def __str__(self):
+        return self.titulo
+
+    @property
+    def total_inscritos(self):
+        """Número de inscritos (usa la anotación num_inscritos si la hay)"""
+        if hasattr(self, 'num_inscritos'):
+            return self.num_inscritos
+        return self.inscritos.count()
+
+    @property
+    def esta_lleno(self):
+        """Helper para verificar si el evento está lleno"""
+        return self.total_inscritos >= self.capacidad_maxima
+
+    @property
+    def plazas_disponibles(self):
+        """Helper para obtener plazas disponibles"""
+        return self.capacidad_maxima - self.total_inscritos
+
+
+class EventoArchivado(models.Model):
+    """
+    Copia de solo lectura de un evento pasado o desactivado.
+    Se llena desde el comando archivar_eventos para que las tablas
+    de eventos activos se mantengan del tamaño del semestre actual.
+    """
+    evento_original_id = models.BigIntegerField(unique=True)
+    titulo = models.CharField(max_length=200)
+    descripcion = models.TextField()
+    fecha_inicio = models.DateTimeField()
+    fecha_fin = models.DateTimeField(db_index=True)
+    lugar_id_original = models.BigIntegerField(null=True)
+    lugar_nombre = models.CharField(max_length=200, blank=True)
+    capacidad_maxima = models.IntegerField()
+    total_inscritos = models.IntegerField(default=0)
+    activo = models.BooleanField(default=True)  # Estado al momento de archivar
+    creado_por_id_original = models.BigIntegerField(null=True)
+    fecha_creacion = models.DateTimeField()
+    fecha_archivado = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-fecha_inicio']
+        verbose_name = "Evento archivado"
+        verbose_name_plural = "Eventos archivados"
+
+    def __str__(self):
+        return self.titulo
+
+
+class InscripcionArchivada(models.Model):
+    """Inscripción de un usuario a un evento archivado"""
+    evento = models.ForeignKey(
+        EventoArchivado,
+        on_delete=models.CASCADE,
+        related_name='inscripciones'
+    )
+    usuario = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='inscripciones_archivadas',
+        db_constraint=False  # Usuarios en la base compartida (sharding por campus)
+    )
+
+    class Meta:
+        unique_together = [('evento', 'usuario')]
+        verbose_name = "Inscripción archivada"
+        verbose_name_plural = "Inscripciones archivadas"
+
+    def __str__(self):
+        return f'{self.usuario_id} → {self.evento_id}'
+
+
+class RegistroEliminacion(models.Model):
+    """
+    Tombstone de un lugar o evento que salió de las tablas activas
+    (eliminado o archivado). La sincronización incremental lo envía en
+    'eliminados' para que los clientes móviles lo borren también.
+    """
+    recurso = models.CharField(max_length=20)  # 'lugares' o 'eventos' (como en la API de sync)
+    objeto_id = models.BigIntegerField()
+    fecha_eliminacion = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['recurso', 'fecha_eliminacion'], name='app_elim_recurso_fecha')]
+        verbose_name = "Registro de eliminación"
+        verbose_name_plural = "Registros de eliminación"
+
+    def __str__(self):
+        return f'{self.recurso} {self.objeto_id}'
@@ -0,0 +1,44 @@
+"""
+CAPA DE DATOS - Consultas en paralelo para las vistas async
+El ORM async de Django (acount(), async for...) ejecuta cada consulta con
+sync_to_async en el hilo de la petición: dos awaits dentro de un
+asyncio.gather quedan en cola en ese mismo hilo. en_paralelo() envía cada
+consulta independiente a su propio hilo, con su propia conexión (SQLite en
+WAL admite varios lectores a la vez).
+"""
+
+import asyncio
+import functools
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def _en_hilo(consulta):
+    """Ejecutar la consulta y liberar la conexión del hilo si ya caducó (CONN_MAX_AGE)"""
+    @functools.wraps(consulta)
+    def envoltura():
+        try:
+            return consulta()
+        finally:
+            close_old_connections()
+    return envoltura
+
+
+async def en_paralelo(*consultas):
+    """
+    Ejecutar a la vez funciones síncronas del ORM independientes entre sí
+
+    Cada una debe devolver datos ya evaluados (listas, números), nunca
+    QuerySets perezosos. El contexto (campus activo, lecturas fijadas a la
+    primaria) se copia a cada hilo. ConsultasMiddleware solo cuenta las
+    consultas del hilo de la petición, no las de estos hilos.
+
+        total, eventos = await en_paralelo(queryset.count, lambda: list(queryset[:12]))
+
+    Returns:
+        list: Resultados en el mismo orden que las consultas
+    """
+    return await asyncio.gather(*(
+        sync_to_async(_en_hilo(consulta), thread_sensitive=False)()
+        for consulta in consultas
+    ))
@@ -1,242 +1,641 @@
-"""
-CAPA DE DATOS - Repositories
-Contiene SOLO operaciones de acceso a datos (CRUD)
-Sin lógica de negocio
-"""
-
-from django.db import transaction
-from django.db.models import Q
-from .models import Lugar, Evento, CustomUser
-
-
-class LugarRepository:
-    """
-    Repositorio para operaciones de datos de Lugares
-    SOLO interactúa con la base de datos
-    """
-    
-    @staticmethod
-    def crear(nombre, descripcion, direccion, latitud, longitud, url_mapa=None, creado_por=None):
-        """Crear un lugar en la base de datos"""
-        with transaction.atomic():
-            lugar = Lugar.objects.create(
-                nombre=nombre,
-                descripcion=descripcion,
-                direccion=direccion,
-                latitud=latitud,
-                longitud=longitud,
-                url_mapa=url_mapa,
-                creado_por=creado_por
-            )
-        return lugar
-    
-    @staticmethod
-    def obtener_por_id(lugar_id):
-        """Obtener un lugar por ID"""
-        try:
-            return Lugar.objects.get(id=lugar_id, activo=True)
-        except Lugar.DoesNotExist:
-            return None
-    
-    @staticmethod
-    def obtener_todos():
-        """Obtener todos los lugares (incluidos inactivos)"""
-        return Lugar.objects.all()
-    
-    @staticmethod
-    def obtener_activos():
-        """Obtener solo lugares activos"""
-        return Lugar.objects.filter(activo=True)
-    
-    @staticmethod
-    def buscar(query):
-        """Buscar lugares por nombre, descripción o dirección"""
-        return Lugar.objects.filter(
-            Q(nombre__icontains=query) |
-            Q(descripcion__icontains=query) |
-            Q(direccion__icontains=query),
-            activo=True
-        )
-    
-    @staticmethod
-    def actualizar(lugar, **datos):
-        """Actualizar un lugar existente"""
-        for campo, valor in datos.items():
-            if hasattr(lugar, campo):
-                setattr(lugar, campo, valor)
-        
-        lugar.save()
-        return lugar
-    
-    @staticmethod
-    def eliminar_logico(lugar):
-        """Soft delete - marcar como inactivo"""
-        lugar.activo = False
-        lugar.save()
-        return True
-    
-    @staticmethod
-    def eliminar_permanente(lugar):
-        """Hard delete - eliminar de la base de datos"""
-        lugar.delete()
-        return True
-    
-    @staticmethod
-    def contar_activos():
-        """Contar lugares activos"""
-        return Lugar.objects.filter(activo=True).count()
-    
-    @staticmethod
-    def contar_por_usuario(usuario):
-        """Contar lugares creados por un usuario"""
-        return Lugar.objects.filter(creado_por=usuario, activo=True).count()
-
-
-class EventoRepository:
-    """
-    Repositorio para operaciones de datos de Eventos
-    """
-    
-    @staticmethod
-    def crear(titulo, descripcion, fecha_inicio, fecha_fin, lugar, capacidad_maxima, creado_por=None):
-        """Crear un evento en la base de datos"""
-        with transaction.atomic():
-            evento = Evento.objects.create(
-                titulo=titulo,
-                descripcion=descripcion,
-                fecha_inicio=fecha_inicio,
-                fecha_fin=fecha_fin,
-                lugar=lugar,
-                capacidad_maxima=capacidad_maxima,
-                creado_por=creado_por
-            )
-        return evento
-    
-    @staticmethod
-    def obtener_por_id(evento_id):
-        """Obtener un evento por ID"""
-        try:
-            return Evento.objects.get(id=evento_id, activo=True)
-        except Evento.DoesNotExist:
-            return None
-    
-    @staticmethod
-    def obtener_activos():
-        """Obtener eventos activos"""
-        return Evento.objects.filter(activo=True)
-    
-    @staticmethod
-    def obtener_proximos():
-        """Obtener eventos futuros"""
-        from django.utils import timezone
-        return Evento.objects.filter(
-            activo=True,
-            fecha_inicio__gte=timezone.now()
-        ).order_by('fecha_inicio')
-    
-    @staticmethod
-    def buscar(query):
-        """Buscar eventos por título o descripción"""
-        from django.db.models import Q
-        return Evento.objects.filter(
-            Q(titulo__icontains=query) | Q(descripcion__icontains=query),
-            activo=True
-        )
-    
-    @staticmethod
-    def inscribir_usuario(evento, usuario):
-        """Inscribir un usuario en un evento"""
-        evento.inscritos.add(usuario)
-        return evento
-    
-    @staticmethod
-    def desinscribir_usuario(evento, usuario):
-        """Desinscribir un usuario de un evento"""
-        evento.inscritos.remove(usuario)
-        return evento
-    
-    @staticmethod
-    def actualizar(evento, **datos):
-        """Actualizar un evento"""
-        for campo, valor in datos.items():
-            if hasattr(evento, campo):
-                setattr(evento, campo, valor)
-        
-        evento.save()
-        return evento
-    
-    @staticmethod
-    def eliminar_logico(evento):
-        """Soft delete de evento"""
-        evento.activo = False
-        evento.save()
-        return True
-    
-    @staticmethod
-    def eliminar_permanente(evento):
-        """Hard delete de evento"""
-        evento.delete()
-        return True
-
-
-class UserRepository:
-    """
-    Repositorio para operaciones con usuarios
-    """
-    
-    @staticmethod
-    def obtener_todos():
-        """Obtener todos los usuarios"""
-        return CustomUser.objects.all()
-    
-    @staticmethod
-    def obtener_por_id(user_id):
-        """Obtener usuario por ID"""
-        try:
-            return CustomUser.objects.get(id=user_id)
-        except CustomUser.DoesNotExist:
-            return None
-    
-    @staticmethod
-    def obtener_por_username(username):
-        """Obtener usuario por username"""
-        try:
-            return CustomUser.objects.get(username=username)
-        except CustomUser.DoesNotExist:
-            return None
-    
-    @staticmethod
-    def crear(username, email, password, **extra_fields):
-        """Crear un nuevo usuario"""
-        user = CustomUser.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            **extra_fields
-        )
-        return user
-    
-    @staticmethod
-    def actualizar(user_id, **datos):
-        """Actualizar un usuario"""
-        try:
-            user = CustomUser.objects.get(id=user_id)
-            
-            for campo, valor in datos.items():
-                if hasattr(user, campo):
-                    setattr(user, campo, valor)
-            
-            user.save()
-            return user
-        except CustomUser.DoesNotExist:
-            return None
-    
-    @staticmethod
-    def eliminar(user_id):
-        """Eliminar un usuario"""
-        try:
-            user = CustomUser.objects.get(id=user_id)
-            user.delete()
-            return True
-        except CustomUser.DoesNotExist:
-            return False
+"""
+CAPA DE DATOS - Repositories
+Contiene SOLO operaciones de acceso a datos (CRUD)
+Sin lógica de negocio
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Subquery
+from .models import Lugar, Evento, CustomUser, EventoArchivado, InscripcionArchivada, RegistroEliminacion
+
+
+# True mientras un borrado masivo registra sus propios tombstones en bloque:
+# el receptor de post_delete no debe añadir uno por fila
+_registro_en_bloque = ContextVar('registro_en_bloque', default=False)
+
+
+def _marca_cambios(queryset, recurso):
+    """
+    Total de filas y última modificación (una consulta, usa los índices de fecha)
+
+    Borrar una fila antigua no mueve el máximo de fecha_actualizacion: la
+    última eliminación física del recurso (RegistroEliminacion) también cuenta
+    """
+    ultima_eliminacion = (
+        RegistroEliminacion.objects.filter(recurso=recurso)
+        .order_by('-fecha_eliminacion').values('fecha_eliminacion')[:1]
+    )
+    marca = queryset.aggregate(
+        total=Count('id'), modificado=Max('fecha_actualizacion'), eliminado=Max(Subquery(ultima_eliminacion))
+    )
+    eliminado = marca.pop('eliminado')
+    if eliminado is not None and (marca['modificado'] is None or eliminado > marca['modificado']):
+        marca['modificado'] = eliminado
+    return marca
+
+
+def _filas_api(queryset, campos, anotaciones, despues_de, limite):
+    """
+    QuerySet de filas (dicts de values()) ordenadas por ID a partir de
+    despues_de (keyset). Solo se anotan (JOIN / GROUP BY) los campos
+    calculados que se piden
+    """
+    pedidas = {campo: anotaciones[campo] for campo in campos if campo in anotaciones}
+    if pedidas:
+        queryset = queryset.annotate(**pedidas)
+    return queryset.filter(id__gt=despues_de).order_by('id').values(*campos)[:limite]
+
+
+def _iterar_filas(queryset, campos, tamano_lote):
+    """
+    Filas (dicts de values()) por ID, leídas del cursor de a tamano_lote
+    Sin caché del QuerySet: la memoria no crece con el total de filas
+    """
+    return queryset.order_by('id').values(*campos).iterator(chunk_size=tamano_lote)
+
+
+def _cambios_desde(queryset, campos, marca, ultimo_id, hasta, limite):
+    """Consulta por cursor (fecha_actualizacion, id) usando el índice de fecha"""
+    if marca is None:
+        # Primera sincronización: no hace falta enviar tombstones
+        queryset = queryset.filter(activo=True)
+    else:
+        queryset = queryset.filter(
+            Q(fecha_actualizacion__gt=marca) |
+            Q(fecha_actualizacion=marca, id__gt=ultimo_id)
+        )
+
+    if hasta is not None:
+        queryset = queryset.filter(fecha_actualizacion__lt=hasta)
+
+    return list(
+        queryset.order_by('fecha_actualizacion', 'id')
+        .values(*campos)[:limite]
+    )
+
+
+class LugarRepository:
+    """
+    Repositorio para operaciones de datos de Lugares
+    SOLO interactúa con la base de datos
+    Con sharding, consulta el shard del campus activo (ver routers.usar_campus)
+    """
+
+    @staticmethod
+    def crear(nombre, descripcion, direccion, latitud, longitud, url_mapa=None, creado_por=None):
+        """Crear un lugar en la base de datos"""
+        with transaction.atomic():
+            lugar = Lugar.objects.create(
+                nombre=nombre,
+                descripcion=descripcion,
+                direccion=direccion,
+                latitud=latitud,
+                longitud=longitud,
+                url_mapa=url_mapa,
+                creado_por=creado_por
+            )
+        return lugar
+
+    @staticmethod
+    def obtener_por_id(lugar_id):
+        """Obtener un lugar por ID"""
+        try:
+            return Lugar.objects.get(id=lugar_id, activo=True)
+        except Lugar.DoesNotExist:
+            return None
+
+    @staticmethod
+    def obtener_todos():
+        """Obtener todos los lugares (incluidos inactivos)"""
+        return Lugar.objects.all()
+
+    @staticmethod
+    def obtener_activos():
+        """Obtener solo lugares activos"""
+        return Lugar.objects.filter(activo=True)
+
+    @staticmethod
+    def buscar(query):
+        """Buscar lugares por nombre, descripción o dirección"""
+        return Lugar.objects.filter(
+            Q(nombre__icontains=query) |
+            Q(descripcion__icontains=query) |
+            Q(direccion__icontains=query),
+            activo=True
+        )
+
+    @staticmethod
+    def actualizar(lugar, **datos):
+        """Actualizar un lugar existente"""
+        for campo, valor in datos.items():
+            if hasattr(lugar, campo):
+                setattr(lugar, campo, valor)
+
+        lugar.save()
+        return lugar
+
+    @staticmethod
+    def eliminar_logico(lugar):
+        """Soft delete - marcar como inactivo"""
+        lugar.activo = False
+        lugar.save()
+        return True
+
+    @staticmethod
+    def eliminar_permanente(lugar):
+        """Hard delete - eliminar de la base de datos"""
+        lugar.delete()
+        return True
+
+    @staticmethod
+    def contar_activos():
+        """Contar lugares activos"""
+        return Lugar.objects.filter(activo=True).count()
+
+    @staticmethod
+    def contar_por_usuario(usuario):
+        """Contar lugares creados por un usuario"""
+        return Lugar.objects.filter(creado_por=usuario, activo=True).count()
+
+    @staticmethod
+    def marca_cambios():
+        """{'total', 'modificado'} de todos los lugares, incluidos los desactivados"""
+        return _marca_cambios(Lugar.objects.all(), 'lugares')
+
+    @staticmethod
+    def obtener_cambios_desde(campos, marca=None, ultimo_id=0, hasta=None, limite=500):
+        """
+        Obtener lugares modificados después de (marca, ultimo_id), incluidos
+        los desactivados (tombstones), ordenados por fecha_actualizacion e ID
+        """
+        return _cambios_desde(Lugar.objects.all(), campos, marca, ultimo_id, hasta, limite)
+
+    @staticmethod
+    def obtener_filas(campos, despues_de=0, limite=50, query=''):
+        """Lugares activos como dicts (values()), por ID, para la API"""
+        return list(LugarRepository.consulta_filas(campos, despues_de, limite, query))
+
+    @staticmethod
+    def consulta_filas(campos, despues_de=0, limite=50, query=''):
+        """QuerySet (perezoso, para el ORM async) de obtener_filas()"""
+        queryset = LugarRepository.buscar(query) if query else LugarRepository.obtener_activos()
+        return _filas_api(queryset, campos, {}, despues_de, limite)
+
+    @staticmethod
+    def crear_lote(datos, creado_por=None, tamano_lote=500):
+        """
+        Crear varios lugares con bulk_create (un INSERT por tamano_lote filas)
+        No envía señales: quien llama invalida la caché de 'lugar'
+        """
+        with transaction.atomic():
+            return Lugar.objects.bulk_create(
+                [Lugar(creado_por=creado_por, **fila) for fila in datos],
+                batch_size=tamano_lote
+            )
+
+    @staticmethod
+    def iterar_nombres_coordenadas(tamano_lote=2000):
+        """Iterador de (nombre, latitud, longitud) de los lugares activos (detección de duplicados)"""
+        return (
+            Lugar.objects.filter(activo=True).order_by()
+            .values_list('nombre', 'latitud', 'longitud').iterator(chunk_size=tamano_lote)
+        )
+
+    @staticmethod
+    def iterar_filas(campos, solo_activos=True, tamano_lote=2000):
+        """Iterador de lugares como dicts (values()), por ID, para exportaciones"""
+        queryset = Lugar.objects.filter(activo=True) if solo_activos else Lugar.objects.all()
+        return _iterar_filas(queryset, campos, tamano_lote)
+
+
+def _con_inscritos(queryset):
+    """
+    Anotar num_inscritos: esta_lleno/plazas_disponibles no consultan por evento
+    Con el lugar en el mismo JOIN: las listas muestran su nombre en cada tarjeta
+    """
+    # Con GROUP BY Django ignora Meta.ordering: se repite explícitamente
+    return (
+        queryset.select_related('lugar')
+        .annotate(num_inscritos=Count('inscritos'))
+        .order_by(*Evento._meta.ordering)
+    )
+
+
+class EventoRepository:
+    """
+    Repositorio para operaciones de datos de Eventos
+    Con sharding, consulta el shard del campus activo (ver routers.usar_campus)
+    """
+
+    @staticmethod
+    def crear(titulo, descripcion, fecha_inicio, fecha_fin, lugar, capacidad_maxima, creado_por=None):
+        """Crear un evento en la base de datos"""
+        with transaction.atomic():
+            evento = Evento.objects.create(
+                titulo=titulo,
+                descripcion=descripcion,
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin,
+                lugar=lugar,
+                capacidad_maxima=capacidad_maxima,
+                creado_por=creado_por
+            )
+        return evento
+
+    @staticmethod
+    def obtener_por_id(evento_id):
+        """Obtener un evento por ID"""
+        try:
+            return _con_inscritos(Evento.objects.filter(activo=True)).get(id=evento_id)
+        except Evento.DoesNotExist:
+            return None
+
+    @staticmethod
+    def obtener_activos():
+        """Obtener eventos activos"""
+        return _con_inscritos(Evento.objects.filter(activo=True))
+
+    @staticmethod
+    def obtener_con_cupo():
+        """Obtener eventos activos con plazas disponibles (filtrado en la base)"""
+        return EventoRepository.obtener_activos().filter(num_inscritos__lt=F('capacidad_maxima'))
+
+    @staticmethod
+    def obtener_proximos():
+        """Obtener eventos futuros"""
+        from django.utils import timezone
+        return _con_inscritos(Evento.objects.filter(
+            activo=True,
+            fecha_inicio__gte=timezone.now()
+        )).order_by('fecha_inicio')
+
+    @staticmethod
+    def obtener_por_usuario(user_id):
+        """Obtener eventos activos donde el usuario está inscrito"""
+        # Subconsulta en vez de JOIN: num_inscritos cuenta a todos los inscritos
+        inscripciones = Evento.inscritos.through.objects.filter(customuser_id=user_id)
+        return _con_inscritos(Evento.objects.filter(
+            activo=True,
+            id__in=inscripciones.values('evento_id')
+        ))
+
+    @staticmethod
+    def esta_inscrito(evento, user_id):
+        """Verificar si un usuario está inscrito en un evento"""
+        return evento.inscritos.filter(id=user_id).exists()
+
+    @staticmethod
+    def marca_cambios():
+        """{'total', 'modificado'} de todos los eventos, incluidos los desactivados"""
+        return _marca_cambios(Evento.objects.all(), 'eventos')
+
+    @staticmethod
+    def marca_inscripciones(user_id=None):
+        """
+        {'total', 'ultimo'} de las inscripciones (de un usuario o de todos)
+        La tabla no tiene fechas: un alta sube el último id (AUTOINCREMENT)
+        y una baja el total
+        """
+        inscripciones = Evento.inscritos.through.objects.all()
+        if user_id is not None:
+            inscripciones = inscripciones.filter(customuser_id=user_id)
+        return inscripciones.aggregate(total=Count('id'), ultimo=Max('id'))
+
+    @staticmethod
+    def ids_inscritos(user_id, evento_ids):
+        """Ids (de entre evento_ids) de los eventos en los que el usuario está inscrito"""
+        return set(Evento.inscritos.through.objects.filter(
+            customuser_id=user_id, evento_id__in=evento_ids
+        ).values_list('evento_id', flat=True))
+
+    @staticmethod
+    def contar_por_usuario(user_id):
+        """Contar eventos activos creados por un usuario"""
+        return Evento.objects.filter(creado_por_id=user_id, activo=True).count()
+
+    @staticmethod
+    def buscar(query):
+        """Buscar eventos por título o descripción"""
+        from django.db.models import Q
+        return _con_inscritos(Evento.objects.filter(
+            Q(titulo__icontains=query) | Q(descripcion__icontains=query),
+            activo=True
+        ))
+
+    @staticmethod
+    def inscribir_usuario(evento, usuario):
+        """Inscribir un usuario en un evento"""
+        evento.inscritos.add(usuario)
+        return evento
+
+    @staticmethod
+    def desinscribir_usuario(evento, usuario):
+        """Desinscribir un usuario de un evento"""
+        evento.inscritos.remove(usuario)
+        return evento
+
+    @staticmethod
+    def actualizar(evento, **datos):
+        """Actualizar un evento"""
+        for campo, valor in datos.items():
+            if hasattr(evento, campo):
+                setattr(evento, campo, valor)
+
+        evento.save()
+        return evento
+
+    @staticmethod
+    def eliminar_logico(evento):
+        """Soft delete de evento"""
+        evento.activo = False
+        evento.save()
+        return True
+
+    @staticmethod
+    def eliminar_permanente(evento):
+        """Hard delete de evento"""
+        evento.delete()
+        return True
+
+    @staticmethod
+    def obtener_cambios_desde(campos, marca=None, ultimo_id=0, hasta=None, limite=500):
+        """
+        Obtener eventos modificados después de (marca, ultimo_id), incluidos
+        los desactivados (tombstones), ordenados por fecha_actualizacion e ID
+        """
+        return _cambios_desde(Evento.objects.all(), campos, marca, ultimo_id, hasta, limite)
+
+    # Campos calculados de la API de eventos
+    ANOTACIONES_API = {
+        'lugar_nombre': F('lugar__nombre'),
+        'num_inscritos': Count('inscritos'),
+        'plazas_disponibles': F('capacidad_maxima') - Count('inscritos'),
+    }
+
+    @staticmethod
+    def obtener_filas(campos, despues_de=0, limite=50, query='', user_id=None):
+        """
+        Eventos activos como dicts (values()), por ID, para la API
+        Con user_id, solo aquellos en los que el usuario está inscrito
+        """
+        return list(EventoRepository.consulta_filas(campos, despues_de, limite, query, user_id))
+
+    @staticmethod
+    def consulta_filas(campos, despues_de=0, limite=50, query='', user_id=None):
+        """QuerySet (perezoso, para el ORM async) de obtener_filas()"""
+        queryset = Evento.objects.filter(activo=True)
+        if query:
+            queryset = queryset.filter(Q(titulo__icontains=query) | Q(descripcion__icontains=query))
+        if user_id is not None:
+            inscripciones = Evento.inscritos.through.objects.filter(customuser_id=user_id)
+            queryset = queryset.filter(id__in=inscripciones.values('evento_id'))
+        return _filas_api(queryset, campos, EventoRepository.ANOTACIONES_API, despues_de, limite)
+
+    @staticmethod
+    def iterar_filas(campos, solo_activos=True, tamano_lote=2000):
+        """
+        Iterador de eventos como dicts (values()), por ID, para exportaciones
+        Los campos lugar__* salen del JOIN con Lugar, sin consultas por fila
+        """
+        queryset = Evento.objects.filter(activo=True) if solo_activos else Evento.objects.all()
+        return _iterar_filas(queryset, campos, tamano_lote)
+
+    @staticmethod
+    def iterar_inscripciones(campos, solo_activos=True, tamano_lote=2000):
+        """
+        Iterador de inscripciones (tabla intermedia) como dicts, por ID
+        Los campos evento__* y evento__lugar__* salen del JOIN, sin cargar
+        Evento.inscritos en memoria
+        """
+        inscripciones = Evento.inscritos.through.objects.all()
+        if solo_activos:
+            inscripciones = inscripciones.filter(evento__activo=True)
+        return _iterar_filas(inscripciones, campos, tamano_lote)
+
+
+class UserRepository:
+    """
+    Repositorio para operaciones con usuarios
+    """
+
+    @staticmethod
+    def obtener_todos():
+        """Obtener todos los usuarios"""
+        return CustomUser.objects.order_by('username')
+
+    @staticmethod
+    def obtener_por_id(user_id):
+        """Obtener usuario por ID"""
+        try:
+            return CustomUser.objects.get(id=user_id)
+        except CustomUser.DoesNotExist:
+            return None
+
+    @staticmethod
+    def buscar(query):
+        """Buscar usuarios por username, nombre o email"""
+        return CustomUser.objects.filter(
+            Q(username__icontains=query) |
+            Q(first_name__icontains=query) |
+            Q(last_name__icontains=query) |
+            Q(email__icontains=query)
+        ).order_by('username')
+
+    @staticmethod
+    def nombres_por_id(user_ids):
+        """{id: username} de los usuarios indicados (una consulta)"""
+        return dict(CustomUser.objects.filter(id__in=user_ids).values_list('id', 'username'))
+
+    @staticmethod
+    def obtener_por_username(username):
+        """Obtener usuario por username"""
+        try:
+            return CustomUser.objects.get(username=username)
+        except CustomUser.DoesNotExist:
+            return None
+
+    @staticmethod
+    def crear(username, email, password, **extra_fields):
+        """Crear un nuevo usuario"""
+        user = CustomUser.objects.create_user(
+            username=username,
+            email=email,
+            password=password,
+            **extra_fields
+        )
+        return user
+
+    @staticmethod
+    def actualizar(user_id, **datos):
+        """Actualizar un usuario"""
+        try:
+            user = CustomUser.objects.get(id=user_id)
+
+            for campo, valor in datos.items():
+                if hasattr(user, campo):
+                    setattr(user, campo, valor)
+
+            user.save()
+            return user
+        except CustomUser.DoesNotExist:
+            return None
+
+    @staticmethod
+    def eliminar(user_id):
+        """Eliminar un usuario"""
+        try:
+            user = CustomUser.objects.get(id=user_id)
+            user.delete()
+            return True
+        except CustomUser.DoesNotExist:
+            return False
+
+
+class ArchivoRepository:
+    """
+    Repositorio para el archivo histórico de eventos
+    Mueve eventos y sus inscripciones fuera de las tablas activas
+    """
+
+    @staticmethod
+    def obtener_ids_archivables(fecha_corte, limite):
+        """Obtener IDs de eventos terminados antes del corte o desactivados"""
+        return list(
+            Evento.objects.filter(
+                Q(fecha_fin__lt=fecha_corte) | Q(activo=False)
+            ).order_by('id').values_list('id', flat=True)[:limite]
+        )
+
+    @staticmethod
+    def contar_archivables(fecha_corte):
+        """Contar eventos que serían archivados"""
+        return Evento.objects.filter(
+            Q(fecha_fin__lt=fecha_corte) | Q(activo=False)
+        ).count()
+
+    @staticmethod
+    def archivar_lote(evento_ids):
+        """
+        Copiar un lote de eventos (y sus inscripciones) al archivo
+        y eliminarlos de las tablas activas en una sola transacción
+        """
+        Inscripcion = Evento.inscritos.through
+
+        with transaction.atomic():
+            eventos = list(
+                Evento.objects.filter(id__in=evento_ids)
+                .select_related('lugar')
+                .order_by()
+            )
+            inscripciones = list(
+                Inscripcion.objects.filter(evento_id__in=evento_ids)
+                .values_list('evento_id', 'customuser_id')
+            )
+
+            total_por_evento = {}
+            for evento_id, _ in inscripciones:
+                total_por_evento[evento_id] = total_por_evento.get(evento_id, 0) + 1
+
+            archivados = EventoArchivado.objects.bulk_create([
+                EventoArchivado(
+                    evento_original_id=evento.id,
+                    titulo=evento.titulo,
+                    descripcion=evento.descripcion,
+                    fecha_inicio=evento.fecha_inicio,
+                    fecha_fin=evento.fecha_fin,
+                    lugar_id_original=evento.lugar_id,
+                    lugar_nombre=evento.lugar.nombre if evento.lugar else '',
+                    capacidad_maxima=evento.capacidad_maxima,
+                    total_inscritos=total_por_evento.get(evento.id, 0),
+                    activo=evento.activo,
+                    creado_por_id_original=evento.creado_por_id,
+                    fecha_creacion=evento.fecha_creacion,
+                )
+                for evento in eventos
+            ])
+
+            # bulk_create no devuelve IDs en todos los motores: consultarlos
+            ids_archivo = dict(
+                EventoArchivado.objects.filter(
+                    evento_original_id__in=[e.id for e in eventos]
+                ).values_list('evento_original_id', 'id')
+            )
+
+            InscripcionArchivada.objects.bulk_create([
+                InscripcionArchivada(
+                    evento_id=ids_archivo[evento_id],
+                    usuario_id=usuario_id
+                )
+                for evento_id, usuario_id in inscripciones
+            ])
+
+            # Tombstones para la sincronización incremental (un INSERT por lote)
+            RegistroEliminacionRepository.registrar('eventos', [e.id for e in eventos])
+
+            # Elimina también las filas de la tabla intermedia (CASCADE)
+            with RegistroEliminacionRepository.en_bloque():
+                Evento.objects.filter(id__in=evento_ids).delete()
+
+        return len(archivados), len(inscripciones)
+
+    @staticmethod
+    def obtener_historial(query=None, usuario=None):
+        """Obtener eventos archivados, opcionalmente filtrados"""
+        eventos = EventoArchivado.objects.all()
+
+        if query:
+            eventos = eventos.filter(
+                Q(titulo__icontains=query) | Q(lugar_nombre__icontains=query)
+            )
+
+        if usuario is not None:
+            eventos = eventos.filter(inscripciones__usuario=usuario)
+
+        return eventos
+
+    @staticmethod
+    def obtener_por_id(archivo_id):
+        """Obtener un evento archivado por ID"""
+        try:
+            return EventoArchivado.objects.get(id=archivo_id)
+        except EventoArchivado.DoesNotExist:
+            return None
+
+
+class RegistroEliminacionRepository:
+    """
+    Repositorio del registro de eliminaciones (tombstones de la sincronización)
+    Vive en el shard del campus, junto a los lugares y eventos eliminados
+    """
+
+    @staticmethod
+    def registrar(recurso, ids, using=None):
+        """Registrar que los objetos con esos IDs salieron de las tablas activas"""
+        registros = RegistroEliminacion.objects.using(using) if using else RegistroEliminacion.objects
+        registros.bulk_create([RegistroEliminacion(recurso=recurso, objeto_id=objeto_id) for objeto_id in ids])
+
+    @staticmethod
+    @contextmanager
+    def en_bloque():
+        """Context manager: los borrados del bloque ya registraron sus tombstones"""
+        token = _registro_en_bloque.set(True)
+        try:
+            yield
+        finally:
+            _registro_en_bloque.reset(token)
+
+    @staticmethod
+    def registrando_en_bloque():
+        """Indica si el borrado actual ya registra sus tombstones (ver en_bloque)"""
+        return _registro_en_bloque.get()
+
+    @staticmethod
+    def obtener_desde(recurso, desde, hasta):
+        """(objeto_id, fecha_eliminacion) con desde < fecha <= hasta, por fecha (usa el índice)"""
+        return list(
+            RegistroEliminacion.objects.filter(
+                recurso=recurso, fecha_eliminacion__gt=desde, fecha_eliminacion__lte=hasta
+            ).order_by('fecha_eliminacion', 'objeto_id').values_list('objeto_id', 'fecha_eliminacion')
+        )
@@ -0,0 +1,211 @@
+"""
+CAPA DE DATOS - Routers de base de datos
+Deciden a qué base de datos va cada consulta del ORM
+- ShardRouter: los datos de cada campus viven en su propia base de datos
+- ReplicaRouter: las lecturas van a las réplicas y las escrituras a la primaria
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+
+# True cuando el flujo actual ya escribió (o va a escribir) en la primaria:
+# a partir de ahí todas las lecturas se hacen contra la primaria
+_fijado_primaria = ContextVar('fijado_primaria', default=False)
+
+# Campus activo del flujo actual (lo fija CampusMiddleware o usar_campus)
+_campus_actual = ContextVar('campus_actual', default=None)
+
+# Modelos cuyos datos pertenecen a un campus (app_label 'app')
+MODELOS_CAMPUS = frozenset({
+    'lugar',
+    'evento',
+    'evento_inscritos',
+    'eventoarchivado',
+    'inscripcionarchivada',
+    'registroeliminacion',
+})
+
+
+def replicas_de(alias):
+    """Alias de réplicas configuradas para una base de datos primaria"""
+    return getattr(settings, 'DATABASE_REPLICAS', {}).get(alias, [])
+
+
+def todas_las_replicas():
+    """Conjunto de alias que son réplicas de alguna primaria"""
+    return {
+        replica
+        for replicas in getattr(settings, 'DATABASE_REPLICAS', {}).values()
+        for replica in replicas
+    }
+
+
+def primaria_de(alias):
+    """Alias de la primaria para una réplica (o el mismo alias)"""
+    for primaria, replicas in getattr(settings, 'DATABASE_REPLICAS', {}).items():
+        if alias in replicas:
+            return primaria
+    return alias
+
+
+def esta_fijado_primaria():
+    """Indica si las lecturas están fijadas a la primaria"""
+    return _fijado_primaria.get()
+
+
+def fijar_primaria(valor=True):
+    """Fijar (o liberar) las lecturas a la primaria; devuelve un token para reset"""
+    return _fijado_primaria.set(valor)
+
+
+def restaurar_fijado(token):
+    """Volver al estado anterior a fijar_primaria()"""
+    _fijado_primaria.reset(token)
+
+
+@contextmanager
+def usar_primaria():
+    """Context manager: todas las lecturas del bloque van a la primaria"""
+    token = fijar_primaria(True)
+    try:
+        yield
+    finally:
+        restaurar_fijado(token)
+
+
+def sharding_activo():
+    """Hay sharding cuando se configuró más de un campus"""
+    return len(getattr(settings, 'CAMPUS_SHARDS', {})) > 1
+
+
+def campus_actual():
+    """Campus del flujo actual (o el campus por defecto)"""
+    return _campus_actual.get() or getattr(settings, 'CAMPUS_POR_DEFECTO', None)
+
+
+def activar_campus(campus):
+    """Fijar el campus del flujo actual; devuelve un token para restaurar"""
+    return _campus_actual.set(campus)
+
+
+def restaurar_campus(token):
+    """Volver al campus anterior a activar_campus()"""
+    _campus_actual.reset(token)
+
+
+@contextmanager
+def usar_campus(campus):
+    """Context manager: los repositorios de Lugar/Evento usan el shard del campus"""
+    token = activar_campus(campus)
+    try:
+        yield
+    finally:
+        restaurar_campus(token)
+
+
+def bd_de_campus(campus=None):
+    """Alias de la base de datos (primaria) de un campus"""
+    shards = getattr(settings, 'CAMPUS_SHARDS', {})
+    return shards.get(campus or campus_actual(), 'default')
+
+
+def es_modelo_campus(model):
+    """Indica si el modelo se guarda en el shard del campus"""
+    return model._meta.app_label == 'app' and model._meta.model_name in MODELOS_CAMPUS
+
+
+def elegir_bd_lectura(primaria='default'):
+    """Elegir una réplica al azar para leer, salvo que se haya fijado la primaria"""
+    if esta_fijado_primaria():
+        return primaria
+
+    replicas = replicas_de(primaria)
+    if not replicas:
+        return primaria
+
+    return random.choice(replicas)
+
+
+class ShardRouter:
+    """
+    Router por campus
+
+    - Lugar, Evento, inscripciones y archivo → shard del campus activo
+    - Usuarios, sesiones, admin, etc. → base compartida (lo decide ReplicaRouter)
+    - Dentro de cada shard se siguen usando réplicas si están configuradas
+    """
+
+    def _primaria(self, model, hints):
+        instancia = hints.get('instance')
+        if instancia is not None and instancia._state.db and es_modelo_campus(type(instancia)):
+            # Relaciones de un objeto del campus: mismo shard que el objeto
+            return primaria_de(instancia._state.db)
+        return bd_de_campus()
+
+    def db_for_read(self, model, **hints):
+        if not sharding_activo() or not es_modelo_campus(model):
+            return None
+        return elegir_bd_lectura(self._primaria(model, hints))
+
+    def db_for_write(self, model, **hints):
+        if not sharding_activo() or not es_modelo_campus(model):
+            return None
+        fijar_primaria(True)
+        return self._primaria(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not sharding_activo():
+            return None
+        de_campus = (es_modelo_campus(type(obj1)), es_modelo_campus(type(obj2)))
+        if all(de_campus):
+            return primaria_de(obj1._state.db) == primaria_de(obj2._state.db)
+        if any(de_campus):
+            # Usuarios compartidos ↔ datos de campus (claves sin constraint)
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        shards = set(getattr(settings, 'CAMPUS_SHARDS', {}).values()) - {'default'}
+        if db in shards:
+            # Los shards solo tienen tablas de campus; la base compartida, todo
+            return app_label == 'app' and model_name in MODELOS_CAMPUS
+        return None
+
+
+class ReplicaRouter:
+    """
+    Router primaria/réplicas
+
+    - Lecturas de lugares, eventos, inscripciones y archivo (MODELOS_CAMPUS:
+      obtener_*, buscar, contar_* de los repositorios) → réplica
+    - Usuarios, sesiones, permisos, contenttypes, admin → siempre la primaria:
+      las réplicas solo se refrescan con sincronizar_replicas y una sesión o
+      un usuario recién creados no estarían en ellas
+    - Escrituras → primaria, y fija la primaria para el resto del flujo
+      (lectura-tras-escritura consistente dentro de la misma petición)
+    """
+
+    def db_for_read(self, model, **hints):
+        # Los modelos de campus ya los resolvió ShardRouter (si está activo)
+        if not es_modelo_campus(model):
+            return None
+        return elegir_bd_lectura('default')
+
+    def db_for_write(self, model, **hints):
+        fijar_primaria(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas y primaria contienen los mismos datos
+        if primaria_de(obj1._state.db) == primaria_de(obj2._state.db):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas se copian desde la primaria, nunca se migran
+        if db in todas_las_replicas():
+            return False
+        return None
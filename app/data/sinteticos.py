@@ -0,0 +1,164 @@
+"""
+CAPA DE DATOS - Datos sintéticos
+Generadores deterministas de usuarios, lugares, eventos e inscripciones
+para benchmarks y pruebas de carga. Cada bloque usa su propio generador
+aleatorio derivado de (semilla, tipo, índice), así que el resultado no
+depende del orden ni del número de procesos que lo generen.
+"""
+
+import math
+import random
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from .models import Lugar, Evento
+
+
+# (nombre, latitud, longitud, peso, dispersión en km)
+CENTROS = (
+    ('Tingo María', -9.2950, -75.9980, 0.40, 3.0),
+    ('Huánuco', -9.9306, -76.2422, 0.15, 5.0),
+    ('Lima', -12.0464, -77.0428, 0.20, 12.0),
+    ('Pucallpa', -8.3791, -74.5539, 0.07, 5.0),
+    ('Cusco', -13.5320, -71.9675, 0.06, 5.0),
+    ('Arequipa', -16.4090, -71.5375, 0.06, 6.0),
+    ('Trujillo', -8.1116, -79.0288, 0.06, 6.0),
+)
+_PESOS = [centro[3] for centro in CENTROS]
+
+KM_POR_GRADO = 111.32
+
+TIPOS_LUGAR = ('Parque', 'Centro de Salud', 'Biblioteca', 'Mirador', 'Jardín', 'Auditorio', 'Plaza', 'Cancha')
+TEMAS_EVENTO = ('Taller de mindfulness', 'Caminata', 'Charla de salud mental', 'Yoga al aire libre',
+                'Círculo de lectura', 'Feria de bienestar', 'Meditación guiada', 'Deporte recreativo')
+CAMPUS = ('tingo-maria', 'huanuco', 'lima')
+
+
+def rng_bloque(semilla, tipo, indice):
+    """Generador aleatorio propio de un bloque (independiente de los demás)"""
+    return random.Random(f'{semilla}:{tipo}:{indice}')
+
+
+def coordenada(rng):
+    """(centro, latitud, longitud) agrupada alrededor de una ciudad del Perú"""
+    nombre, latitud, longitud, _, dispersion = rng.choices(CENTROS, weights=_PESOS)[0]
+    latitud = rng.gauss(latitud, dispersion / KM_POR_GRADO)
+    longitud = rng.gauss(longitud, dispersion / (KM_POR_GRADO * math.cos(math.radians(latitud))))
+    return nombre, round(latitud, 6), round(longitud, 6)
+
+
+def usuarios(rng, primer_id, cantidad, password_hash):
+    """
+    Usuarios sin guardar con IDs explícitos
+
+    password_hash se calcula una sola vez (make_password) y se comparte:
+    hashear cada contraseña es lo que hace lenta la creación uno a uno
+    """
+    User = get_user_model()
+    return [
+        User(
+            id=n,
+            username=f'usuario{n:07d}',
+            email=f'usuario{n:07d}@ejemplo.pe',
+            password=password_hash,
+            campus=rng.choice(CAMPUS),
+        )
+        for n in range(primer_id, primer_id + cantidad)
+    ]
+
+
+def lugares(rng, primer_id, cantidad, usuario_ids):
+    """Lugares sin guardar; usuario_ids: (primer_id, último_id) de los creadores"""
+    resultado = []
+    for n in range(primer_id, primer_id + cantidad):
+        ciudad, latitud, longitud = coordenada(rng)
+        tipo = rng.choice(TIPOS_LUGAR)
+        resultado.append(Lugar(
+            id=n,
+            nombre=f'{tipo} {ciudad} {n}',
+            descripcion=f'{tipo} para actividades de bienestar en {ciudad}',
+            direccion=f'Av. Principal {rng.randint(1, 2000)}, {ciudad}',
+            latitud=latitud,
+            longitud=longitud,
+            activo=rng.random() > 0.05,
+            creado_por_id=rng.randint(*usuario_ids),
+        ))
+    return resultado
+
+
+def eventos(rng, primer_id, cantidad, lugar_ids, usuario_ids, referencia):
+    """
+    Eventos sin guardar entre un año antes y seis meses después de referencia
+
+    referencia se pasa explícitamente (no timezone.now()) para que dos
+    ejecuciones con la misma semilla generen las mismas fechas
+    """
+    resultado = []
+    for n in range(primer_id, primer_id + cantidad):
+        inicio = referencia + timedelta(minutes=rng.randint(-365 * 24 * 60, 180 * 24 * 60))
+        resultado.append(Evento(
+            id=n,
+            titulo=f'{rng.choice(TEMAS_EVENTO)} {n}',
+            descripcion='Actividad abierta a la comunidad universitaria',
+            fecha_inicio=inicio,
+            fecha_fin=inicio + timedelta(hours=rng.choice((1, 2, 3, 4))),
+            lugar_id=rng.randint(*lugar_ids),
+            capacidad_maxima=rng.choice((10, 20, 30, 50, 100, 200)),
+            activo=rng.random() > 0.05,
+            creado_por_id=rng.randint(*usuario_ids),
+        ))
+    return resultado
+
+
+def inscripciones(rng, lista_eventos, usuario_ids, ocupacion_media=0.5):
+    """Filas de la tabla intermedia evento-usuario (sin duplicados por evento)"""
+    Inscripcion = Evento.inscritos.through
+    primero, ultimo = usuario_ids
+    disponibles = ultimo - primero + 1
+    resultado = []
+    for evento in lista_eventos:
+        ocupacion = min(1.0, rng.expovariate(1 / ocupacion_media))
+        cantidad = min(disponibles, int(evento.capacidad_maxima * ocupacion))
+        for usuario_id in rng.sample(range(primero, ultimo + 1), cantidad):
+            resultado.append(Inscripcion(evento_id=evento.id, customuser_id=usuario_id))
+    return resultado
+
+
+def completar_hasta(tamano, semilla, ocupacion_media=0.2):
+    """
+    Completar una base VACÍA de pruebas hasta `tamano` lugares
+    (1 usuario y 2 eventos por lugar). Llamar con tamaños crecientes
+    agrega solo la diferencia, así varios tamaños comparten la base.
+
+    Returns:
+        tuple: (primer_id, último_id) de los usuarios sembrados
+    """
+    User = get_user_model()
+    usuarios_actuales = User.objects.count()
+    lugares_actuales = Lugar.objects.count()
+    eventos_actuales = Evento.objects.count()
+    referencia = timezone.now().replace(minute=0, second=0, microsecond=0)
+    usuario_ids = (1, tamano)
+
+    User.objects.bulk_create(usuarios(
+        rng_bloque(semilla, 'usuarios', tamano),
+        usuarios_actuales + 1, tamano - usuarios_actuales, make_password('sembrado123')
+    ), batch_size=1000)
+
+    Lugar.objects.bulk_create(lugares(
+        rng_bloque(semilla, 'lugares', tamano),
+        lugares_actuales + 1, tamano - lugares_actuales, usuario_ids
+    ), batch_size=1000)
+
+    nuevos_eventos = eventos(
+        rng_bloque(semilla, 'eventos', tamano),
+        eventos_actuales + 1, 2 * tamano - eventos_actuales, (1, tamano), usuario_ids, referencia
+    )
+    Evento.objects.bulk_create(nuevos_eventos, batch_size=1000)
+    Evento.inscritos.through.objects.bulk_create(inscripciones(
+        rng_bloque(semilla, 'inscripciones', tamano),
+        nuevos_eventos, usuario_ids, ocupacion_media=ocupacion_media
+    ), batch_size=1000)
+
+    return usuario_ids
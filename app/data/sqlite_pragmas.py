@@ -0,0 +1,31 @@
+"""
+CAPA DE DATOS - PRAGMAs de SQLite
+Ajustes de rendimiento aplicados a cada conexión nueva
+(se conecta a la señal connection_created en AppConfig.ready)
+"""
+
+from django.conf import settings
+
+
+def sentencias_pragma(pragmas):
+    """Convertir un dict {'journal_mode': 'WAL', ...} en sentencias PRAGMA"""
+    return [f'PRAGMA {nombre} = {valor}' for nombre, valor in pragmas.items()]
+
+
+def aplicar_pragmas(sender, connection, **kwargs):
+    """
+    Receptor de connection_created: aplica settings.SQLITE_PRAGMAS
+
+    Solo actúa sobre conexiones SQLite; con CONN_MAX_AGE > 0 se ejecuta
+    una vez por conexión persistente, no por petición.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for sentencia in sentencias_pragma(pragmas):
+            cursor.execute(sentencia)
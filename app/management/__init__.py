@@ -0,0 +1 @@
+# Comandos de administración personalizados
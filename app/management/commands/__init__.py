@@ -0,0 +1 @@
+# Comandos disponibles vía manage.py
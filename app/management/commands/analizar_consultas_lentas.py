@@ -0,0 +1,151 @@
+"""
+Comando: analizar_consultas_lentas
+Agrupa por huella el registro de consultas lentas (CONSULTAS_LENTAS_LOG
+y sus rotaciones .1, .2, ...) y resalta las que recorren tablas enteras
+según EXPLAIN QUERY PLAN (p. ej. los icontains de LugarRepository.buscar).
+
+Uso:
+    python manage.py analizar_consultas_lentas
+    python manage.py analizar_consultas_lentas --orden max --solo-escaneos
+    python manage.py analizar_consultas_lentas --archivo /var/log/app/consultas_lentas.jsonl --json
+"""
+
+import json
+import os
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...data.consultas_lentas import es_escaneo_completo
+
+
+ORDENES = {
+    'total': lambda grupo: grupo['total_ms'],
+    'max': lambda grupo: grupo['max_ms'],
+    'veces': lambda grupo: grupo['veces'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Resume el registro de consultas lentas por huella y marca los escaneos completos de tabla'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archivo', default=None, help='JSONL a leer (por defecto: CONSULTAS_LENTAS_LOG)')
+        parser.add_argument('--orden', choices=sorted(ORDENES), default='total', help='Por defecto: total')
+        parser.add_argument('--limite', type=int, default=20, help='Huellas a mostrar')
+        parser.add_argument('--solo-escaneos', action='store_true', help='Solo huellas con escaneo completo')
+        parser.add_argument('--json', action='store_true', help='Imprimir el resumen en JSON')
+
+    def handle(self, *args, **options):
+        archivo = options['archivo'] or getattr(settings, 'CONSULTAS_LENTAS_LOG', None)
+        if not archivo:
+            raise CommandError('Indique --archivo o configure CONSULTAS_LENTAS_LOG')
+
+        archivos = self._archivos(archivo)
+        if not archivos:
+            raise CommandError(f'No existe {archivo} (¿se definió DJANGO_CONSULTAS_LENTAS_MS?)')
+
+        grupos, invalidas = self._agrupar(archivos)
+        filas = sorted(grupos.values(), key=ORDENES[options['orden']], reverse=True)
+        if options['solo_escaneos']:
+            filas = [fila for fila in filas if fila['escaneos']]
+        filas = filas[:options['limite']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(filas, indent=2, ensure_ascii=False))
+            return
+
+        if invalidas:
+            self.stderr.write(f'{invalidas} líneas ilegibles ignoradas')
+        if not filas:
+            self.stdout.write('Sin consultas lentas registradas')
+            return
+        self._reportar(filas)
+
+    def _archivos(self, archivo):
+        """El archivo y sus rotaciones, del más antiguo al más reciente"""
+        rotados = []
+        n = 1
+        while os.path.exists(f'{archivo}.{n}'):
+            rotados.append(f'{archivo}.{n}')
+            n += 1
+        if os.path.exists(archivo):
+            rotados.insert(0, archivo)
+        return list(reversed(rotados))
+
+    def _agrupar(self, archivos):
+        grupos = {}
+        invalidas = 0
+
+        for ruta in archivos:
+            with open(ruta, encoding='utf-8') as entrada:
+                for linea in entrada:
+                    try:
+                        registro = json.loads(linea)
+                        huella = registro['huella']
+                    except (ValueError, KeyError, TypeError):
+                        invalidas += 1
+                        continue
+
+                    grupo = grupos.setdefault(huella, {
+                        'huella': huella, 'veces': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                        'duraciones': [], 'origenes': Counter(),
+                    })
+                    grupo['veces'] += 1
+                    grupo['total_ms'] += registro['ms']
+                    grupo['duraciones'].append(registro['ms'])
+                    grupo['origenes'][registro.get('origen', '?')] += 1
+                    if registro['ms'] >= grupo['max_ms']:
+                        # El peor caso es el ejemplo más útil para reproducir
+                        grupo['max_ms'] = registro['ms']
+                        grupo['sql'] = registro.get('sql', huella)
+                        grupo['params'] = registro.get('params', [])
+                    if registro.get('plan'):
+                        grupo['plan'] = registro['plan']  # El más reciente
+
+        for grupo in grupos.values():
+            duraciones = sorted(grupo.pop('duraciones'))
+            grupo['total_ms'] = round(grupo['total_ms'], 2)
+            grupo['p95_ms'] = duraciones[min(len(duraciones) - 1, int(len(duraciones) * 0.95))]
+            grupo['origenes'] = [origen for origen, _ in grupo['origenes'].most_common()]
+            grupo.setdefault('plan', [])
+            grupo['escaneos'] = [linea.strip() for linea in grupo['plan'] if es_escaneo_completo(linea)]
+            grupo['pistas'] = self._pistas(grupo)
+
+        return grupos, invalidas
+
+    def _pistas(self, grupo):
+        """Causas probables de un escaneo completo"""
+        if not grupo['escaneos']:
+            return []
+
+        pistas = []
+        comodin_inicial = any(
+            isinstance(valor, str) and valor.startswith('%') for valor in grupo['params']
+        )
+        if ' LIKE ' in grupo['sql'] and comodin_inicial:
+            pistas.append(
+                "LIKE '%...%' (icontains/contains) no puede usar índices: "
+                "considerar istartswith o un índice de texto completo (FTS5)"
+            )
+        if ' WHERE ' not in grupo['sql']:
+            pistas.append('Sin WHERE: recorre la tabla completa; paginar o limitar')
+        if not pistas:
+            pistas.append('Revisar índices para las columnas del WHERE/ORDER BY')
+        return pistas
+
+    def _reportar(self, filas):
+        self.stdout.write(
+            f"{'veces':>7}{'total ms':>11}{'p95 ms':>9}{'máx. ms':>9}  origen / huella"
+        )
+        for fila in filas:
+            linea = (
+                f"{fila['veces']:>7}{fila['total_ms']:>11.1f}{fila['p95_ms']:>9.1f}{fila['max_ms']:>9.1f}  "
+                f"{', '.join(fila['origenes'][:3])}"
+            )
+            self.stdout.write(self.style.ERROR(linea) if fila['escaneos'] else linea)
+            self.stdout.write(f"    {fila['huella'][:160]}")
+            for paso in fila['plan']:
+                texto = f'    │ {paso}'
+                self.stdout.write(self.style.WARNING(texto) if es_escaneo_completo(paso) else texto)
+            for pista in fila['pistas']:
+                self.stdout.write(f'    → {pista}')
@@ -0,0 +1,73 @@
+"""
+Comando: archivar_eventos
+Mueve eventos pasados o desactivados (y sus inscripciones) al archivo
+
+Uso:
+    python manage.py archivar_eventos
+    python manage.py archivar_eventos --antes-de 2025-03-01 --lote 1000
+    python manage.py archivar_eventos --simular
+    python manage.py archivar_eventos --campus huanuco
+"""
+
+from datetime import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from ...business.archivo_logic import ArchivoLogic
+from ...data.routers import usar_campus
+
+
+class Command(BaseCommand):
+    help = 'Archiva eventos terminados antes del semestre actual y eventos desactivados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--antes-de',
+            help='Fecha de corte AAAA-MM-DD (por defecto: inicio del semestre actual)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=500,
+            help='Eventos movidos por transacción (por defecto: 500)'
+        )
+        parser.add_argument(
+            '--max-lotes', type=int, default=None,
+            help='Detenerse después de N lotes'
+        )
+        parser.add_argument(
+            '--simular', action='store_true',
+            help='Solo mostrar cuántos eventos se archivarían'
+        )
+        parser.add_argument(
+            '--campus', action='append',
+            help='Campus a archivar (repetible; por defecto: todos los shards)'
+        )
+
+    def handle(self, *args, **options):
+        fecha_corte = None
+        if options['antes_de']:
+            try:
+                fecha_corte = timezone.make_aware(
+                    datetime.strptime(options['antes_de'], '%Y-%m-%d')
+                )
+            except ValueError:
+                raise CommandError('Fecha inválida, use el formato AAAA-MM-DD')
+
+        campus_disponibles = list(settings.CAMPUS_SHARDS)
+        for campus in options['campus'] or []:
+            if campus not in campus_disponibles:
+                raise CommandError(f'Campus desconocido: {campus}')
+
+        for campus in options['campus'] or campus_disponibles:
+            with usar_campus(campus):
+                # Llamar a la CAPA DE NEGOCIO
+                resultado = ArchivoLogic.archivar_antiguos(
+                    fecha_corte=fecha_corte,
+                    tamano_lote=options['lote'],
+                    max_lotes=options['max_lotes'],
+                    simular=options['simular']
+                )
+
+            if not resultado['exito']:
+                raise CommandError(resultado['mensaje'])
+
+            self.stdout.write(self.style.SUCCESS(f'[{campus}] {resultado["mensaje"]}'))
@@ -0,0 +1,256 @@
+"""
+Comando: benchmark
+Mide los caminos calientes de la aplicación (lógica de negocio y vistas)
+sobre conjuntos de datos sintéticos de varios tamaños, en una base de
+datos de prueba desechable (nunca toca la base real).
+
+Las vistas se renderizan de verdad: las plantillas que faltan en este
+despliegue se toman de management/plantillas_presupuesto/ (como en
+verificar_presupuestos). Una vista sin plantilla o que no responde 200 es
+un caso fallido.
+
+Los resultados se guardan en JSON para comparar ejecuciones; con --base
+el comando falla si algún caso es más lento que la línea base por encima
+del umbral (útil en CI).
+
+Uso:
+    python manage.py benchmark --salida benchmark.json
+    python manage.py benchmark --base benchmark.json --umbral 0.2
+    python manage.py benchmark --tamanos 100,1000 --casos buscar_cercanos,vista_lista_lugares
+"""
+
+import itertools
+import json
+import logging
+import platform
+import statistics
+import time
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count, F
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from ...business import cache_versionada
+from ...business.evento_logic import EventoLogic
+from ...business.lugar_logic import LugarLogic
+from ...business.user_logic import UserLogic
+from ...data import sinteticos
+from ...data.models import CustomUser, Evento
+from ..plantillas_prueba import con_plantillas_prueba
+
+
+# Diferencias menores a esto (ms) son ruido aunque superen el umbral relativo
+DIFERENCIA_MINIMA_MS = 0.5
+
+# Casos cuyo costo lo domina el hash de la contraseña: menos repeticiones
+REPETICIONES_MAXIMAS = {'registrar': 5}
+
+VISTAS = ('lista_lugares', 'lista_eventos', 'mis_eventos', 'historial_eventos')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark de repositorios, lógica de negocio y vistas con datos sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', default='100,1000,5000',
+                            help='Lugares por conjunto de datos, separados por comas (por defecto: 100,1000,5000)')
+        parser.add_argument('--repeticiones', type=int, default=10, help='Mediciones por caso (por defecto: 10)')
+        parser.add_argument('--casos', default='', help='Solo estos casos, separados por comas')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--salida', help='Guardar los resultados en este archivo JSON')
+        parser.add_argument('--base', help='Resultados JSON de referencia para detectar regresiones')
+        parser.add_argument('--umbral', type=float, default=0.20,
+                            help='Regresión si la mediana supera a la base en esta proporción (por defecto: 0.20)')
+
+    def handle(self, *args, **options):
+        try:
+            tamanos = sorted({int(t) for t in options['tamanos'].split(',') if t.strip()})
+        except ValueError:
+            raise CommandError('--tamanos debe ser una lista de enteros separados por comas')
+        if not tamanos or tamanos[0] < 10:
+            raise CommandError('Cada tamaño debe ser al menos 10')
+
+        base = None
+        if options['base']:
+            try:
+                with open(options['base'], encoding='utf-8') as archivo:
+                    base = json.load(archivo)['resultados']
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f'No se pudo leer la base {options["base"]}: {e}')
+
+        seleccion = {c.strip() for c in options['casos'].split(',') if c.strip()}
+
+        resultados = {}
+        # Sin líneas por petición ni trazas de las vistas que fallan
+        loggers = [logging.getLogger(nombre) for nombre in ('app.consultas', 'django.request')]
+        silenciados = [logger.disabled for logger in loggers]
+        for logger in loggers:
+            logger.disabled = True
+
+        setup_test_environment(debug=False)
+        bases_prueba = setup_databases(verbosity=0, interactive=False, aliases=connections)
+        plantillas = con_plantillas_prueba()
+        plantillas.enable()
+        try:
+            for tamano in tamanos:
+                self.stdout.write(f'Sembrando {tamano} lugares...')
+                sinteticos.completar_hasta(tamano, options['semilla'])
+                cache_versionada.invalidar('lugar', 'evento')  # bulk_create no envía señales
+                for nombre, funcion in self._casos(tamano, options['semilla'], options['repeticiones']):
+                    if seleccion and nombre not in seleccion:
+                        continue
+                    repeticiones = min(options['repeticiones'], REPETICIONES_MAXIMAS.get(nombre, options['repeticiones']))
+                    resultados[f'{nombre}@{tamano}'] = dict(
+                        caso=nombre, tamano=tamano, **_medir(funcion, repeticiones)
+                    )
+        finally:
+            plantillas.disable()
+            teardown_databases(bases_prueba, verbosity=0)
+            teardown_test_environment()
+            for logger, silenciado in zip(loggers, silenciados):
+                logger.disabled = silenciado
+
+        salida = {
+            'fecha': timezone.now().isoformat(),
+            'semilla': options['semilla'],
+            'tamanos': tamanos,
+            'repeticiones': options['repeticiones'],
+            'entorno': {'python': platform.python_version(), 'django': django.get_version()},
+            'resultados': resultados,
+        }
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(salida, archivo, indent=2, ensure_ascii=False)
+
+        regresiones = self._reportar(resultados, base, options['umbral'])
+        errores = [clave for clave, r in resultados.items() if 'error' in r]
+        if errores:
+            raise CommandError(f'{len(errores)} casos fallaron: ' + ', '.join(errores))
+        if regresiones:
+            raise CommandError(
+                f'{len(regresiones)} regresiones sobre la base: ' + ', '.join(regresiones)
+            )
+
+    def _casos(self, tamano, semilla, repeticiones):
+        """(nombre, función sin argumentos) para el conjunto de datos actual"""
+        ahora = timezone.now()
+        centro = sinteticos.CENTROS[0]
+
+        # Un usuario nuevo (sin inscripciones) por llamada, incluida la de
+        # calentamiento, repartidos entre eventos distintos con cupo: cada
+        # medición recorre el camino completo de una inscripción válida
+        necesarios = repeticiones + 1
+        password_hash = make_password('benchmark123')
+        inicio_ids = CustomUser.objects.order_by('-id').values_list('id', flat=True).first() + 1
+        inscriptores = CustomUser.objects.bulk_create(
+            sinteticos.usuarios(
+                sinteticos.rng_bloque(semilla, 'inscriptores', tamano), inicio_ids, necesarios, password_hash
+            )
+        )
+        con_cupo = list(
+            Evento.objects.filter(activo=True, fecha_inicio__gt=ahora)
+            .annotate(total=Count('inscritos'))
+            .filter(total__lt=F('capacidad_maxima'))
+            .values_list('id', flat=True)[:necesarios]
+        )
+        pares = zip(itertools.cycle(con_cupo), (u.id for u in inscriptores))
+        contador = itertools.count()
+
+        def inscribir():
+            par = next(pares, None)
+            if par is None:
+                raise RuntimeError('No hay eventos con cupo o usuarios sin inscribir suficientes')
+            resultado = EventoLogic.inscribir_usuario(*par)
+            if not resultado['exito']:
+                # Un rechazo no mide la inscripción
+                raise RuntimeError(resultado['mensaje'])
+
+        def sin_cache(funcion):
+            def medida():
+                with cache_versionada.sin_cache():
+                    return funcion()
+            return medida
+
+        # Las consultas, como en las líneas base anteriores a la caché de listas;
+        # los casos *_cache miden los aciertos
+        yield 'buscar_cercanos', sin_cache(lambda: LugarLogic.buscar_cercanos(centro[1], centro[2], radio_km=5))
+        yield 'buscar', sin_cache(lambda: list(LugarLogic.buscar('Parque')))
+        yield 'buscar_cache', lambda: list(LugarLogic.buscar('Parque'))
+        yield 'obtener_disponibles', sin_cache(lambda: list(EventoLogic.obtener_disponibles()))
+        yield 'obtener_disponibles_cache', lambda: list(EventoLogic.obtener_disponibles())
+        yield 'inscribir_usuario', inscribir
+        yield 'registrar', lambda: UserLogic.registrar(
+            f'bench{tamano}_{next(contador)}', 'bench@ejemplo.pe', 'benchmark123', 'benchmark123'
+        )
+
+        cliente = Client()
+        cliente.force_login(CustomUser.objects.get(id=1))
+        for vista in VISTAS:
+            url = reverse(vista)
+            yield f'vista_{vista}', lambda url=url: _pedir(cliente, url)
+
+    def _reportar(self, resultados, base, umbral):
+        """Imprimir la tabla y devolver las claves que empeoraron respecto a la base"""
+        regresiones = []
+        self.stdout.write(
+            f"\n{'caso':<28}{'tamaño':>8}{'mediana ms':>12}{'p95 ms':>10}{'base ms':>10}{'cambio':>9}"
+        )
+        for clave, r in resultados.items():
+            if 'error' in r:
+                self.stdout.write(self.style.ERROR(f"{r['caso']:<28}{r['tamano']:>8}  ERROR: {r['error']}"))
+                continue
+
+            referencia = (base or {}).get(clave, {}).get('mediana_ms')
+            columnas = f"{r['caso']:<28}{r['tamano']:>8}{r['mediana_ms']:>12.2f}{r['p95_ms']:>10.2f}"
+            if referencia is None:
+                self.stdout.write(columnas + f"{'-':>10}{'-':>9}")
+                continue
+
+            cambio = (r['mediana_ms'] - referencia) / referencia if referencia else 0.0
+            linea = columnas + f'{referencia:>10.2f}{cambio:>+9.0%}'
+            if cambio > umbral and r['mediana_ms'] - referencia > DIFERENCIA_MINIMA_MS:
+                regresiones.append(clave)
+                self.stdout.write(self.style.ERROR(linea + '  REGRESIÓN'))
+            else:
+                self.stdout.write(linea)
+
+        return regresiones
+
+
+def _pedir(cliente, url):
+    """GET de una vista; una respuesta distinta de 200 no mide la página"""
+    respuesta = cliente.get(url)
+    if respuesta.status_code != 200:
+        raise RuntimeError(f'HTTP {respuesta.status_code} en {url}')
+    return respuesta
+
+
+def _medir(funcion, repeticiones):
+    """
+    Tiempos en ms de `repeticiones` llamadas tras una de calentamiento
+
+    Cualquier excepción (también TemplateDoesNotExist) es un fallo del caso:
+    el comando termina con error
+    """
+    tiempos = []
+    try:
+        funcion()
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+    tiempos.sort()
+    return {
+        'repeticiones': repeticiones,
+        'min_ms': round(tiempos[0], 3),
+        'mediana_ms': round(statistics.median(tiempos), 3),
+        'p95_ms': round(tiempos[max(0, round(0.95 * len(tiempos)) - 1)], 3),
+        'media_ms': round(statistics.fmean(tiempos), 3),
+    }
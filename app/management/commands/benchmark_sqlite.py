@@ -0,0 +1,196 @@
+"""
+Comando: benchmark_sqlite
+Compara el rendimiento de SQLite con el perfil de desarrollo (valores por
+defecto, una conexión por operación) y el perfil de producción (WAL,
+PRAGMAs y conexiones persistentes) bajo hilos concurrentes.
+
+La carga imita el camino caliente de la aplicación:
+- Lectura: página de 12 eventos con su número de inscritos
+- Escritura: inscripción (contar cupos + insertar) en una transacción
+
+Uso:
+    python manage.py benchmark_sqlite
+    python manage.py benchmark_sqlite --hilos 16 --duracion 10 --escrituras 0.3
+"""
+
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ...data.sqlite_pragmas import sentencias_pragma
+
+
+ESQUEMA = [
+    'CREATE TABLE evento (id INTEGER PRIMARY KEY, titulo TEXT, capacidad INTEGER)',
+    'CREATE TABLE inscripcion ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+    ' evento_id INTEGER NOT NULL REFERENCES evento(id),'
+    ' usuario_id INTEGER NOT NULL,'
+    ' UNIQUE (evento_id, usuario_id))',
+    'CREATE INDEX inscripcion_usuario ON inscripcion (usuario_id)',
+]
+
+CONSULTA_LECTURA = (
+    'SELECT e.id, e.titulo, e.capacidad, COUNT(i.id) FROM evento e'
+    ' LEFT JOIN inscripcion i ON i.evento_id = e.id'
+    ' WHERE e.id BETWEEN ? AND ? GROUP BY e.id'
+)
+
+
+class Perfil:
+    """Forma de abrir conexiones y transacciones para un perfil"""
+
+    def __init__(self, nombre, pragmas, persistente, inicio_transaccion):
+        self.nombre = nombre
+        self.pragmas = pragmas
+        self.persistente = persistente
+        self.inicio_transaccion = inicio_transaccion
+
+    def conectar(self, ruta):
+        # Igual que Django: autocommit y BEGIN explícito en atomic()
+        conexion = sqlite3.connect(ruta, timeout=5, isolation_level=None, check_same_thread=False)
+        for sentencia in sentencias_pragma(self.pragmas):
+            conexion.execute(sentencia)
+        return conexion
+
+
+PERFILES = {
+    'desarrollo': lambda: Perfil('desarrollo', {}, persistente=False, inicio_transaccion='BEGIN'),
+    'produccion': lambda: Perfil(
+        'produccion', settings.SQLITE_PRAGMAS_PRODUCCION,
+        persistente=True, inicio_transaccion='BEGIN IMMEDIATE'
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Mide lecturas/escrituras por segundo de SQLite con el perfil de desarrollo y el de producción'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=8, help='Hilos concurrentes (por defecto: 8)')
+        parser.add_argument('--duracion', type=float, default=5.0, help='Segundos por perfil (por defecto: 5)')
+        parser.add_argument('--escrituras', type=float, default=0.2, help='Proporción de escrituras 0-1 (por defecto: 0.2)')
+        parser.add_argument('--eventos', type=int, default=2000, help='Eventos sembrados (por defecto: 2000)')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Imprimir resultados en JSON')
+
+    def handle(self, *args, **options):
+        resultados = []
+
+        for nombre in ('desarrollo', 'produccion'):
+            perfil = PERFILES[nombre]()
+            with tempfile.TemporaryDirectory() as directorio:
+                ruta = os.path.join(directorio, 'benchmark.sqlite3')
+                self._preparar(ruta, perfil, options['eventos'])
+                resultados.append(self._medir(ruta, perfil, options))
+
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'perfil':<12}{'lecturas/s':>12}{'escrituras/s':>14}{'errores':>10}"
+            f"{'p95 lect. ms':>14}{'p95 escr. ms':>14}"
+        )
+        for r in resultados:
+            self.stdout.write(
+                f"{r['perfil']:<12}{r['lecturas_por_segundo']:>12.0f}{r['escrituras_por_segundo']:>14.0f}"
+                f"{r['errores']:>10}{r['p95_lectura_ms']:>14.2f}{r['p95_escritura_ms']:>14.2f}"
+            )
+
+    def _preparar(self, ruta, perfil, total_eventos):
+        conexion = perfil.conectar(ruta)
+        try:
+            for sentencia in ESQUEMA:
+                conexion.execute(sentencia)
+            conexion.execute('BEGIN')
+            conexion.executemany(
+                'INSERT INTO evento (id, titulo, capacidad) VALUES (?, ?, ?)',
+                ((i, f'Evento {i}', 50) for i in range(1, total_eventos + 1))
+            )
+            conexion.execute('COMMIT')
+        finally:
+            conexion.close()
+
+    def _medir(self, ruta, perfil, options):
+        total_eventos = options['eventos']
+        fin = time.perf_counter() + options['duracion']
+        lock = threading.Lock()
+        datos = {'lecturas': [], 'escrituras': [], 'errores': 0}
+
+        def trabajador(numero):
+            rng = random.Random(options['semilla'] + numero)
+            lecturas, escrituras, errores = [], [], 0
+            conexion = perfil.conectar(ruta) if perfil.persistente else None
+
+            while time.perf_counter() < fin:
+                actual = conexion or perfil.conectar(ruta)
+                inicio = time.perf_counter()
+                try:
+                    if rng.random() < options['escrituras']:
+                        evento_id = rng.randint(1, total_eventos)
+                        actual.execute(perfil.inicio_transaccion)
+                        try:
+                            actual.execute(
+                                'SELECT COUNT(*) FROM inscripcion WHERE evento_id = ?', (evento_id,)
+                            ).fetchone()
+                            actual.execute(
+                                'INSERT OR IGNORE INTO inscripcion (evento_id, usuario_id) VALUES (?, ?)',
+                                (evento_id, rng.randint(1, 1_000_000))
+                            )
+                            actual.execute('COMMIT')
+                        except sqlite3.Error:
+                            if actual.in_transaction:
+                                actual.execute('ROLLBACK')
+                            raise
+                        escrituras.append(time.perf_counter() - inicio)
+                    else:
+                        desde = rng.randint(1, max(1, total_eventos - 12))
+                        actual.execute(CONSULTA_LECTURA, (desde, desde + 11)).fetchall()
+                        lecturas.append(time.perf_counter() - inicio)
+                except sqlite3.OperationalError:
+                    errores += 1
+                finally:
+                    if conexion is None:
+                        actual.close()
+
+            if conexion is not None:
+                conexion.close()
+
+            with lock:
+                datos['lecturas'].extend(lecturas)
+                datos['escrituras'].extend(escrituras)
+                datos['errores'] += errores
+
+        hilos = [threading.Thread(target=trabajador, args=(i,)) for i in range(options['hilos'])]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        duracion = time.perf_counter() - inicio
+
+        return {
+            'perfil': perfil.nombre,
+            'hilos': options['hilos'],
+            'duracion_s': round(duracion, 2),
+            'lecturas_por_segundo': len(datos['lecturas']) / duracion,
+            'escrituras_por_segundo': len(datos['escrituras']) / duracion,
+            'errores': datos['errores'],
+            'p95_lectura_ms': _percentil(datos['lecturas'], 95) * 1000,
+            'p95_escritura_ms': _percentil(datos['escrituras'], 95) * 1000,
+        }
+
+
+def _percentil(valores, percentil):
+    """Percentil por el método del rango más cercano (0 si no hay datos)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
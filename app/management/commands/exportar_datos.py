@@ -0,0 +1,74 @@
+"""
+Comando: exportar_datos
+Exporta lugares, eventos o inscripciones a CSV o NDJSON en streaming
+
+Uso:
+    python manage.py exportar_datos inscripciones > inscripciones.csv
+    python manage.py exportar_datos eventos --formato ndjson --salida eventos.ndjson
+    python manage.py exportar_datos lugares --incluir-inactivos --lote 5000
+    python manage.py exportar_datos eventos --campus huanuco
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...business.exportacion_logic import ExportacionLogic
+from ...data.routers import usar_campus
+
+
+class Command(BaseCommand):
+    help = 'Exporta lugares, eventos o inscripciones a CSV/NDJSON sin cargarlos en memoria'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'recurso', choices=list(ExportacionLogic.RECURSOS),
+            help='Datos a exportar'
+        )
+        parser.add_argument(
+            '--formato', choices=list(ExportacionLogic.FORMATOS), default='csv',
+            help='Formato de salida (por defecto: csv)'
+        )
+        parser.add_argument(
+            '--salida',
+            help='Archivo de salida (por defecto: salida estándar)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=ExportacionLogic.TAMANO_LOTE,
+            help=f'Filas leídas por lote (por defecto: {ExportacionLogic.TAMANO_LOTE})'
+        )
+        parser.add_argument(
+            '--incluir-inactivos', action='store_true',
+            help='Incluir lugares y eventos desactivados'
+        )
+        parser.add_argument(
+            '--campus',
+            help='Campus a exportar (por defecto: CAMPUS_POR_DEFECTO)'
+        )
+
+    def handle(self, *args, **options):
+        campus = options['campus'] or settings.CAMPUS_POR_DEFECTO
+        if campus not in settings.CAMPUS_SHARDS:
+            raise CommandError(f'Campus desconocido: {campus}')
+
+        with usar_campus(campus):
+            # Llamar a la CAPA DE NEGOCIO
+            resultado = ExportacionLogic.exportar(
+                options['recurso'],
+                formato=options['formato'],
+                solo_activos=not options['incluir_inactivos'],
+                tamano_lote=options['lote']
+            )
+
+        if not resultado['exito']:
+            raise CommandError(resultado['mensaje'])
+
+        if not options['salida']:
+            for bloque in resultado['contenido']:
+                self.stdout.write(bloque, ending='')
+            return
+
+        # newline='': el módulo csv ya escribe los \r\n de cada fila
+        with open(options['salida'], 'w', encoding='utf-8', newline='') as archivo:
+            for bloque in resultado['contenido']:
+                archivo.write(bloque)
+
+        self.stderr.write(self.style.SUCCESS(f'[{campus}] {options["recurso"]} → {options["salida"]}'))
@@ -0,0 +1,82 @@
+"""
+Comando: importar_lugares
+Importa lugares en bloque desde un CSV o un GeoJSON
+
+Uso:
+    python manage.py importar_lugares lugares.csv
+    python manage.py importar_lugares lugares.geojson --usuario admin
+    python manage.py importar_lugares lugares.csv --simular
+    python manage.py importar_lugares lugares.csv --lote 1000 --campus huanuco
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...business.importacion_logic import ImportacionLogic
+from ...data.repositories import UserRepository
+from ...data.routers import usar_campus
+
+
+class Command(BaseCommand):
+    help = 'Importa lugares desde CSV/GeoJSON validando por lotes y omitiendo duplicados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .csv, .geojson o .json')
+        parser.add_argument(
+            '--formato', choices=['csv', 'geojson'],
+            help='Formato del archivo (por defecto: según la extensión)'
+        )
+        parser.add_argument(
+            '--usuario',
+            help='Username que figurará como creador de los lugares'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=ImportacionLogic.TAMANO_LOTE,
+            help=f'Filas validadas e insertadas por lote (por defecto: {ImportacionLogic.TAMANO_LOTE})'
+        )
+        parser.add_argument(
+            '--simular', action='store_true',
+            help='Solo validar y mostrar el informe, sin insertar nada'
+        )
+        parser.add_argument(
+            '--campus',
+            help='Campus de destino (por defecto: CAMPUS_POR_DEFECTO)'
+        )
+
+    def handle(self, *args, **options):
+        formato = options['formato'] or ImportacionLogic.formato_de(options['archivo'])
+        if formato is None:
+            raise CommandError('No se reconoce el formato: use --formato csv|geojson')
+
+        campus = options['campus'] or settings.CAMPUS_POR_DEFECTO
+        if campus not in settings.CAMPUS_SHARDS:
+            raise CommandError(f'Campus desconocido: {campus}')
+
+        usuario = None
+        if options['usuario']:
+            usuario = UserRepository.obtener_por_username(options['usuario'])
+            if usuario is None:
+                raise CommandError(f'Usuario desconocido: {options["usuario"]}')
+
+        try:
+            archivo = open(options['archivo'], 'rb')
+        except OSError as e:
+            raise CommandError(f'No se puede abrir el archivo: {e}')
+
+        with archivo, usar_campus(campus):
+            # Llamar a la CAPA DE NEGOCIO
+            resultado = ImportacionLogic.importar_lugares(
+                archivo, formato,
+                usuario=usuario,
+                tamano_lote=options['lote'],
+                simular=options['simular']
+            )
+
+        for error in resultado['errores']:
+            self.stdout.write(f'  fila {error["fila"]}: {error["mensaje"]}')
+        omitidos = resultado['invalidos'] + resultado['duplicados'] - len(resultado['errores'])
+        if omitidos > 0:
+            self.stdout.write(f'  ... y {omitidos} problemas más')
+
+        if not resultado['exito']:
+            raise CommandError(resultado['mensaje'])
+        self.stdout.write(self.style.SUCCESS(f'[{campus}] {resultado["mensaje"]}'))
@@ -0,0 +1,245 @@
+"""
+Comando: perfil_arranque
+Mide el arranque en frío de un worker, cada vez en un proceso Python nuevo:
+
+- wsgi / asgi: tiempo hasta tener la aplicación lista y hasta la primera
+  respuesta (la primera petición carga además el URLconf y las vistas)
+- manage: duración de `manage.py check`
+- importación de config.settings, app.urls y de todos los módulos de
+  app.presentation, app.business y app.data, indicando cuáles no se
+  cargan durante el arranque (se importan al primer uso)
+
+Falla si se supera PRESUPUESTO_ARRANQUE (presentation/presupuestos.py).
+Se descarta una primera ejecución para que los .pyc estén compilados.
+
+Uso:
+    python manage.py perfil_arranque
+    python manage.py perfil_arranque --repeticiones 10 --ruta /eventos/ --json
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...presentation.presupuestos import PRESUPUESTO_ARRANQUE
+
+
+PAQUETES = ('app.presentation', 'app.business', 'app.data')
+MODULOS_RAIZ = ('config.settings', 'app.urls')
+
+# Se ejecuta en un proceso nuevo: argv = modo, ruta, host, instante de lanzamiento, paquetes
+# (-X importtime no ve lo que Django importa con importlib, como config.settings
+# o app.urls: se mide la ejecución de cada módulo desde sys.meta_path)
+SCRIPT_WORKER = r'''
+import importlib, importlib.abc, importlib.machinery, io, json, os, pkgutil, sys, time
+modo, ruta, host, lanzamiento, paquetes = sys.argv[1:]
+lanzamiento = float(lanzamiento)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+importaciones = {}
+
+
+class Temporizador(importlib.abc.MetaPathFinder):
+    def find_spec(self, nombre, ruta, objetivo=None):
+        if nombre.split('.')[0] not in ('app', 'config'):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(nombre, ruta, objetivo)
+        if spec is None or spec.loader is None:
+            return spec
+        ejecutar = spec.loader.exec_module
+
+        def exec_module(modulo):
+            inicio = time.perf_counter()
+            try:
+                ejecutar(modulo)
+            finally:
+                importaciones[nombre] = (time.perf_counter() - inicio) * 1000
+
+        spec.loader.exec_module = exec_module
+        return spec
+
+
+sys.meta_path.insert(0, Temporizador())
+
+if modo == 'wsgi':
+    from config.wsgi import application
+else:
+    from config.asgi import application
+lista = time.time()
+
+if modo == 'wsgi':
+    estado = []
+    entorno = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': ruta, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+        'SERVER_NAME': host, 'SERVER_PORT': '80', 'HTTP_HOST': host, 'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': False, 'wsgi.multiprocess': True, 'wsgi.run_once': False,
+    }
+    respuesta = application(entorno, lambda status, headers, exc_info=None: estado.append(status))
+    b''.join(respuesta)
+    respuesta.close()
+    estado = int(estado[0].split()[0])
+else:
+    import asyncio
+    mensajes = []
+    cuerpo = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def recibir():
+        if cuerpo:
+            return cuerpo.pop()
+        await asyncio.Future()  # El cliente nunca se desconecta
+
+    async def enviar(mensaje):
+        mensajes.append(mensaje)
+
+    alcance = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': ruta, 'raw_path': ruta.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', host.encode())], 'client': ('127.0.0.1', 0), 'server': (host, 80),
+    }
+    asyncio.run(application(alcance, recibir, enviar))
+    estado = next(m['status'] for m in mensajes if m['type'] == 'http.response.start')
+primera = time.time()
+
+cargados_en_arranque = sorted(nombre for nombre in sys.modules if nombre.startswith(('app', 'config')))
+
+# El resto de módulos de las capas, para registrar también su importación
+for paquete in paquetes.split(','):
+    modulo = importlib.import_module(paquete)
+    for info in pkgutil.iter_modules(modulo.__path__, paquete + '.'):
+        importlib.import_module(info.name)
+
+print(json.dumps({
+    'arranque_ms': (lista - lanzamiento) * 1000,
+    'primera_respuesta_ms': (primera - lanzamiento) * 1000,
+    'estado': estado,
+    'cargados': cargados_en_arranque,
+    'importaciones': importaciones,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Mide el arranque en frío (importaciones y primera respuesta WSGI/ASGI) contra su presupuesto'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=5, help='Procesos por modo (se usa la mediana)')
+        parser.add_argument('--modos', default='wsgi,asgi,manage', help='Por defecto: wsgi,asgi,manage')
+        parser.add_argument('--ruta', default='/', help='Ruta de la primera petición (por defecto: /)')
+        parser.add_argument('--top', type=int, default=15, help='Módulos más lentos a mostrar')
+        parser.add_argument('--json', action='store_true', help='Imprimir resultados en JSON')
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser al menos 1')
+        modos = [modo.strip() for modo in options['modos'].split(',') if modo.strip()]
+        desconocidos = set(modos) - set(PRESUPUESTO_ARRANQUE)
+        if desconocidos:
+            raise CommandError(f'Modos desconocidos: {", ".join(sorted(desconocidos))}')
+
+        # Sin PYTHONDONTWRITEBYTECODE: un worker real arranca con los .pyc ya compilados
+        self.entorno = {
+            clave: valor for clave, valor in os.environ.items() if clave != 'PYTHONDONTWRITEBYTECODE'
+        }
+        self.entorno['DJANGO_SETTINGS_MODULE'] = os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')
+        self.host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+
+        resultados = {}
+        importaciones = None
+        for modo in modos:
+            self._ejecutar(modo, options['ruta'])  # Calentamiento: compila los .pyc
+            muestras = [self._ejecutar(modo, options['ruta']) for _ in range(options['repeticiones'])]
+            resultados[modo] = self._resumir(muestras)
+            if importaciones is None and modo in ('wsgi', 'asgi'):
+                importaciones = muestras[-1]['importaciones']
+                cargados = set(muestras[-1]['cargados'])
+
+        modulos = []
+        if importaciones:
+            modulos = sorted((
+                {'modulo': nombre, 'ms': round(ms, 2), 'en_arranque': nombre in cargados}
+                for nombre, ms in importaciones.items()
+                if nombre in MODULOS_RAIZ or nombre.startswith(tuple(p + '.' for p in PAQUETES))
+            ), key=lambda modulo: modulo['ms'], reverse=True)
+            resultados['importacion'] = {
+                'modulo_ms': max((m['ms'] for m in modulos if m['en_arranque']), default=0.0),
+            }
+
+        fallos = self._evaluar(resultados)
+
+        if options['json']:
+            self.stdout.write(json.dumps(
+                {'modos': resultados, 'modulos': modulos, 'fallos': fallos}, indent=2
+            ))
+        else:
+            self._reportar(resultados, modulos[:options['top']], fallos)
+
+        if fallos:
+            raise CommandError(f'Arranque fuera de presupuesto: {"; ".join(fallos)}')
+
+    def _ejecutar(self, modo, ruta):
+        """Un proceso nuevo; devuelve sus tiempos (ms) e importaciones"""
+        lanzamiento = time.time()
+        if modo == 'manage':
+            proceso = subprocess.run(
+                [sys.executable, 'manage.py', 'check'],
+                cwd=settings.BASE_DIR, env=self.entorno, capture_output=True, text=True,
+            )
+            if proceso.returncode:
+                raise CommandError(f'manage.py check falló:\n{proceso.stderr[-2000:]}')
+            return {'arranque_ms': (time.time() - lanzamiento) * 1000}
+
+        proceso = subprocess.run(
+            [sys.executable, '-c', SCRIPT_WORKER, modo, ruta, self.host, repr(lanzamiento), ','.join(PAQUETES)],
+            cwd=settings.BASE_DIR, env=self.entorno, capture_output=True, text=True,
+        )
+        if proceso.returncode:
+            raise CommandError(f'El worker {modo} falló:\n{proceso.stderr[-2000:]}')
+        return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+    def _resumir(self, muestras):
+        resumen = {'repeticiones': len(muestras)}
+        for clave in ('arranque_ms', 'primera_respuesta_ms'):
+            valores = [muestra[clave] for muestra in muestras if clave in muestra]
+            if valores:
+                resumen[clave] = round(statistics.median(valores), 1)
+                resumen[clave.replace('_ms', '_max_ms')] = round(max(valores), 1)
+        if 'estado' in muestras[0]:
+            resumen['estado'] = muestras[0]['estado']
+        return resumen
+
+    def _evaluar(self, resultados):
+        fallos = []
+        for modo, medidas in resultados.items():
+            for clave, limite in PRESUPUESTO_ARRANQUE.get(modo, {}).items():
+                if clave in medidas and medidas[clave] > limite:
+                    fallos.append(f'{modo} {clave} {medidas[clave]:.1f} > {limite}')
+            if medidas.get('estado', 200) >= 500:
+                fallos.append(f'{modo} respondió HTTP {medidas["estado"]}')
+        return fallos
+
+    def _reportar(self, resultados, modulos, fallos):
+        self.stdout.write(f"{'modo':<12}{'arranque ms':>13}{'1.ª resp. ms':>14}{'máx. ms':>10}  presupuesto")
+        for modo, medidas in resultados.items():
+            if modo == 'importacion':
+                continue
+            presupuesto = PRESUPUESTO_ARRANQUE.get(modo, {})
+            maximo = medidas.get('primera_respuesta_max_ms', medidas.get('arranque_max_ms'))
+            self.stdout.write(
+                f"{modo:<12}{medidas['arranque_ms']:>13.1f}{medidas.get('primera_respuesta_ms', '-'):>14}"
+                f"{maximo:>10.1f}  {', '.join(f'{k} ≤ {v}' for k, v in presupuesto.items())}"
+            )
+
+        if modulos:
+            self.stdout.write('\nImportación (acumulada, ms):')
+            for modulo in modulos:
+                nota = '' if modulo['en_arranque'] else '  (al primer uso)'
+                self.stdout.write(f"  {modulo['ms']:>8.2f}  {modulo['modulo']}{nota}")
+
+        for fallo in fallos:
+            self.stdout.write(self.style.ERROR(fallo))
+        if not fallos:
+            self.stdout.write(self.style.SUCCESS('Arranque dentro de presupuesto'))
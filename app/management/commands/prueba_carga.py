@@ -0,0 +1,349 @@
+"""
+Comando: prueba_carga
+Generador de carga con recorridos de usuario realistas, para dimensionar
+la capacidad antes de cada apertura de inscripciones:
+
+    login → lista_eventos → inscribir_evento → mis_eventos → lugares_cercanos
+
+Cada usuario virtual inicia sesión con un usuario sembrado (sembrar_datos)
+y repite el recorrido hasta que se acaba el tiempo. Reporta throughput,
+percentiles de latencia y tasa de error por nombre de URL (app/urls.py).
+
+Modos:
+- wsgi: llama directamente a config.wsgi.application (sin red ni servidor)
+- http: contra un servidor en marcha (runserver, gunicorn...)
+
+En ambos modos los usuarios y eventos se leen de la base configurada,
+que debe ser la misma que usa el servidor.
+
+Uso:
+    python manage.py sembrar_datos --usuarios 2000 --lugares 500 --eventos 5000
+    python manage.py prueba_carga --concurrencia 20 --duracion 30
+    python manage.py prueba_carga --modo http --url http://127.0.0.1:8000 --pool procesos
+"""
+
+import http.client
+import io
+import json
+import logging
+import random
+import secrets
+import string
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from ...data import sinteticos
+from ...data.models import CustomUser, Evento
+
+
+# Estados esperados por paso; cualquier otro cuenta como error
+ESPERADOS = {
+    'login': {302},
+    'lista_eventos': {200},
+    'inscribir_evento': {302},
+    'mis_eventos': {200},
+    'lugares_cercanos': {200},
+}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class SesionWSGI:
+    """Usuario virtual que llama a la aplicación WSGI en el mismo proceso"""
+
+    _aplicacion = None
+    _lock = threading.Lock()
+
+    def __init__(self, config):
+        SesionWSGI.cargar()
+        self.cookies = {}
+
+    @staticmethod
+    def cargar():
+        """Importar config.wsgi una vez por proceso (reconfigura el logging)"""
+        with SesionWSGI._lock:
+            if SesionWSGI._aplicacion is None:
+                from config.wsgi import application
+                SesionWSGI._aplicacion = application
+
+    def solicitar(self, metodo, ruta, datos=None):
+        """Devuelve el código de estado; actualiza las cookies"""
+        partes = urlsplit(ruta)
+        cuerpo = urlencode(datos or {}).encode()
+        environ = {
+            'REQUEST_METHOD': metodo,
+            'PATH_INFO': partes.path,
+            'QUERY_STRING': partes.query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': '; '.join(f'{k}={v}' for k, v in self.cookies.items()),
+            'HTTP_X_CSRFTOKEN': self.cookies.get('csrftoken', ''),
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(cuerpo)),
+            'wsgi.input': io.BytesIO(cuerpo),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+            'wsgi.version': (1, 0),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        respuesta = {}
+
+        def start_response(estado, cabeceras, exc_info=None):
+            respuesta['estado'] = int(estado.split()[0])
+            respuesta['cabeceras'] = cabeceras
+
+        cuerpo_respuesta = SesionWSGI._aplicacion(environ, start_response)
+        try:
+            for _ in cuerpo_respuesta:
+                pass
+        finally:
+            if hasattr(cuerpo_respuesta, 'close'):
+                cuerpo_respuesta.close()
+
+        _guardar_cookies(self.cookies, respuesta['cabeceras'])
+        return respuesta['estado']
+
+
+class SesionHTTP:
+    """Usuario virtual con una conexión keep-alive a un servidor real"""
+
+    def __init__(self, config):
+        partes = urlsplit(config['url'])
+        clase = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+        self.conexion = clase(partes.netloc, timeout=config['timeout'])
+        self.host = partes.netloc
+        self.cookies = {}
+
+    def solicitar(self, metodo, ruta, datos=None):
+        cuerpo = urlencode(datos or {}) if metodo == 'POST' else None
+        cabeceras = {
+            'Host': self.host,
+            'Cookie': '; '.join(f'{k}={v}' for k, v in self.cookies.items()),
+            'X-CSRFToken': self.cookies.get('csrftoken', ''),
+        }
+        if cuerpo is not None:
+            cabeceras['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        try:
+            self.conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras)
+            respuesta = self.conexion.getresponse()
+            respuesta.read()
+        except (OSError, http.client.HTTPException):
+            self.conexion.close()  # Se reabre en la siguiente petición
+            raise
+
+        _guardar_cookies(self.cookies, respuesta.getheaders())
+        return respuesta.status
+
+
+SESIONES = {'wsgi': SesionWSGI, 'http': SesionHTTP}
+
+
+def _guardar_cookies(cookies, cabeceras):
+    for nombre, valor in cabeceras:
+        if nombre.lower() == 'set-cookie':
+            for morsel in SimpleCookie(valor).values():
+                if morsel['max-age'] == '0':
+                    cookies.pop(morsel.key, None)
+                else:
+                    cookies[morsel.key] = morsel.value
+
+
+def _token_csrf():
+    """Secreto CSRF generado por el cliente: Django acepta cookie y cabecera iguales"""
+    return ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
+
+
+def _recorrido(sesion, rng, config, username, registrar):
+    """Un recorrido completo; se detiene en el primer fallo de login"""
+    sesion.cookies = {'csrftoken': _token_csrf()}
+
+    _, latitud, longitud = sinteticos.coordenada(rng)
+    pasos = [
+        ('login', 'POST', reverse('login'), {'username': username, 'password': config['password']}),
+        ('lista_eventos', 'GET', reverse('lista_eventos'), None),
+        ('inscribir_evento', 'POST', reverse('inscribir_evento', args=[rng.choice(config['eventos'])]), {}),
+        ('mis_eventos', 'GET', reverse('mis_eventos'), None),
+        ('lugares_cercanos', 'GET', f"{reverse('lugares_cercanos')}?lat={latitud}&lon={longitud}&radio=5", None),
+    ]
+
+    for nombre, metodo, ruta, datos in pasos:
+        inicio = time.perf_counter()
+        try:
+            estado = sesion.solicitar(metodo, ruta, datos)
+        except Exception as e:
+            registrar(nombre, time.perf_counter() - inicio, type(e).__name__)
+            return
+        error = None if estado in ESPERADOS[nombre] else f'HTTP {estado}'
+        registrar(nombre, time.perf_counter() - inicio, error)
+        if nombre == 'login' and error:
+            return
+
+
+def _usuario_virtual(config, numero):
+    """Repetir recorridos hasta config['fin']; devuelve las mediciones"""
+    rng = random.Random(f"{config['semilla']}:{numero}")
+    sesion = SESIONES[config['modo']](config)
+    username = config['usuarios'][numero % len(config['usuarios'])]
+    mediciones = []
+
+    def registrar(nombre, segundos, error):
+        mediciones.append((nombre, segundos, error))
+
+    while time.time() < config['fin']:
+        _recorrido(sesion, rng, config, username, registrar)
+        if config['pausa']:
+            time.sleep(rng.uniform(0, 2 * config['pausa']))
+
+    return mediciones
+
+
+def _iniciar_proceso():
+    """Inicializador de cada proceso: Django listo y sin conexiones heredadas"""
+    if not apps.ready:
+        django.setup()  # Arranque 'spawn' (macOS/Windows)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga con recorridos de usuario (login → eventos → inscripción → lugares cercanos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modo', choices=sorted(SESIONES), default='wsgi',
+                            help='wsgi: config.wsgi en el mismo proceso; http: servidor en --url')
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Servidor para --modo http')
+        parser.add_argument('--concurrencia', type=int, default=10, help='Usuarios virtuales (por defecto: 10)')
+        parser.add_argument('--pool', choices=('hilos', 'procesos'), default='hilos',
+                            help='Ejecutar los usuarios virtuales en hilos o procesos')
+        parser.add_argument('--duracion', type=float, default=30.0, help='Segundos de prueba (por defecto: 30)')
+        parser.add_argument('--pausa', type=float, default=0.0,
+                            help='Pausa media entre recorridos en segundos (por defecto: 0)')
+        parser.add_argument('--prefijo', default='usuario', help='Prefijo de los usuarios sembrados')
+        parser.add_argument('--password', default='sembrado123', help='Contraseña de los usuarios sembrados')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Timeout HTTP en segundos')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Imprimir resultados en JSON')
+
+    def handle(self, *args, **options):
+        if options['concurrencia'] < 1:
+            raise CommandError('--concurrencia debe ser al menos 1')
+
+        usuarios = list(
+            CustomUser.objects.filter(username__startswith=options['prefijo'], is_active=True)
+            .order_by('id').values_list('username', flat=True)[:options['concurrencia']]
+        )
+        eventos = list(
+            Evento.objects.filter(activo=True, fecha_inicio__gt=timezone.now())
+            .values_list('id', flat=True)[:1000]
+        )
+        if not usuarios or not eventos:
+            raise CommandError('No hay usuarios o eventos futuros; ejecute primero sembrar_datos')
+
+        config = {
+            'modo': options['modo'],
+            'url': options['url'],
+            'timeout': options['timeout'],
+            'password': options['password'],
+            'pausa': options['pausa'],
+            'semilla': options['semilla'],
+            'usuarios': usuarios,
+            'eventos': eventos,
+        }
+
+        if options['pool'] == 'procesos':
+            connections.close_all()
+            ejecutor = ProcessPoolExecutor(max_workers=options['concurrencia'], initializer=_iniciar_proceso)
+        else:
+            ejecutor = ThreadPoolExecutor(max_workers=options['concurrencia'])
+
+        self.stdout.write(
+            f"{options['concurrencia']} usuarios virtuales ({options['pool']}, {options['modo']}) "
+            f"durante {options['duracion']:.0f} s..."
+        )
+        # En modo wsgi las vistas corren aquí: sin una línea de log por petición
+        if options['modo'] == 'wsgi':
+            SesionWSGI.cargar()
+        loggers = [logging.getLogger(nombre) for nombre in ('app.consultas', 'django.request')]
+        silenciados = [logger.disabled for logger in loggers]
+        for logger in loggers:
+            logger.disabled = True
+
+        inicio = time.perf_counter()
+        config['fin'] = time.time() + options['duracion']
+        try:
+            with ejecutor:
+                futuros = [ejecutor.submit(_usuario_virtual, config, n) for n in range(options['concurrencia'])]
+                mediciones = [m for futuro in futuros for m in futuro.result()]
+        finally:
+            for logger, silenciado in zip(loggers, silenciados):
+                logger.disabled = silenciado
+        duracion = time.perf_counter() - inicio
+
+        if not mediciones:
+            raise CommandError('No se completó ninguna petición')
+
+        resultados = _resumir(mediciones, duracion)
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+
+        self.stdout.write(
+            f"\n{'url':<20}{'peticiones':>11}{'req/s':>9}{'errores':>9}"
+            + ''.join(f'{"p" + str(p) + " ms":>10}' for p in PERCENTILES)
+        )
+        for fila in resultados['por_url'] + [resultados['total']]:
+            linea = (
+                f"{fila['url']:<20}{fila['peticiones']:>11}{fila['por_segundo']:>9.1f}"
+                f"{fila['tasa_error']:>9.1%}"
+                + ''.join(f"{fila[f'p{p}_ms']:>10.1f}" for p in PERCENTILES)
+            )
+            self.stdout.write(self.style.ERROR(linea) if fila['tasa_error'] else linea)
+
+        for fila in resultados['por_url']:
+            for error, veces in fila['errores'].items():
+                self.stdout.write(f"  {fila['url']}: {error} × {veces}")
+
+
+def _resumir(mediciones, duracion):
+    """Agrupar mediciones por nombre de URL (en el orden del recorrido)"""
+    por_url = {}
+    for nombre, segundos, error in mediciones:
+        por_url.setdefault(nombre, []).append((segundos, error))
+
+    def fila(nombre, datos):
+        tiempos = sorted(s for s, _ in datos)
+        errores = {}
+        for _, error in datos:
+            if error:
+                errores[error] = errores.get(error, 0) + 1
+        resultado = {
+            'url': nombre,
+            'peticiones': len(datos),
+            'por_segundo': len(datos) / duracion,
+            'tasa_error': sum(errores.values()) / len(datos),
+            'errores': errores,
+        }
+        for p in PERCENTILES:
+            indice = max(0, min(len(tiempos) - 1, round(p / 100 * len(tiempos)) - 1))
+            resultado[f'p{p}_ms'] = tiempos[indice] * 1000
+        return resultado
+
+    orden = [nombre for nombre in ESPERADOS if nombre in por_url]
+    return {
+        'duracion_s': round(duracion, 2),
+        'por_url': [fila(nombre, por_url[nombre]) for nombre in orden],
+        'total': fila('TOTAL', [d for nombre in orden for d in por_url[nombre]]),
+    }
@@ -0,0 +1,67 @@
+"""
+Comando: resumen_metricas
+Muestra qué operaciones de la capa de negocio dominan la latencia (p99)
+a partir del endpoint /metrics/ de un servidor en marcha o de un volcado
+
+Uso:
+    python manage.py resumen_metricas --url http://127.0.0.1:8000/metrics/ --token $METRICAS_TOKEN
+    python manage.py resumen_metricas --archivo metricas.txt
+"""
+
+import json
+import urllib.request
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...business import metricas
+
+
+class Command(BaseCommand):
+    help = 'Resume las métricas de LugarLogic/EventoLogic/UserLogic ordenadas por p99'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default='http://127.0.0.1:8000/metrics/',
+            help='Endpoint de métricas a consultar'
+        )
+        parser.add_argument('--token', default=None, help='Token Bearer (por defecto: METRICAS_TOKEN)')
+        parser.add_argument('--archivo', help='Leer un volcado de /metrics/ en vez de la URL')
+        parser.add_argument('--limite', type=int, default=20, help='Filas a mostrar')
+        parser.add_argument('--json', action='store_true', help='Imprimir el resumen en JSON')
+
+    def handle(self, *args, **options):
+        texto = self._leer(options)
+        filas = metricas.resumen(metricas.parsear_prometheus(texto))[:options['limite']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(filas, indent=2))
+            return
+
+        if not filas:
+            self.stdout.write('Sin métricas registradas (¿INSTRUMENTAR_LOGICA activado?)')
+            return
+
+        self.stdout.write(
+            f"{'método':<40}{'llamadas':>10}{'fallos':>8}{'errores':>9}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'total ms':>12}"
+        )
+        for f in filas:
+            self.stdout.write(
+                f"{f['metodo']:<40}{f['llamadas']:>10}{f['fallos']:>8}{f['errores']:>9}"
+                f"{f['p50_ms']:>10.2f}{f['p95_ms']:>10.2f}{f['p99_ms']:>10.2f}{f['total_ms']:>12.1f}"
+            )
+
+    def _leer(self, options):
+        if options['archivo']:
+            with open(options['archivo'], encoding='utf-8') as archivo:
+                return archivo.read()
+
+        peticion = urllib.request.Request(options['url'])
+        token = options['token'] or getattr(settings, 'METRICAS_TOKEN', '')
+        if token:
+            peticion.add_header('Authorization', f'Bearer {token}')
+
+        try:
+            with urllib.request.urlopen(peticion, timeout=10) as respuesta:
+                return respuesta.read().decode('utf-8')
+        except OSError as e:
+            raise CommandError(f'No se pudo leer {options["url"]}: {e}')
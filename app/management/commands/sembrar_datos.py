@@ -0,0 +1,231 @@
+"""
+Comando: sembrar_datos
+Carga volúmenes realistas de datos sintéticos para pruebas de carga:
+usuarios, lugares agrupados alrededor de Tingo María y otras ciudades del
+Perú, eventos e inscripciones.
+
+Es rápido porque:
+- Usa bulk_create por bloques, cada bloque en una sola transacción
+- Hashea la contraseña UNA vez y la comparte entre todos los usuarios
+- Con --procesos > 1 los bloques se GENERAN en procesos hijos y los
+  inserta un único escritor (este proceso): SQLite admite un escritor a la
+  vez y varios procesos insertando fallan con "database is locked". Solo
+  compensa con núcleos libres y bloques caros de generar: copiar los
+  objetos entre procesos también cuesta
+
+Es determinista: cada bloque tiene su propio generador derivado de
+(semilla, tipo, índice), así que el resultado no depende de --procesos.
+Con --referencia fija también se repiten las fechas de los eventos.
+
+Uso:
+    python manage.py sembrar_datos
+    python manage.py sembrar_datos --usuarios 1000 --lugares 500 --eventos 5000 --procesos 4
+    python manage.py sembrar_datos --semilla 7 --referencia 2026-03-01 --campus huanuco
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from ...business import cache_versionada
+from ...data import sinteticos
+from ...data.models import CustomUser, Lugar, Evento
+from ...data.routers import bd_de_campus, usar_campus
+
+
+class Command(BaseCommand):
+    help = 'Siembra usuarios, lugares, eventos e inscripciones sintéticos con bulk_create por bloques'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=100_000, help='Por defecto: 100000')
+        parser.add_argument('--lugares', type=int, default=50_000, help='Por defecto: 50000')
+        parser.add_argument('--eventos', type=int, default=500_000, help='Por defecto: 500000')
+        parser.add_argument(
+            '--ocupacion', type=float, default=0.1,
+            help='Ocupación media de los eventos 0-1 (por defecto: 0.1)'
+        )
+        parser.add_argument('--bloque', type=int, default=5000, help='Filas por bloque/transacción (por defecto: 5000)')
+        parser.add_argument(
+            '--procesos', type=int, default=1,
+            help='Procesos que generan bloques; inserta siempre uno solo (por defecto: 1)'
+        )
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument(
+            '--referencia',
+            help='Fecha AAAA-MM-DD alrededor de la cual se reparten los eventos (por defecto: hoy)'
+        )
+        parser.add_argument('--password', default='sembrado123', help='Contraseña de todos los usuarios')
+        parser.add_argument('--campus', default=None, help='Shard donde sembrar lugares y eventos')
+
+    def handle(self, *args, **options):
+        if options['bloque'] < 1 or options['procesos'] < 1:
+            raise CommandError('--bloque y --procesos deben ser al menos 1')
+        if options['campus'] and options['campus'] not in settings.CAMPUS_SHARDS:
+            raise CommandError(f'Campus desconocido: {options["campus"]}')
+
+        if options['referencia']:
+            try:
+                referencia = timezone.make_aware(datetime.strptime(options['referencia'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('Fecha inválida, use el formato AAAA-MM-DD')
+        else:
+            referencia = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Los IDs se asignan aquí, antes de repartir: cada bloque sabe sus IDs
+        # sin consultar la base, y no choca con los datos ya existentes
+        with usar_campus(options['campus']):
+            primer_usuario = (CustomUser.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+            primer_lugar = (Lugar.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+            primer_evento = (Evento.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+
+        # Creadores e inscritos salen de los usuarios nuevos (o de los existentes
+        # si no se siembran usuarios); los eventos, de los lugares nuevos
+        if options['usuarios']:
+            usuario_ids = (primer_usuario, primer_usuario + options['usuarios'] - 1)
+        else:
+            usuario_ids = (1, primer_usuario - 1)
+        if options['lugares']:
+            lugar_ids = (primer_lugar, primer_lugar + options['lugares'] - 1)
+        else:
+            lugar_ids = (1, primer_lugar - 1)
+
+        if usuario_ids[1] < 1 or (options['eventos'] and lugar_ids[1] < 1):
+            raise CommandError('Se necesitan usuarios y lugares para sembrar lugares y eventos')
+
+        comun = {
+            'semilla': options['semilla'],
+            'campus': options['campus'],
+            # Sal fija: mismo hash en cada ejecución con la misma semilla
+            'password_hash': make_password(options['password'], salt=f'sembrado{options["semilla"]}'),
+            'usuario_ids': usuario_ids,
+            'lugar_ids': lugar_ids,
+            'referencia': referencia,
+            'ocupacion': options['ocupacion'],
+        }
+
+        # Cada fase depende de los IDs de la anterior: se ejecutan en orden
+        inicio = time.perf_counter()
+        for tipo, primer_id, total in (
+            ('usuarios', primer_usuario, options['usuarios']),
+            ('lugares', primer_lugar, options['lugares']),
+            ('eventos', primer_evento, options['eventos']),
+        ):
+            tareas = [
+                dict(comun, tipo=tipo, indice=indice, primer_id=primer_id + desde,
+                     cantidad=min(options['bloque'], total - desde))
+                for indice, desde in enumerate(range(0, total, options['bloque']))
+            ]
+            self._ejecutar(tipo, tareas, total, options['procesos'])
+
+        # bulk_create no envía señales: invalidar a mano las listas en caché
+        cache_versionada.invalidar('lugar', 'evento', campus=options['campus'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Siembra completa en {time.perf_counter() - inicio:.1f} s'
+        ))
+
+    def _ejecutar(self, tipo, tareas, total, procesos):
+        if not tareas:
+            return
+
+        inicio = time.perf_counter()
+        hechos, inscripciones = 0, 0
+
+        for bloque in _generados(tareas, procesos):
+            filas, filas_inscripciones = _insertar_bloque(bloque)
+            hechos += filas
+            inscripciones += filas_inscripciones
+            self.stdout.write(
+                f'\r{tipo}: {hechos}/{total} ({time.perf_counter() - inicio:.1f} s)', ending=''
+            )
+            self.stdout.flush()
+
+        extra = f', {inscripciones} inscripciones' if tipo == 'eventos' else ''
+        self.stdout.write(f'\r{tipo}: {hechos}{extra} en {time.perf_counter() - inicio:.1f} s')
+
+
+def _generados(tareas, procesos):
+    """
+    Bloques generados en orden; con varios procesos, como mucho 2 por
+    proceso esperando a ser insertados (la memoria no crece con el total)
+    """
+    if procesos == 1:
+        yield from map(_generar_bloque, tareas)
+        return
+
+    # Los procesos hijos no deben heredar conexiones abiertas
+    connections.close_all()
+    pendientes_max = procesos * 2
+    restantes = iter(tareas)
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso) as ejecutor:
+        try:
+            pendientes = deque(ejecutor.submit(_generar_bloque, tarea) for tarea in islice(restantes, pendientes_max))
+            while pendientes:
+                bloque = pendientes.popleft().result()
+                siguiente = next(restantes, None)
+                if siguiente is not None:
+                    pendientes.append(ejecutor.submit(_generar_bloque, siguiente))
+                yield bloque
+        finally:
+            ejecutor.shutdown(cancel_futures=True)
+
+
+def _iniciar_proceso():
+    """Inicializador de cada proceso: Django listo (los hijos no usan la base)"""
+    if not apps.ready:
+        django.setup()  # Arranque 'spawn' (macOS/Windows)
+
+
+def _generar_bloque(tarea):
+    """
+    Generar los objetos de un bloque sin tocar la base
+
+    Returns:
+        dict: {'tipo', 'campus', 'objetos', 'inscripciones'}
+    """
+    rng = sinteticos.rng_bloque(tarea['semilla'], tarea['tipo'], tarea['indice'])
+    bloque = {'tipo': tarea['tipo'], 'campus': tarea['campus'], 'inscripciones': []}
+
+    if tarea['tipo'] == 'usuarios':
+        bloque['objetos'] = sinteticos.usuarios(rng, tarea['primer_id'], tarea['cantidad'], tarea['password_hash'])
+    elif tarea['tipo'] == 'lugares':
+        bloque['objetos'] = sinteticos.lugares(rng, tarea['primer_id'], tarea['cantidad'], tarea['usuario_ids'])
+    else:
+        bloque['objetos'] = sinteticos.eventos(
+            rng, tarea['primer_id'], tarea['cantidad'],
+            tarea['lugar_ids'], tarea['usuario_ids'], tarea['referencia']
+        )
+        bloque['inscripciones'] = sinteticos.inscripciones(
+            sinteticos.rng_bloque(tarea['semilla'], 'inscripciones', tarea['indice']),
+            bloque['objetos'], tarea['usuario_ids'], ocupacion_media=tarea['ocupacion']
+        )
+    return bloque
+
+
+def _insertar_bloque(bloque):
+    """
+    Insertar un bloque generado en una transacción (siempre desde el proceso principal)
+
+    Returns:
+        tuple: (filas insertadas, inscripciones insertadas)
+    """
+    with usar_campus(bloque['campus']):
+        if bloque['tipo'] == 'usuarios':
+            with transaction.atomic(using='default'):
+                CustomUser.objects.bulk_create(bloque['objetos'])
+        else:
+            modelo = Lugar if bloque['tipo'] == 'lugares' else Evento
+            with transaction.atomic(using=bd_de_campus()):
+                modelo.objects.bulk_create(bloque['objetos'])
+                if bloque['inscripciones']:
+                    Evento.inscritos.through.objects.bulk_create(bloque['inscripciones'])
+    return len(bloque['objetos']), len(bloque['inscripciones'])
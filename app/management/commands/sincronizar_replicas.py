@@ -0,0 +1,48 @@
+"""
+Comando: sincronizar_replicas
+Copia la base de datos primaria SQLite sobre cada réplica configurada
+(sustituto local de la replicación real)
+
+Uso:
+    DJANGO_DB_REPLICAS=/tmp/replica1.sqlite3 python manage.py sincronizar_replicas
+"""
+
+import sqlite3
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from ...data.routers import replicas_de
+
+
+class Command(BaseCommand):
+    help = 'Copia la base de datos primaria SQLite sobre sus réplicas de lectura'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--primaria', default='default',
+            help='Alias de la base de datos primaria (por defecto: default)'
+        )
+
+    def handle(self, *args, **options):
+        primaria = options['primaria']
+        replicas = replicas_de(primaria)
+
+        if not replicas:
+            raise CommandError(f'No hay réplicas configuradas para "{primaria}" (DJANGO_DB_REPLICAS)')
+
+        origen_cfg = connections[primaria].settings_dict
+        if origen_cfg['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('La sincronización local solo está disponible para SQLite')
+
+        origen = sqlite3.connect(str(origen_cfg['NAME']))
+        try:
+            for alias in replicas:
+                destino = sqlite3.connect(str(connections[alias].settings_dict['NAME']))
+                try:
+                    # API de backup: copia consistente aunque haya escrituras en curso
+                    origen.backup(destino)
+                finally:
+                    destino.close()
+
+                self.stdout.write(self.style.SUCCESS(f'Réplica "{alias}" sincronizada'))
+        finally:
+            origen.close()
@@ -0,0 +1,222 @@
+"""
+Comando: verificar_presupuestos
+Recorre TODAS las vistas de app/urls.py con datos sintéticos en dos
+tamaños y falla si alguna:
+
+- no tiene presupuesto declarado en presentation/presupuestos.py
+- supera su máximo de consultas o de tiempo SQL
+- hace más consultas con más datos (síntoma de N+1)
+- no se puede renderizar (sin plantilla no se cuentan las consultas que
+  hace la plantilla: relaciones perezosas, N+1 en los bucles)
+
+Las plantillas del proyecto original no están en este repositorio: si no
+se encuentran se usan las de management/plantillas_presupuesto/, que
+recorren el contexto como lo haría la página (van al final de DIRS, así
+que las reales tienen prioridad).
+
+Usa una base de prueba desechable; pensado para CI antes de desplegar.
+
+Uso:
+    python manage.py verificar_presupuestos
+    python manage.py verificar_presupuestos --tamanos 20,200 --json
+"""
+
+import json
+import logging
+from contextlib import ExitStack
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count, F
+from django.template import TemplateDoesNotExist
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from ... import urls as app_urls
+from ...business import cache_versionada
+from ...data import sinteticos
+from ...data.consultas import RegistroConsultas
+from ...data.models import CustomUser, Lugar, Evento
+from ...presentation.presupuestos import PRESUPUESTOS, excesos
+from ..plantillas_prueba import con_plantillas_prueba, es_de_prueba
+
+
+# Vistas que se ejercitan con POST (el resto con GET)
+METODOS_POST = {'inscribir_evento', 'desinscribir_evento'}
+
+class Command(BaseCommand):
+    help = 'Verifica los presupuestos de consultas SQL de todas las vistas con dos tamaños de datos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', default='20,200',
+                            help='Dos tamaños (lugares) separados por coma (por defecto: 20,200)')
+        parser.add_argument('--vistas', default='', help='Solo estos nombres de URL, separados por comas')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Imprimir resultados en JSON')
+
+    def handle(self, *args, **options):
+        try:
+            pequeno, grande = sorted(int(t) for t in options['tamanos'].split(','))
+        except ValueError:
+            raise CommandError('--tamanos debe tener dos enteros separados por coma')
+        if pequeno < 10 or pequeno == grande:
+            raise CommandError('Los tamaños deben ser distintos y de al menos 10')
+
+        seleccion = {v.strip() for v in options['vistas'].split(',') if v.strip()}
+        rutas = [
+            patron for patron in app_urls.urlpatterns
+            if isinstance(patron, URLPattern) and patron.name
+            and (not seleccion or patron.name in seleccion)
+        ]
+        if not rutas:
+            raise CommandError('Ninguna vista coincide con --vistas')
+
+        loggers = [logging.getLogger(nombre) for nombre in ('app.consultas', 'django.request')]
+        silenciados = [logger.disabled for logger in loggers]
+        for logger in loggers:
+            logger.disabled = True
+
+        setup_test_environment(debug=False)
+        bases_prueba = setup_databases(verbosity=0, interactive=False, aliases=connections)
+        plantillas = con_plantillas_prueba()
+        plantillas.enable()
+        try:
+            sinteticos.completar_hasta(pequeno, options['semilla'])
+            staff = CustomUser.objects.create_user('presupuesto', 'presupuesto@ejemplo.pe', 'x', is_staff=True)
+            self._inscribir(staff, pequeno // 2)
+
+            # Calentamiento: cachés de ContentType, permisos, plantillas...
+            for patron in rutas:
+                self._medir(patron, staff)
+
+            medidas = {patron.name: {'pequeno': self._medir(patron, staff)} for patron in rutas}
+
+            sinteticos.completar_hasta(grande, options['semilla'])
+            self._inscribir(staff, grande // 2)
+            for patron in rutas:
+                medidas[patron.name]['grande'] = self._medir(patron, staff)
+        finally:
+            plantillas.disable()
+            teardown_databases(bases_prueba, verbosity=0)
+            teardown_test_environment()
+            for logger, silenciado in zip(loggers, silenciados):
+                logger.disabled = silenciado
+
+        fallos = self._evaluar(medidas)
+
+        if options['json']:
+            self.stdout.write(json.dumps({'tamanos': [pequeno, grande], 'vistas': medidas}, indent=2))
+        else:
+            self._reportar(medidas, pequeno, grande)
+
+        if fallos:
+            raise CommandError(f'{len(fallos)} vistas fuera de presupuesto: ' + ', '.join(fallos))
+
+    def _inscribir(self, usuario, cantidad):
+        """Inscribir al usuario en `cantidad` eventos más (mis_eventos crece con los datos)"""
+        Inscripcion = Evento.inscritos.through
+        ya = Inscripcion.objects.filter(customuser_id=usuario.id).values('evento_id')
+        ids = Evento.objects.filter(activo=True).exclude(id__in=ya).values_list('id', flat=True)[:cantidad]
+        Inscripcion.objects.bulk_create(
+            [Inscripcion(evento_id=evento_id, customuser_id=usuario.id) for evento_id in ids]
+        )
+
+    def _argumentos(self, nombre, parametros, usuario):
+        """Valores para los parámetros de la ruta de una vista"""
+        ahora = timezone.now()
+        eventos = Evento.objects.filter(activo=True)
+        inscrito = Evento.inscritos.through.objects.filter(customuser_id=usuario.id).values('evento_id')
+
+        if nombre == 'inscribir_evento':
+            # Un evento distinto en cada llamada: siempre el camino de inscripción exitosa
+            evento = (
+                eventos.filter(fecha_inicio__gt=ahora).exclude(id__in=inscrito)
+                .annotate(total=Count('inscritos')).filter(total__lt=F('capacidad_maxima'))
+                .order_by('id').first()
+            )
+        else:
+            evento = eventos.filter(id__in=inscrito).order_by('id').first()
+
+        valores = {
+            'lugar_id': Lugar.objects.filter(activo=True).order_by('id').values_list('id', flat=True).first(),
+            'evento_id': evento.id if evento else 0,
+            'user_id': CustomUser.objects.exclude(id=usuario.id).order_by('id').values_list('id', flat=True).first(),
+            'recurso': 'eventos',
+        }
+        return {parametro: valores[parametro] for parametro in parametros}
+
+    def _medir(self, patron, usuario):
+        """Consultas y tiempo SQL de una petición autenticada a la vista"""
+        cliente = Client()
+        cliente.force_login(usuario)
+        url = reverse(patron.name, kwargs=self._argumentos(patron.name, patron.pattern.converters, usuario))
+        metodo = cliente.post if patron.name in METODOS_POST else cliente.get
+
+        # Se mide el camino sin caché (peor caso): versiones nuevas, sin borrar nada
+        cache_versionada.invalidar('lugar', 'evento')
+
+        registro = RegistroConsultas()
+        nota = ''
+        with ExitStack() as pila:
+            for conexion in connections.all():
+                pila.enter_context(conexion.execute_wrapper(registro))
+            try:
+                respuesta = metodo(url)
+                nota = f'HTTP {respuesta.status_code}'
+                if any(es_de_prueba(plantilla) for plantilla in respuesta.templates):
+                    nota += ' (plantilla de prueba)'
+            except TemplateDoesNotExist as e:
+                # Sin render no hay medida completa: la vista no se puede verificar
+                nota = f'error sin plantilla {e}'
+            except Exception as e:
+                nota = f'error {type(e).__name__}: {e}'
+
+        return {
+            'consultas': registro.total,
+            'tiempo_ms': round(registro.tiempo * 1000, 2),
+            'repetidas': registro.repetidas(3),
+            'nota': nota,
+        }
+
+    def _evaluar(self, medidas):
+        """Anotar los problemas de cada vista; devuelve los nombres que fallan"""
+        fallos = []
+        for nombre, medida in medidas.items():
+            problemas = [
+                medida[tamano]['nota'] for tamano in ('pequeno', 'grande')
+                if medida[tamano]['nota'].startswith('error')
+            ]
+            if nombre not in PRESUPUESTOS:
+                problemas.append('sin presupuesto declarado')
+            for tamano in ('pequeno', 'grande'):
+                problemas += excesos(nombre, medida[tamano]['consultas'], medida[tamano]['tiempo_ms'])
+            if medida['grande']['consultas'] > medida['pequeno']['consultas']:
+                problemas.append(
+                    f"las consultas crecen con los datos ({medida['pequeno']['consultas']} → "
+                    f"{medida['grande']['consultas']})"
+                )
+            medida['problemas'] = problemas
+            if problemas:
+                fallos.append(nombre)
+        return fallos
+
+    def _reportar(self, medidas, pequeno, grande):
+        self.stdout.write(
+            f"{'vista':<24}{f'cons. {pequeno}':>11}{f'cons. {grande}':>11}{f'ms {grande}':>10}"
+            f"{'máx. cons.':>12}{'máx. ms':>9}  nota"
+        )
+        for nombre, medida in medidas.items():
+            presupuesto = PRESUPUESTOS.get(nombre, {})
+            linea = (
+                f"{nombre:<24}{medida['pequeno']['consultas']:>11}{medida['grande']['consultas']:>11}"
+                f"{medida['grande']['tiempo_ms']:>10.1f}{presupuesto.get('consultas', '-'):>12}"
+                f"{presupuesto.get('tiempo_ms', '-'):>9}  {medida['grande']['nota']}"
+            )
+            if medida['problemas']:
+                self.stdout.write(self.style.ERROR(linea))
+                for problema in medida['problemas']:
+                    self.stdout.write(f'    {problema}')
+                for repetida in medida['grande']['repetidas']:
+                    self.stdout.write(f"    {repetida['veces']}× {repetida['origen']}: {repetida['huella'][:90]}")
+            else:
+                self.stdout.write(linea)
@@ -0,0 +1,29 @@
+"""
+Plantillas de prueba de los comandos que renderizan vistas
+(verificar_presupuestos, benchmark)
+
+Las plantillas del proyecto original no están en este repositorio: las de
+plantillas_presupuesto/ recorren el contexto como lo haría la página. Van
+al final de DIRS, así que las reales tienen prioridad.
+"""
+
+import copy
+from pathlib import Path
+from django.conf import settings
+from django.test import override_settings
+
+
+PLANTILLAS_PRUEBA = Path(__file__).resolve().parent / 'plantillas_presupuesto'
+
+
+def con_plantillas_prueba():
+    """override_settings con PLANTILLAS_PRUEBA como último directorio de TEMPLATES"""
+    plantillas = copy.deepcopy(settings.TEMPLATES)
+    plantillas[0]['DIRS'] = [*plantillas[0]['DIRS'], PLANTILLAS_PRUEBA]
+    return override_settings(TEMPLATES=plantillas)
+
+
+def es_de_prueba(plantilla):
+    """Indica si la plantilla se cargó de PLANTILLAS_PRUEBA"""
+    origen = getattr(getattr(plantilla, 'origin', None), 'name', None)
+    return origen is not None and Path(origen).is_relative_to(PLANTILLAS_PRUEBA)
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoArchivado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evento_original_id', models.BigIntegerField(unique=True)),
+                ('titulo', models.CharField(max_length=200)),
+                ('descripcion', models.TextField()),
+                ('fecha_inicio', models.DateTimeField()),
+                ('fecha_fin', models.DateTimeField(db_index=True)),
+                ('lugar_id_original', models.BigIntegerField(null=True)),
+                ('lugar_nombre', models.CharField(blank=True, max_length=200)),
+                ('capacidad_maxima', models.IntegerField()),
+                ('total_inscritos', models.IntegerField(default=0)),
+                ('activo', models.BooleanField(default=True)),
+                ('creado_por_id_original', models.BigIntegerField(null=True)),
+                ('fecha_creacion', models.DateTimeField()),
+                ('fecha_archivado', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Evento archivado',
+                'verbose_name_plural': 'Eventos archivados',
+                'ordering': ['-fecha_inicio'],
+            },
+        ),
+        migrations.CreateModel(
+            name='InscripcionArchivada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscripciones', to='app.eventoarchivado')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscripciones_archivadas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Inscripción archivada',
+                'verbose_name_plural': 'Inscripciones archivadas',
+                'unique_together': {('evento', 'usuario')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_archivo_eventos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='campus',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='evento',
+            name='creado_por',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventos_creados', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='evento',
+            name='inscritos',
+            field=models.ManyToManyField(blank=True, db_constraint=False, related_name='eventos_inscritos', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='inscripcionarchivada',
+            name='usuario',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='inscripciones_archivadas', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='lugar',
+            name='creado_por',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lugares_creados', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
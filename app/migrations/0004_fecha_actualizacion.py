@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_campus_sharding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='lugar',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
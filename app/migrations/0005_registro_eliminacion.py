@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroEliminacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recurso', models.CharField(max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('fecha_eliminacion', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Registro de eliminación',
+                'verbose_name_plural': 'Registros de eliminación',
+                'indexes': [models.Index(fields=['recurso', 'fecha_eliminacion'], name='app_elim_recurso_fecha')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_registro_eliminacion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='evento',
+            name='fecha_fin',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='evento',
+            name='fecha_inicio',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
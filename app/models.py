@@ -1,8 +1,8 @@
-"""
-Modelos de la aplicación - Re-exportados desde data layer
-Esto es necesario para que Django encuentre los modelos
-"""
-
-from .data.models import CustomUser, Lugar, Evento
-
-__all__ = ['CustomUser', 'Lugar', 'Evento']
+"""
+Modelos de la aplicación - Re-exportados desde data layer
+Esto es necesario para que Django encuentre los modelos
+"""
+
+from .data.models import CustomUser, Lugar, Evento, EventoArchivado, InscripcionArchivada, RegistroEliminacion
+
+__all__ = ['CustomUser', 'Lugar', 'Evento', 'EventoArchivado', 'InscripcionArchivada', 'RegistroEliminacion']
@@ -1 +1 @@
-# Capa de Presentación - Maneja HTTP requests/responses
+# Capa de Presentación - Maneja HTTP requests/responses
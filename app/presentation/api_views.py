@@ -0,0 +1,165 @@
+"""
+CAPA DE PRESENTACIÓN - API JSON
+SOLO maneja HTTP - La lógica está en la capa de negocio
+"""
+
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+from ..business.api_logic import ApiLogic
+from ..business.sync_logic import SyncLogic
+
+try:
+    import orjson
+except ImportError:  # Opcional: sin orjson se usa JsonResponse (json de la stdlib)
+    orjson = None
+
+
+_CODIFICADOR = DjangoJSONEncoder()
+
+
+def respuesta_json(datos, status=200):
+    """
+    JSON con orjson si está instalado (varias veces más rápido)
+
+    Las fechas se delegan en DjangoJSONEncoder para que salgan igual con o sin
+    orjson (ISO 8601 en milisegundos, 'Z' en UTC), como en las exportaciones
+    """
+    if orjson is None:
+        return JsonResponse(datos, status=status)
+    contenido = orjson.dumps(datos, default=_CODIFICADOR.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return HttpResponse(contenido, status=status, content_type='application/json')
+
+
+def login_requerido_json(vista):
+    """Como login_required, pero responde 401 en JSON en vez de redirigir (también vistas async)"""
+    if iscoroutinefunction(vista):
+        @wraps(vista)
+        async def envoltura_async(request, *args, **kwargs):
+            request.user = await request.auser()
+            if not request.user.is_authenticated:
+                return JsonResponse({'exito': False, 'mensaje': 'Autenticación requerida'}, status=401)
+            return await vista(request, *args, **kwargs)
+        return envoltura_async
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'exito': False, 'mensaje': 'Autenticación requerida'}, status=401)
+        return vista(request, *args, **kwargs)
+    return envoltura
+
+
+@require_GET
+@login_requerido_json
+def sync_cambios(request, recurso):
+    """
+    Sincronización incremental para clientes móviles
+
+    GET /api/sync/lugares/?cursor=<cursor>&limite=500
+    Devuelve los registros modificados desde el cursor y el nuevo cursor
+    """
+    try:
+        limite = int(request.GET.get('limite', 500))
+    except ValueError:
+        return respuesta_json({'exito': False, 'mensaje': 'Límite inválido'}, status=400)
+
+    # Llamar a la CAPA DE NEGOCIO
+    resultado = SyncLogic.cambios_desde(
+        recurso=recurso,
+        cursor=request.GET.get('cursor') or None,
+        limite=limite
+    )
+
+    if not resultado['exito']:
+        return respuesta_json(resultado, status=400)
+
+    return respuesta_json(resultado)
+
+
+def _parametros(request):
+    """Parámetros comunes de los listados: ?fields=, ?cursor=, ?limite=, ?q= (ValueError si el límite no es un número)"""
+    return {
+        'campos': request.GET.get('fields') or None,
+        'cursor': request.GET.get('cursor') or None,
+        'limite': int(request.GET.get('limite', 50)),
+        'query': request.GET.get('q', ''),
+        'user_id': request.user.id,
+    }
+
+
+def _respuesta_listado(resultado):
+    if not resultado['exito']:
+        return respuesta_json(resultado, status=400)
+    return respuesta_json(resultado)
+
+
+def _listado(request, recurso):
+    """GET común de los listados"""
+    try:
+        parametros = _parametros(request)
+    except ValueError:
+        return respuesta_json({'exito': False, 'mensaje': 'Límite inválido'}, status=400)
+
+    # Llamar a la CAPA DE NEGOCIO
+    return _respuesta_listado(ApiLogic.listar(recurso=recurso, **parametros))
+
+
+async def _alistado(request, recurso):
+    """_listado() con el ORM async"""
+    try:
+        parametros = _parametros(request)
+    except ValueError:
+        return respuesta_json({'exito': False, 'mensaje': 'Límite inválido'}, status=400)
+
+    # Llamar a la CAPA DE NEGOCIO
+    return _respuesta_listado(await ApiLogic.alistar(recurso=recurso, **parametros))
+
+
+@require_GET
+@login_requerido_json
+def api_lugares(request):
+    """
+    Lugares activos
+
+    GET /api/lugares/?fields=id,nombre,latitud,longitud&limite=100&cursor=<cursor>
+    """
+    return _listado(request, 'lugares')
+
+
+@require_GET
+@login_requerido_json
+def api_eventos(request):
+    """
+    Eventos activos (?fields= admite lugar_nombre, num_inscritos, plazas_disponibles)
+
+    GET /api/eventos/?fields=id,titulo,fecha_inicio,plazas_disponibles&q=yoga
+    """
+    return _listado(request, 'eventos')
+
+
+@require_GET
+@login_requerido_json
+async def api_lugares_async(request):
+    """api_lugares para ASGI (DJANGO_VISTAS_ASYNC=1)"""
+    return await _alistado(request, 'lugares')
+
+
+@require_GET
+@login_requerido_json
+async def api_eventos_async(request):
+    """api_eventos para ASGI (DJANGO_VISTAS_ASYNC=1)"""
+    return await _alistado(request, 'eventos')
+
+
+@require_GET
+@login_requerido_json
+def api_mis_inscripciones(request):
+    """
+    Eventos activos en los que el usuario está inscrito
+
+    GET /api/mis-inscripciones/?fields=id,titulo,fecha_inicio
+    """
+    return _listado(request, 'mis_inscripciones')
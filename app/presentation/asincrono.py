@@ -0,0 +1,32 @@
+"""
+CAPA DE PRESENTACIÓN - Utilidades para las vistas async (ASGI)
+Con DJANGO_VISTAS_ASYNC=1 las listas y búsquedas se sirven con vistas
+async (ver app/urls.py): mientras esperan a la base de datos no ocupan un
+hilo del servidor, así un proceso ASGI atiende muchos más clientes lentos.
+"""
+
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import render
+
+
+def login_requerido_async(vista):
+    """
+    login_required para vistas async que además deja request.user cargado
+
+    Lo síncrono que corre dentro del bucle de eventos (condition(), claves
+    de caché) lee request.user: ya resuelto, no consulta la base de datos.
+    """
+    @wraps(vista)
+    async def envoltura(request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await vista(request, *args, **kwargs)
+    return envoltura
+
+
+async def renderizar(request, plantilla, contexto):
+    """render() fuera del bucle de eventos (la plantilla lee sesión y relaciones perezosas)"""
+    return await sync_to_async(render)(request, plantilla, contexto)
@@ -0,0 +1,93 @@
+"""
+CAPA DE PRESENTACIÓN - Caché de páginas renderizadas
+Decorador para vistas de lista: guarda el HTML por usuario con la misma
+clave versionada que las listas de la capa de negocio, así una página
+nunca sobrevive a un cambio de los modelos de los que depende.
+"""
+
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from ..business import cache_versionada
+
+
+def cachear_pagina(*modelos, segundos=None):
+    """
+    Cachear el HTML de una vista GET según sus modelos ('lugar', 'evento')
+
+    La clave incluye ruta completa, usuario y cookie CSRF (el HTML lleva
+    el token del formulario). No se cachea si hay mensajes pendientes,
+    si la respuesta no es 200 o si fija cookies. Sirve también para
+    vistas async.
+    """
+    def decorador(vista):
+        prefijo = f'pagina:{vista.__name__}'
+
+        def _clave(request, args, kwargs):
+            """Clave de la página, o None si esta petición no se cachea"""
+            csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+            if request.method != 'GET' or not csrf or len(messages.get_messages(request)):
+                return None
+            return cache_versionada.clave(
+                prefijo,
+                (request.get_full_path(), request.user.pk, csrf, args, sorted(kwargs.items())),
+                modelos,
+            )
+
+        def _guardable(respuesta):
+            return respuesta.status_code == 200 and not respuesta.streaming and not respuesta.cookies
+
+        def _desde_cache(guardada):
+            cache_versionada.anotar(prefijo, guardada is not None)
+            if guardada is None:
+                return None
+            respuesta = HttpResponse(guardada['contenido'], content_type=guardada['tipo'])
+            respuesta['X-Cache'] = 'HIT'
+            return respuesta
+
+        if iscoroutinefunction(vista):
+            @wraps(vista)
+            async def envoltura_async(request, *args, **kwargs):
+                clave = await sync_to_async(_clave)(request, args, kwargs)
+                if clave is None:
+                    return await vista(request, *args, **kwargs)
+
+                respuesta = _desde_cache(await cache.aget(clave))
+                if respuesta is not None:
+                    return respuesta
+
+                respuesta = await vista(request, *args, **kwargs)
+                if _guardable(respuesta):
+                    await cache.aset(
+                        clave,
+                        {'contenido': respuesta.content, 'tipo': respuesta['Content-Type']},
+                        segundos or settings.CACHE_LISTAS_SEGUNDOS,
+                    )
+                    respuesta['X-Cache'] = 'MISS'
+                return respuesta
+            return envoltura_async
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            clave = _clave(request, args, kwargs)
+            if clave is None:
+                return vista(request, *args, **kwargs)
+
+            respuesta = _desde_cache(cache.get(clave))
+            if respuesta is not None:
+                return respuesta
+
+            respuesta = vista(request, *args, **kwargs)
+            if _guardable(respuesta):
+                cache.set(
+                    clave,
+                    {'contenido': respuesta.content, 'tipo': respuesta['Content-Type']},
+                    segundos or settings.CACHE_LISTAS_SEGUNDOS,
+                )
+                respuesta['X-Cache'] = 'MISS'
+            return respuesta
+        return envoltura
+    return decorador
@@ -0,0 +1,110 @@
+"""
+CAPA DE PRESENTACIÓN - GET condicional (ETag / Last-Modified)
+Validadores baratos para las vistas de lista: en vez de consultar la lista
+y renderizarla, se calculan marcadores agregados de los modelos de los que
+depende la página (total de filas y última modificación, inscripciones) y
+si el cliente ya tiene esa versión se responde 304 sin ejecutar la vista.
+
+El ETag incluye además al usuario y su cookie CSRF (la página lleva sus
+botones y el token de los formularios) y DJANGO_VERSION_DESPLIEGUE, para
+que un despliegue con plantillas nuevas no se quede en 304.
+
+En las vistas async los marcadores (consultas independientes) se calculan
+a la vez antes de llegar a condition().
+"""
+
+import functools
+import hashlib
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.utils import timezone
+from django.views.decorators.http import condition
+from ..business.evento_logic import EventoLogic
+from ..business.lugar_logic import LugarLogic
+from ..data.paralelo import en_paralelo
+
+
+# Nombre → marcador(request). Los que devuelven 'modificado' sirven también
+# para Last-Modified; los demás solo para el ETag.
+MARCADORES = {
+    'lugar': lambda request: LugarLogic.marca_cambios(),
+    'evento': lambda request: EventoLogic.marca_cambios(),
+    # Plazas libres: cambian con las inscripciones de cualquier usuario
+    'inscripciones': lambda request: EventoLogic.marca_inscripciones(),
+    'mis_inscripciones': lambda request: EventoLogic.marca_inscripciones(request.user.pk),
+    # El filtro 'proximos' depende de la hora aunque no cambien los datos
+    'proximos': lambda request: (
+        {'minuto': timezone.now().strftime('%Y%m%d%H%M')} if request.GET.get('filtro') == 'proximos' else {}
+    ),
+}
+
+
+def get_condicional(*fuentes):
+    """
+    Decorador: ETag y Last-Modified a partir de los marcadores de las fuentes
+
+    Responde 304 a If-None-Match / If-Modified-Since si nada cambió. Va por
+    fuera de cachear_pagina: un 304 no llega ni a leer la caché.
+    Last-Modified solo se envía si todas las fuentes tienen fecha (las
+    inscripciones no la tienen). La fecha de lugares y eventos incluye sus
+    eliminaciones físicas (RegistroEliminacion): un cliente que solo envía
+    If-Modified-Since no recibe un 304 obsoleto tras borrar una fila antigua.
+    """
+    desconocidas = set(fuentes) - set(MARCADORES)
+    if desconocidas:
+        raise ValueError(f'Fuentes desconocidas: {sorted(desconocidas)}')
+
+    def _marcas(request):
+        """Marcadores de la petición (una consulta por fuente, una sola vez)"""
+        if not hasattr(request, '_marcas_condicional'):
+            if len(messages.get_messages(request)):
+                # Mensajes pendientes: se renderiza siempre (y se consumen)
+                request._marcas_condicional = None
+            else:
+                request._marcas_condicional = {fuente: MARCADORES[fuente](request) for fuente in fuentes}
+        return request._marcas_condicional
+
+    async def _amarcas(request):
+        """_marcas() sin bloquear el bucle de eventos, con las fuentes en paralelo"""
+        if hasattr(request, '_marcas_condicional'):
+            return
+        if await sync_to_async(lambda: len(messages.get_messages(request)))():
+            request._marcas_condicional = None
+            return
+        valores = await en_paralelo(*(functools.partial(MARCADORES[fuente], request) for fuente in fuentes))
+        request._marcas_condicional = dict(zip(fuentes, valores))
+
+    def etag(request, *args, **kwargs):
+        marcas = _marcas(request)
+        if marcas is None:
+            return None
+        partes = (
+            getattr(settings, 'VERSION_DESPLIEGUE', ''),
+            request.user.pk,
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+            sorted((fuente, sorted(marca.items())) for fuente, marca in marcas.items()),
+        )
+        return hashlib.md5(repr(partes).encode()).hexdigest()
+
+    def ultima_modificacion(request, *args, **kwargs):
+        marcas = _marcas(request)
+        if marcas is None or not all('modificado' in marca for marca in marcas.values()):
+            return None
+        return max((marca['modificado'] for marca in marcas.values() if marca['modificado']), default=None)
+
+    condicional = condition(etag_func=etag, last_modified_func=ultima_modificacion)
+
+    def decorador(vista):
+        envuelta = condicional(vista)
+        if not iscoroutinefunction(vista):
+            return envuelta
+
+        @functools.wraps(vista)
+        async def envoltura(request, *args, **kwargs):
+            # condition() llama a etag() dentro del bucle de eventos, donde no
+            # se puede consultar: los marcadores ya tienen que estar calculados
+            await _amarcas(request)
+            return await envuelta(request, *args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,217 @@
+"""
+CAPA DE PRESENTACIÓN - Estáticos optimizados (etapa de collectstatic)
+Storage de staticfiles que, además de los nombres con hash del manifiesto
+(caché de larga duración: el nombre cambia si cambia el contenido):
+
+- precomprime .gz (y .br si está instalado brotli) los archivos de texto,
+  para servirlos tal cual (nginx gzip_static / brotli_static)
+- genera variantes WebP en varios anchos de las imágenes (Pillow)
+- convierte los GIF animados a MP4 (ffmpeg) y a WebP animado (Pillow)
+
+Las variantes se anotan en variantes.json (STATIC_ROOT) con las medidas
+originales; las usan {% imagen %} y {% gif_animado %} (templatetags/
+estaticos.py). Sin Pillow o sin ffmpeg esas variantes se omiten y las
+plantillas siguen usando el archivo original.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.utils.functional import cached_property
+
+try:
+    import brotli
+except ImportError:  # Opcional: solo .gz
+    brotli = None
+
+try:
+    from PIL import Image, ImageSequence
+except ImportError:  # Opcional: sin variantes WebP
+    Image = ImageSequence = None
+
+
+COMPRIMIBLES = ('.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.xml', '.html', '.ico', '.woff', '.ttf')
+IMAGENES = ('.jpg', '.jpeg', '.png')
+MIN_BYTES_COMPRESION = 1024
+ARCHIVO_VARIANTES = 'variantes.json'
+
+
+def _medidas_gif(datos):
+    """(ancho, alto) de la cabecera de un GIF"""
+    return struct.unpack('<HH', datos[6:10])
+
+
+def _es_gif_animado(datos):
+    # Los GIF animados llevan la extensión de repetición NETSCAPE2.0
+    return datos[:6] in (b'GIF87a', b'GIF89a') and b'NETSCAPE2.0' in datos
+
+
+class EstaticosOptimizados(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage + precompresión + variantes de imágenes y GIF"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        variantes = {}
+        self._generadas = {}
+        for nombre in sorted(paths):
+            hasheado = self.hashed_files.get(self.hash_key(self.clean_name(nombre)))
+            if not hasheado:
+                continue
+            with self.open(hasheado) as archivo:
+                datos = archivo.read()
+
+            extension = os.path.splitext(nombre)[1].lower()
+            if extension in COMPRIMIBLES:
+                for generado in self._comprimir(hasheado, datos):
+                    yield nombre, generado, True
+            elif extension in IMAGENES:
+                variantes[nombre] = self._variantes_imagen(nombre, hasheado)
+            elif extension == '.gif' and _es_gif_animado(datos):
+                variantes[nombre] = self._variantes_gif(nombre, hasheado, datos)
+
+        # Las variantes entran al manifiesto con un nombre lógico
+        # (app/gif/ciudad.mp4 → app/gif/ciudad.3f2a91c0.mp4): url() y {% static %} las resuelven
+        for nombre, generadas in self._generadas.items():
+            self.hashed_files[self.hash_key(nombre)] = generadas
+            yield nombre, generadas, True
+        if self._generadas:
+            self.save_manifest()
+
+        # Se conservan las de archivos que no se recolectaron esta vez
+        anteriores = self.leer_variantes()
+        anteriores.update(variantes)
+        self._guardar(ARCHIVO_VARIANTES, json.dumps(anteriores, indent=1, sort_keys=True).encode())
+        self.__dict__.pop('variantes', None)
+
+    # --- Precompresión --------------------------------------------------------
+
+    def _comprimir(self, hasheado, datos):
+        if len(datos) < MIN_BYTES_COMPRESION:
+            return
+        formatos = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            formatos.append(('.br', lambda d: brotli.compress(d, quality=11)))
+
+        for sufijo, comprimir in formatos:
+            comprimido = comprimir(datos)
+            if len(comprimido) >= len(datos) * 0.95:
+                continue  # No compensa (ya comprimido)
+            self._guardar(hasheado + sufijo, comprimido)
+            yield hasheado + sufijo
+
+    # --- Variantes ------------------------------------------------------------
+
+    def _variantes_imagen(self, original, hasheado):
+        """WebP en cada ancho de ESTATICOS_ANCHOS menor que el original (y el original)"""
+        if Image is None:
+            return {}
+        with Image.open(self.path(hasheado)) as imagen:
+            ancho, alto = imagen.size
+            webp = []
+            for destino in self._anchos(ancho):
+                logico, nombre = self._variante(original, hasheado, f'{destino}w.webp')
+                if not self.exists(nombre):
+                    copia = imagen.convert('RGBA' if imagen.mode in ('RGBA', 'LA', 'P') else 'RGB')
+                    if destino < ancho:
+                        copia = copia.resize((destino, round(alto * destino / ancho)), Image.LANCZOS)
+                    self._guardar_imagen(nombre, copia, quality=80, method=6)
+                webp.append([destino, logico])
+        return {'ancho': ancho, 'alto': alto, 'webp': webp}
+
+    def _variantes_gif(self, original, hasheado, datos):
+        """MP4 (ffmpeg) con el ancho máximo y WebP animado (Pillow) en varios anchos"""
+        ancho, alto = _medidas_gif(datos)
+        resultado = {'ancho': ancho, 'alto': alto}
+
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg:
+            logico, nombre = self._variante(original, hasheado, 'mp4')
+            if self.exists(nombre) or self._gif_a_mp4(ffmpeg, hasheado, nombre, max(self._anchos(ancho))):
+                resultado['mp4'] = logico
+            else:
+                del self._generadas[logico]
+
+        if Image is not None:
+            webp = []
+            with Image.open(self.path(hasheado)) as gif:
+                duraciones = [cuadro.info.get('duration', 100) for cuadro in ImageSequence.Iterator(gif)]
+                for destino in self._anchos(ancho):
+                    logico, nombre = self._variante(original, hasheado, f'{destino}w.webp')
+                    if not self.exists(nombre):
+                        tamano = (destino, round(alto * destino / ancho))
+                        cuadros = [
+                            cuadro.convert('RGBA').resize(tamano, Image.LANCZOS)
+                            for cuadro in ImageSequence.Iterator(gif)
+                        ]
+                        self._guardar_imagen(
+                            nombre, cuadros[0], save_all=True, append_images=cuadros[1:],
+                            duration=duraciones, loop=0, quality=70, method=4,
+                        )
+                    webp.append([destino, logico])
+            resultado['webp'] = webp
+        return resultado
+
+    def _gif_a_mp4(self, ffmpeg, hasheado, nombre, ancho):
+        with tempfile.TemporaryDirectory() as directorio:
+            salida = os.path.join(directorio, 'salida.mp4')
+            proceso = subprocess.run([
+                ffmpeg, '-y', '-v', 'error', '-i', self.path(hasheado),
+                '-vf', f"scale='trunc(min({ancho},iw)/2)*2':-2", '-an',
+                '-c:v', 'libx264', '-crf', '28', '-preset', 'slow',
+                '-pix_fmt', 'yuv420p', '-movflags', '+faststart', salida,
+            ], capture_output=True)
+            if proceso.returncode:
+                return False
+            with open(salida, 'rb') as archivo:
+                self._guardar(nombre, archivo.read())
+        return True
+
+    # --- Utilidades -----------------------------------------------------------
+
+    def _anchos(self, original):
+        """Anchos de ESTATICOS_ANCHOS menores que el original, más el original acotado al mayor"""
+        anchos = sorted(getattr(settings, 'ESTATICOS_ANCHOS', (480, 960, 1440)))
+        return [a for a in anchos if a < original] + [min(original, anchos[-1])]
+
+    def _variante(self, original, hasheado, sufijo):
+        """(nombre lógico, nombre guardado) de una variante, anotada para el manifiesto"""
+        # app/gif/ciudad.gif → app/gif/ciudad.mp4, guardado como app/gif/ciudad.3f2a91c0.mp4
+        logico = f'{os.path.splitext(original)[0]}.{sufijo}'
+        nombre = f'{os.path.splitext(hasheado)[0]}.{sufijo}'
+        self._generadas[logico] = nombre
+        return logico, nombre
+
+    def _guardar(self, nombre, contenido):
+        if self.exists(nombre):
+            self.delete(nombre)
+        self._save(nombre, ContentFile(contenido))
+
+    def _guardar_imagen(self, nombre, imagen, **opciones):
+        with tempfile.SpooledTemporaryFile() as temporal:
+            imagen.save(temporal, format='WEBP', **opciones)
+            temporal.seek(0)
+            self._guardar(nombre, temporal.read())
+
+    # --- Lectura (plantillas) -------------------------------------------------
+
+    def leer_variantes(self):
+        try:
+            with self.open(ARCHIVO_VARIANTES) as archivo:
+                return json.loads(archivo.read().decode())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @cached_property
+    def variantes(self):
+        """{nombre original: {'ancho', 'alto', 'webp': [[ancho, nombre]], 'mp4'}} de variantes.json"""
+        return self.leer_variantes()
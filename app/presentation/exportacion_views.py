@@ -0,0 +1,35 @@
+"""
+CAPA DE PRESENTACIÓN - Views de Exportación
+SOLO maneja HTTP - La lógica está en la capa de negocio
+"""
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from ..business.exportacion_logic import ExportacionLogic
+
+
+@require_GET
+@staff_member_required
+def exportar(request, recurso):
+    """
+    Vista de exportación para el staff: /exportar/<recurso>/?formato=csv|ndjson
+
+    Respuesta en streaming: las filas se envían a medida que se leen de la
+    base de datos. ?inactivos=1 incluye lugares y eventos desactivados.
+    """
+    # Llamar a la CAPA DE NEGOCIO
+    resultado = ExportacionLogic.exportar(
+        recurso,
+        formato=request.GET.get('formato', 'csv'),
+        solo_activos=request.GET.get('inactivos') != '1'
+    )
+
+    if not resultado['exito']:
+        return HttpResponse(resultado['mensaje'], status=400, content_type='text/plain; charset=utf-8')
+
+    respuesta = StreamingHttpResponse(resultado['contenido'], content_type=resultado['tipo_contenido'])
+    respuesta['Content-Disposition'] = f'attachment; filename="{resultado["nombre_archivo"]}"'
+    # Que nginx no acumule la respuesta completa antes de enviarla
+    respuesta['X-Accel-Buffering'] = 'no'
+    return respuesta
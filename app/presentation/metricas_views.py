@@ -0,0 +1,37 @@
+"""
+CAPA DE PRESENTACIÓN - Views de Métricas
+Expone las métricas de la capa de negocio en formato Prometheus
+"""
+
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, Http404
+from django.views.decorators.http import require_GET
+
+
+def _autorizado(request):
+    """Token Bearer (METRICAS_TOKEN) para Prometheus, o usuario staff"""
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    if token:
+        cabecera = request.headers.get('Authorization', '')
+        if hmac.compare_digest(cabecera, f'Bearer {token}'):
+            return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+@require_GET
+def metricas_prometheus(request):
+    """Vista /metrics/ en formato de texto de Prometheus"""
+    if not getattr(settings, 'INSTRUMENTAR_LOGICA', False):
+        raise Http404('Instrumentación desactivada')
+
+    if not _autorizado(request):
+        return HttpResponse('No autorizado', status=401, content_type='text/plain')
+
+    # Subsistema opcional: se carga al primer uso, no al arrancar el worker
+    from ..business import cache_versionada, metricas
+
+    return HttpResponse(
+        metricas.exportar_prometheus() + cache_versionada.exportar_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
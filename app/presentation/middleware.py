@@ -0,0 +1,206 @@
+"""
+CAPA DE PRESENTACIÓN - Middleware
+Componentes que envuelven cada petición HTTP
+"""
+
+import json
+import logging
+import os
+from contextlib import ExitStack
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+from ..data import routers
+from ..data.consultas import RegistroConsultas
+from . import presupuestos
+
+
+logger_consultas = logging.getLogger('app.consultas')
+
+
+class PrimariaTrasEscrituraMiddleware(MiddlewareMixin):
+    """
+    Fija las lecturas a la base de datos primaria cuando hace falta:
+
+    - Peticiones que modifican datos (POST, PUT, PATCH, DELETE)
+    - Después de cualquier escritura dentro de la misma petición
+    - Durante unos segundos tras una escritura (cookie), para que el
+      redirect posterior no lea una réplica con retraso
+    """
+
+    METODOS_ESCRITURA = ('POST', 'PUT', 'PATCH', 'DELETE')
+    COOKIE = 'bd_primaria'
+
+    def process_request(self, request):
+        fijar = (
+            request.method in self.METODOS_ESCRITURA or
+            self.COOKIE in request.COOKIES
+        )
+        # Siempre se reinicia: los hilos WSGI reutilizan el contexto
+        request._primaria_inicial = fijar
+        request._token_primaria = routers.fijar_primaria(fijar)
+
+    def process_response(self, request, response):
+        token = getattr(request, '_token_primaria', None)
+        if token is None:
+            return response
+
+        escribio = (
+            request.method in self.METODOS_ESCRITURA or
+            not request._primaria_inicial
+        )
+        if routers.esta_fijado_primaria() and escribio:
+            response.set_cookie(
+                self.COOKIE, '1',
+                max_age=getattr(settings, 'REPLICA_RETRASO_MAXIMO', 5),
+                httponly=True,
+                samesite='Lax'
+            )
+
+        try:
+            routers.restaurar_fijado(token)
+        except ValueError:
+            # El token se creó en otro contexto (middleware en modo async)
+            routers.fijar_primaria(False)
+        return response
+
+
+class CampusMiddleware(MiddlewareMixin):
+    """
+    Activa el campus (shard de Lugar/Evento) de la petición:
+
+    1. Subdominio: huanuco.bienestar.edu.pe → campus "huanuco"
+    2. Campus del perfil del usuario autenticado
+    3. CAMPUS_POR_DEFECTO
+    """
+
+    def process_request(self, request):
+        shards = getattr(settings, 'CAMPUS_SHARDS', {})
+        campus = None
+
+        # Sin sharding no hace falta cargar el usuario en cada petición
+        if routers.sharding_activo():
+            subdominio = request.get_host().split(':')[0].split('.')[0]
+            if subdominio in shards:
+                campus = subdominio
+            elif request.user.is_authenticated and request.user.campus in shards:
+                campus = request.user.campus
+
+        request.campus = campus or settings.CAMPUS_POR_DEFECTO
+        request._token_campus = routers.activar_campus(request.campus)
+
+    def process_response(self, request, response):
+        token = getattr(request, '_token_campus', None)
+        if token is not None:
+            try:
+                routers.restaurar_campus(token)
+            except ValueError:
+                # El token se creó en otro contexto (middleware en modo async)
+                routers.activar_campus(None)
+        return response
+
+
+class ConsultasMiddleware(MiddlewareMixin):
+    """
+    Cuenta las consultas SQL de cada petición y detecta posibles N+1
+    (solo con MONITOR_CONSULTAS, por defecto igual a DEBUG)
+
+    - Registra una línea JSON por petición en el logger 'app.consultas'
+      (nivel WARNING si alguna consulta se repite CONSULTAS_UMBRAL_N1 veces
+      o si la vista supera su presupuesto, ver presupuestos.py)
+    - En DEBUG añade las cabeceras X-Consultas-SQL, X-Tiempo-SQL-ms,
+      X-Consultas-Repetidas y Server-Timing
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'MONITOR_CONSULTAS', False):
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def process_request(self, request):
+        registro = RegistroConsultas()
+        pila = ExitStack()
+        for conexion in connections.all():
+            pila.enter_context(conexion.execute_wrapper(registro))
+
+        request._registro_consultas = registro
+        request._pila_consultas = pila
+
+    def process_response(self, request, response):
+        registro = getattr(request, '_registro_consultas', None)
+        if registro is None:
+            return response
+
+        request._pila_consultas.close()
+
+        umbral = getattr(settings, 'CONSULTAS_UMBRAL_N1', 5)
+        repetidas = registro.repetidas(umbral)
+        tiempo_ms = round(registro.tiempo * 1000, 2)
+        vista = getattr(request.resolver_match, 'url_name', None) or '?'
+
+        linea = {
+            'metodo': request.method,
+            'ruta': request.path,
+            'vista': vista,
+            'estado': response.status_code,
+            'consultas': registro.total,
+            'tiempo_sql_ms': tiempo_ms,
+            'n_mas_1': repetidas,
+            'presupuesto': presupuestos.excesos(vista, registro.total, tiempo_ms),
+        }
+        nivel = logging.WARNING if repetidas or linea['presupuesto'] else logging.INFO
+        logger_consultas.log(nivel, json.dumps(linea, ensure_ascii=False))
+
+        if settings.DEBUG:
+            response['X-Consultas-SQL'] = str(registro.total)
+            response['X-Tiempo-SQL-ms'] = str(tiempo_ms)
+            response['X-Consultas-Repetidas'] = str(len(repetidas))
+            response['Server-Timing'] = f'db;dur={tiempo_ms};desc="{registro.total} consultas"'
+
+        return response
+
+
+class PerfiladorMiddleware(MiddlewareMixin):
+    """
+    Perfilado bajo demanda de una petición (solo staff)
+
+    Se activa con ?_perfil=1 o la cabecera X-Perfilar: 1. Guarda un .prof
+    (cProfile) y un .folded (pilas colapsadas) en PERFILADOR_DIR y devuelve
+    la ruta en la cabecera X-Perfil. Sin PERFILADOR_DIR el middleware se
+    desactiva por completo: cero costo por petición.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFILADOR_DIR', None):
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        solicitado = (
+            request.GET.get('_perfil') == '1' or
+            request.headers.get('X-Perfilar') == '1'
+        )
+        if not solicitado or not (request.user.is_authenticated and request.user.is_staff):
+            return None
+
+        from . import perfilador
+
+        # Vistas async: la corrutina se espera bajo el perfilador en el hilo
+        # del bucle de eventos (donde Django la ejecutaría)
+        perfilar = (
+            async_to_sync(perfilador.aperfilar) if iscoroutinefunction(view_func)
+            else perfilador.perfilar
+        )
+        nombre = getattr(request.resolver_match, 'url_name', None) or 'vista'
+        response, base, duracion = perfilar(
+            lambda: view_func(request, *view_args, **view_kwargs),
+            settings.PERFILADOR_DIR,
+            nombre,
+            intervalo=getattr(settings, 'PERFILADOR_INTERVALO', 0.001)
+        )
+
+        response['X-Perfil'] = os.path.basename(base)
+        response['X-Perfil-Duracion-ms'] = f'{duracion * 1000:.1f}'
+        return response
@@ -0,0 +1,102 @@
+"""
+CAPA DE PRESENTACIÓN - Perfilador bajo demanda
+Ejecuta una vista bajo cProfile (perfil determinista, .prof) y a la vez
+muestrea la pila del hilo (pilas colapsadas, .folded, para flamegraph.pl
+o speedscope). Solo se importa cuando un staff pide perfilar una petición.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class MuestreadorPila:
+    """Muestrea periódicamente la pila de un hilo y cuenta pilas colapsadas"""
+
+    def __init__(self, hilo_id, intervalo):
+        self.hilo_id = hilo_id
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._detener.set()
+        self._hilo.join()
+
+    def _muestrear(self):
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self.hilo_id)
+            if frame is None:
+                continue
+
+            partes = []
+            while frame is not None:
+                codigo = frame.f_code
+                modulo = frame.f_globals.get('__name__', '?')
+                partes.append(f'{modulo}:{codigo.co_name}')
+                frame = frame.f_back
+
+            self.pilas[';'.join(reversed(partes))] += 1
+
+    def colapsadas(self):
+        """Formato 'a;b;c N' por línea (Brendan Gregg)"""
+        return ''.join(f'{pila} {veces}\n' for pila, veces in self.pilas.most_common())
+
+
+def perfilar(funcion, directorio, nombre, intervalo=0.001):
+    """
+    Ejecutar funcion() bajo el perfilador y guardar los resultados
+
+    Returns:
+        tuple: (valor devuelto, ruta base de los archivos sin extensión, segundos)
+    """
+    with _sesion(directorio, nombre, intervalo) as sesion:
+        valor = funcion()
+    return valor, sesion['base'], sesion['duracion']
+
+
+async def aperfilar(funcion, directorio, nombre, intervalo=0.001):
+    """
+    perfilar() para vistas async: espera la corrutina de funcion() bajo el
+    perfilador, en el hilo del bucle de eventos. Mientras la vista espera
+    (consultas, E/S) el bucle ejecuta otras tareas, que también aparecen
+    en el perfil
+
+    Returns:
+        tuple: (valor devuelto, ruta base de los archivos sin extensión, segundos)
+    """
+    with _sesion(directorio, nombre, intervalo) as sesion:
+        valor = await funcion()
+    return valor, sesion['base'], sesion['duracion']
+
+
+@contextmanager
+def _sesion(directorio, nombre, intervalo):
+    """Perfilar y muestrear el hilo actual; al salir guarda el .prof y el .folded"""
+    os.makedirs(directorio, exist_ok=True)
+    marca = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    sesion = {'base': os.path.join(directorio, f'{marca}_{nombre}')}
+
+    perfil = cProfile.Profile()
+    inicio = time.perf_counter()
+    with MuestreadorPila(threading.get_ident(), intervalo) as muestreador:
+        perfil.enable()
+        try:
+            yield sesion
+        finally:
+            perfil.disable()
+    sesion['duracion'] = time.perf_counter() - inicio
+
+    perfil.dump_stats(sesion['base'] + '.prof')
+    with open(sesion['base'] + '.folded', 'w', encoding='utf-8') as archivo:
+        archivo.write(muestreador.colapsadas())
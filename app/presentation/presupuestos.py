@@ -0,0 +1,102 @@
+"""
+CAPA DE PRESENTACIÓN - Presupuestos de consultas por vista
+Máximo de consultas SQL y de tiempo SQL por nombre de URL (app/urls.py).
+
+Los verifica el comando verificar_presupuestos (antes de desplegar, con
+dos tamaños de datos) y ConsultasMiddleware en cada petición (log WARNING,
+con MONITOR_CONSULTAS: por defecto solo en DEBUG).
+Incluyen las consultas de sesión/usuario de una petición autenticada.
+
+PRESUPUESTO_ARRANQUE limita el arranque en frío de un worker; lo
+verifica el comando perfil_arranque.
+"""
+
+# nombre de URL → {'consultas': máximo, 'tiempo_ms': máximo de tiempo SQL}
+#
+# Cada máximo es lo que mide verificar_presupuestos (usuario staff, caché de
+# listas invalidada, plantillas de prueba con las tarjetas) + 1 de holgura: una
+# consulta inofensiva más no rompe CI, dos sí. Los N+1 no dependen de la
+# holgura: el comando falla si las consultas crecen con los datos.
+# Base de toda petición autenticada: sesión + usuario = 2.
+PRESUPUESTOS = {
+    # Autenticación: solo la base (2)
+    'home': {'consultas': 3, 'tiempo_ms': 20},
+    'inicio': {'consultas': 3, 'tiempo_ms': 20},
+    'nueva_pagina': {'consultas': 3, 'tiempo_ms': 20},
+    'login': {'consultas': 3, 'tiempo_ms': 20},
+    'register': {'consultas': 3, 'tiempo_ms': 20},
+    'logout': {'consultas': 5, 'tiempo_ms': 20},  # base + leer y borrar la sesión (4)
+    'contacto': {'consultas': 3, 'tiempo_ms': 20},
+
+    # Lugares
+    'lista_lugares': {'consultas': 5, 'tiempo_ms': 50},  # base + validador del GET condicional + página (4)
+    'crear_lugar': {'consultas': 3, 'tiempo_ms': 20},  # formulario: base (2)
+    'agregar_lugar_usuario': {'consultas': 3, 'tiempo_ms': 20},
+    'detalle_lugar': {'consultas': 4, 'tiempo_ms': 20},  # base + lugar, redirige a la lista (3)
+    'editar_lugar': {'consultas': 4, 'tiempo_ms': 20},  # base + lugar (3)
+    'eliminar_lugar': {'consultas': 4, 'tiempo_ms': 20},
+    'lugares_cercanos': {'consultas': 4, 'tiempo_ms': 100},  # base + candidatos del recuadro (3)
+
+    # Eventos
+    # base + 3 validadores del GET condicional (condicional.py) + total + página
+    # (con su lugar) + inscripciones de la página ({% tarjeta_evento %}) (8)
+    'eventos': {'consultas': 9, 'tiempo_ms': 50},
+    'lista_eventos': {'consultas': 9, 'tiempo_ms': 50},
+    'crear_evento': {'consultas': 3, 'tiempo_ms': 20},  # base (2)
+    'detalle_evento': {'consultas': 5, 'tiempo_ms': 20},  # base + evento + ¿inscrito? (4)
+    'editar_evento': {'consultas': 4, 'tiempo_ms': 20},  # base + evento (3)
+    'eliminar_evento': {'consultas': 3, 'tiempo_ms': 20},  # base (2)
+    # base + usuario + evento + ¿inscrito? + alta (SELECT + INSERT) / baja (DELETE) (8 / 7)
+    'inscribir_evento': {'consultas': 9, 'tiempo_ms': 30},
+    'desinscribir_evento': {'consultas': 8, 'tiempo_ms': 30},
+    # base + 4 validadores del GET condicional + total + página; las inscripciones
+    # las pasa la vista (todas lo son) (8)
+    'mis_eventos': {'consultas': 9, 'tiempo_ms': 50},
+    # base + total + página (4; la base de prueba no tiene archivados: mide 3)
+    'historial_eventos': {'consultas': 5, 'tiempo_ms': 50},
+
+    # Usuarios
+    'lista_usuarios': {'consultas': 6, 'tiempo_ms': 50},  # base + 2 COUNT (total y paginador) + página (5)
+    'perfil_usuario': {'consultas': 3, 'tiempo_ms': 20},  # base (2)
+    'detalle_usuario': {'consultas': 7, 'tiempo_ms': 20},  # base + usuario + 3 contadores (6)
+    'editar_usuario': {'consultas': 4, 'tiempo_ms': 20},  # base + usuario (3)
+    'eliminar_usuario': {'consultas': 4, 'tiempo_ms': 20},
+
+    # API y métricas: base + una página por keyset (3)
+    'api_sync': {'consultas': 4, 'tiempo_ms': 50},
+    'api_lugares': {'consultas': 4, 'tiempo_ms': 50},
+    'api_eventos': {'consultas': 4, 'tiempo_ms': 50},
+    'api_mis_inscripciones': {'consultas': 4, 'tiempo_ms': 50},
+    'metricas': {'consultas': 1, 'tiempo_ms': 20},  # no consulta la base (0)
+    # Solo hasta devolver la respuesta: las filas se leen durante el streaming (2)
+    'exportar': {'consultas': 3, 'tiempo_ms': 20},
+}
+
+# Arranque en frío por modo (medianas en ms, proceso nuevo con .pyc compilados).
+# 'importacion': importación acumulada del módulo de app/ o config/ más lento.
+PRESUPUESTO_ARRANQUE = {
+    'wsgi': {'arranque_ms': 600, 'primera_respuesta_ms': 900},
+    'asgi': {'arranque_ms': 600, 'primera_respuesta_ms': 900},
+    'manage': {'arranque_ms': 1500},
+    'importacion': {'modulo_ms': 50},
+}
+
+
+def excesos(url_name, consultas, tiempo_ms):
+    """
+    Comparar una petición con el presupuesto de su vista
+
+    Returns:
+        list: Descripción de cada límite superado (vacía si cumple o si
+              la vista no tiene presupuesto)
+    """
+    presupuesto = PRESUPUESTOS.get(url_name)
+    if presupuesto is None:
+        return []
+
+    resultado = []
+    if consultas > presupuesto['consultas']:
+        resultado.append(f'{consultas} consultas > {presupuesto["consultas"]}')
+    if tiempo_ms > presupuesto['tiempo_ms']:
+        resultado.append(f'{tiempo_ms:.1f} ms SQL > {presupuesto["tiempo_ms"]} ms')
+    return resultado
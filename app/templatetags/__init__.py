@@ -1 +1 @@
-# Paquete de template tags
+# Paquete de template tags
@@ -0,0 +1,67 @@
+"""
+Imágenes y GIF optimizados en las plantillas
+
+    {% load estaticos %}
+    {% imagen 'app/img/home.jpg' alt='Inicio' sizes='(max-width: 600px) 100vw, 50vw' %}
+    {% gif_animado 'app/gif/ciudad.gif' alt='Ciudad' %}
+
+Usan las variantes que genera collectstatic (presentation/estaticos.py):
+<picture> con srcset WebP, o <video> MP4 para los GIF animados, con
+width/height para no mover la página al cargar. Sin variantes (DEBUG,
+sin Pillow/ffmpeg) se usa el archivo original.
+"""
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+def _variantes(ruta):
+    # En DEBUG runserver sirve desde STATICFILES_DIRS, donde no hay variantes
+    if settings.DEBUG:
+        return {}
+    return getattr(staticfiles_storage, 'variantes', {}).get(ruta, {})
+
+
+def _medidas(variantes):
+    if 'ancho' not in variantes:
+        return ''
+    return format_html(' width="{}" height="{}"', variantes['ancho'], variantes['alto'])
+
+
+def _picture(ruta, variantes, alt, sizes, carga):
+    img = format_html(
+        '<img src="{}" alt="{}"{} loading="{}" decoding="async">',
+        staticfiles_storage.url(ruta), alt, _medidas(variantes), carga,
+    )
+    if not variantes.get('webp'):
+        return img
+    srcset = ', '.join(f'{staticfiles_storage.url(nombre)} {ancho}w' for ancho, nombre in variantes['webp'])
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">{}</picture>', srcset, sizes, img,
+    )
+
+
+@register.simple_tag
+def imagen(ruta, alt='', sizes='100vw', carga='lazy'):
+    """<picture> con WebP responsivo y el original como respaldo"""
+    return _picture(ruta, _variantes(ruta), alt, sizes, carga)
+
+
+@register.simple_tag
+def gif_animado(ruta, alt='', sizes='100vw', carga='lazy'):
+    """GIF animado como <video> MP4 (mucho más liviano); si no, WebP animado o el GIF"""
+    variantes = _variantes(ruta)
+    if 'mp4' not in variantes:
+        return _picture(ruta, variantes, alt, sizes, carga)
+    # autoplay + muted + playsinline: se reproduce solo, como el GIF
+    return format_html(
+        '<video autoplay loop muted playsinline aria-label="{}"{}>'
+        '<source src="{}" type="video/mp4">{}</video>',
+        alt, _medidas(variantes),
+        staticfiles_storage.url(variantes['mp4']),
+        _picture(ruta, variantes, alt, sizes, carga),
+    )
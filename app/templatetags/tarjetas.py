@@ -0,0 +1,79 @@
+"""
+Tarjetas de eventos y lugares para las listas
+
+    {% load tarjetas %}
+    {% for evento in page_obj %}{% tarjeta_evento evento %}{% endfor %}
+    {% for lugar in lugares %}{% tarjeta_lugar lugar %}{% endfor %}
+
+La parte común de la tarjeta (título, descripción, fechas, lugar) es igual
+para todos: se renderiza una vez y se guarda en caché por id y
+fecha_actualizacion del objeto, más la versión de los modelos que muestra
+(un evento enseña el nombre de su lugar). Solo lo propio de cada usuario
+(insignia de inscrito, plazas libres, enlaces de edición) se renderiza en
+cada petición.
+
+Los eventos de la página en los que el usuario está inscrito se consultan
+una sola vez por render, la primera vez que se usa {% tarjeta_evento %}
+(o se toman de 'inscritos_ids' si la vista ya los pasa): una lista que no
+usa las tarjetas no paga esa consulta.
+"""
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from ..business import cache_versionada
+from ..business.evento_logic import EventoLogic
+
+register = template.Library()
+
+
+def _parte_comun(plantilla, nombre, objeto, modelos):
+    """HTML común de la tarjeta, desde la caché o renderizado y guardado"""
+    clave = cache_versionada.clave(
+        f'tarjeta_{nombre}', (objeto.pk, objeto.fecha_actualizacion.isoformat()), modelos
+    )
+    html = cache.get(clave)
+    acierto = html is not None
+    cache_versionada.anotar(f'tarjeta_{nombre}', acierto)
+    if not acierto:
+        html = render_to_string(plantilla, {nombre: objeto})
+        cache.set(clave, str(html), settings.CACHE_FRAGMENTOS_SEGUNDOS)
+    return mark_safe(html)
+
+
+def _inscritos(context):
+    """Ids de los eventos de page_obj en los que el usuario está inscrito (una consulta por render)"""
+    if 'inscritos_ids' in context:
+        return context['inscritos_ids']
+    if 'tarjetas_inscritos' not in context.render_context:
+        request = context.get('request')
+        usuario_id = request.user.pk if request is not None else None
+        context.render_context['tarjetas_inscritos'] = EventoLogic.ids_inscritos(
+            usuario_id, list(context.get('page_obj') or ())
+        )
+    return context.render_context['tarjetas_inscritos']
+
+
+@register.simple_tag(takes_context=True)
+def tarjeta_evento(context, evento):
+    """Tarjeta de un evento: parte común en caché + inscripción y plazas del usuario"""
+    request = context.get('request')
+    return render_to_string('eventos/_tarjeta_evento.html', {
+        'evento': evento,
+        'comun': _parte_comun('eventos/_tarjeta_evento_comun.html', 'evento', evento, ('lugar',)),
+        'inscrito': evento.pk in _inscritos(context),
+        'es_creador': request is not None and evento.creado_por_id == request.user.pk,
+    }, request=request)
+
+
+@register.simple_tag(takes_context=True)
+def tarjeta_lugar(context, lugar):
+    """Tarjeta de un lugar: parte común en caché + enlaces del creador"""
+    request = context.get('request')
+    return render_to_string('lugares/_tarjeta_lugar.html', {
+        'lugar': lugar,
+        'comun': _parte_comun('lugares/_tarjeta_lugar_comun.html', 'lugar', lugar, ()),
+        'es_creador': request is not None and lugar.creado_por_id == request.user.pk,
+    }, request=request)
@@ -0,0 +1,5 @@
+"""
+Pruebas de la aplicación
+
+    python manage.py test app
+"""
@@ -0,0 +1,75 @@
+"""
+Pruebas de la API de lectura (app/business/api_logic.py, app/presentation/api_views.py)
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from app.business.api_logic import ApiLogic
+from app.data.models import CustomUser, Lugar
+
+
+def crear_lugar(nombre, hace=timedelta(hours=1)):
+    lugar = Lugar.objects.create(nombre=nombre, descripcion='d', direccion='x', latitud=-9.3, longitud=-75.9)
+    # Fuera del margen de la sincronización (MARGEN_SEGUNDOS)
+    Lugar.objects.filter(pk=lugar.pk).update(fecha_actualizacion=timezone.now() - hace)
+    return lugar
+
+
+class ApiCursorTests(TestCase):
+
+    def setUp(self):
+        self.ids = [crear_lugar(f'Lugar {numero}').id for numero in range(5)]
+
+    def test_recorre_todas_las_paginas_sin_repetir(self):
+        vistos, cursor = [], None
+        while True:
+            pagina = ApiLogic.listar('lugares', cursor=cursor, limite=2)
+            self.assertTrue(pagina['exito'])
+            vistos += [fila['id'] for fila in pagina['resultados']]
+            if not pagina['hay_mas']:
+                break
+            cursor = pagina['cursor']
+        self.assertEqual(vistos, self.ids)
+
+    def test_la_ultima_pagina_no_trae_cursor(self):
+        pagina = ApiLogic.listar('lugares', limite=5)
+        self.assertFalse(pagina['hay_mas'])
+        self.assertEqual(pagina['cursor'], '')
+
+    def test_cursor_invalido(self):
+        for cursor in ('no-es-base64!', ApiLogic._codificar_cursor(-1), 'eHx5'):
+            with self.subTest(cursor=cursor):
+                resultado = ApiLogic.listar('lugares', cursor=cursor)
+                self.assertFalse(resultado['exito'])
+                self.assertEqual(resultado['mensaje'], 'Cursor inválido')
+
+    def test_campos_pedidos_incluyen_siempre_el_id(self):
+        pagina = ApiLogic.listar('lugares', campos='nombre', limite=1)
+        self.assertEqual(set(pagina['resultados'][0]), {'id', 'nombre'})
+
+    def test_campo_desconocido(self):
+        resultado = ApiLogic.listar('lugares', campos='nombre,clave')
+        self.assertFalse(resultado['exito'])
+        self.assertIn('clave', resultado['mensaje'])
+
+
+class ApiFechasTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(CustomUser.objects.create_user('ana', 'ana@ejemplo.pe', 'x'))
+        self.lugar = crear_lugar('Plaza de Armas')
+
+    def test_listado_y_sync_serializan_igual_las_fechas(self):
+        listado = self.client.get('/api/lugares/?fields=fecha_actualizacion').json()
+        sync = self.client.get('/api/sync/lugares/').json()
+
+        fecha = listado['resultados'][0]['fecha_actualizacion']
+        self.assertEqual(sync['cambios'][0]['fecha_actualizacion'], fecha)
+        # Como DjangoJSONEncoder: milisegundos y 'Z'
+        self.assertRegex(fecha, r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z$')
+
+    def test_errores_de_sync_en_json(self):
+        respuesta = self.client.get('/api/sync/lugares/?limite=muchos')
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(respuesta.json(), {'exito': False, 'mensaje': 'Límite inválido'})
@@ -0,0 +1,46 @@
+"""
+Pruebas del GET condicional de las listas (app/presentation/condicional.py)
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from app.data.models import CustomUser, Lugar
+from app.management.plantillas_prueba import con_plantillas_prueba
+
+
+class ListaLugaresCondicionalTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(CustomUser.objects.create_user('ana', 'ana@ejemplo.pe', 'x'))
+        self.viejo = self._lugar('Plaza vieja', dias=3)
+        self._lugar('Plaza nueva', dias=2)
+        plantillas = con_plantillas_prueba()
+        plantillas.enable()
+        self.addCleanup(plantillas.disable)
+
+    def _lugar(self, nombre, dias):
+        lugar = Lugar.objects.create(nombre=nombre, descripcion='d', direccion='x', latitud=-9.3, longitud=-75.9)
+        Lugar.objects.filter(pk=lugar.pk).update(fecha_actualizacion=timezone.now() - timedelta(days=dias))
+        return lugar
+
+    def test_sin_cambios_responde_304(self):
+        ultima = self.client.get('/lugares/')['Last-Modified']
+        respuesta = self.client.get('/lugares/', HTTP_IF_MODIFIED_SINCE=ultima)
+        self.assertEqual(respuesta.status_code, 304)
+
+    def test_borrar_una_fila_antigua_mueve_last_modified(self):
+        ultima = self.client.get('/lugares/')['Last-Modified']
+
+        self.viejo.delete()
+
+        respuesta = self.client.get('/lugares/', HTTP_IF_MODIFIED_SINCE=ultima)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['Last-Modified'], ultima)
+
+    def test_el_etag_cambia_al_editar(self):
+        etag = self.client.get('/lugares/')['ETag']
+        self.viejo.nombre = 'Plaza renovada'
+        self.viejo.save()
+        respuesta = self.client.get('/lugares/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
@@ -0,0 +1,69 @@
+"""
+Pruebas de la exportación CSV/NDJSON (app/business/exportacion_logic.py)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone as tz
+from django.test import TestCase
+from app.business.exportacion_logic import ExportacionLogic
+from app.data.models import CustomUser, Lugar
+
+
+class ExportacionTests(TestCase):
+
+    CREADO = datetime(2026, 3, 1, 14, 5, 6, 789123, tzinfo=tz.utc)
+
+    def setUp(self):
+        self.ana = CustomUser.objects.create_user('ana', 'ana@ejemplo.pe', 'x')
+        self.lugar = Lugar.objects.create(
+            nombre='Plaza de Armas', descripcion='Centro de la ciudad', direccion='Jr. Lima 1',
+            latitud=-9.2951, longitud=-75.9977, fecha_creacion=self.CREADO, creado_por=self.ana
+        )
+        Lugar.objects.create(
+            nombre='Mercado viejo', descripcion='Cerrado', direccion='Jr. Huallaga 2',
+            latitud=-9.2960, longitud=-75.9980, activo=False
+        )
+
+    def _exportar(self, formato, **opciones):
+        resultado = ExportacionLogic.exportar('lugares', formato, **opciones)
+        self.assertTrue(resultado['exito'], resultado.get('mensaje'))
+        return ''.join(resultado['contenido'])
+
+    def _csv(self, **opciones):
+        return list(csv.DictReader(io.StringIO(self._exportar('csv', **opciones))))
+
+    def _ndjson(self, **opciones):
+        return [json.loads(linea) for linea in self._exportar('ndjson', **opciones).splitlines()]
+
+    def test_fechas_iguales_en_csv_y_ndjson(self):
+        fila_csv, = self._csv()
+        fila_ndjson, = self._ndjson()
+        self.assertEqual(fila_csv['fecha_creacion'], '2026-03-01T14:05:06.789Z')
+        self.assertEqual(fila_ndjson['fecha_creacion'], fila_csv['fecha_creacion'])
+        self.assertEqual(fila_ndjson['fecha_actualizacion'], fila_csv['fecha_actualizacion'])
+
+    def test_username_y_valores_vacios(self):
+        filas_csv = {fila['nombre']: fila for fila in self._csv(solo_activos=False)}
+        filas_ndjson = {fila['nombre']: fila for fila in self._ndjson(solo_activos=False)}
+
+        self.assertEqual(filas_csv['Plaza de Armas']['creado_por'], 'ana')
+        self.assertEqual(filas_ndjson['Plaza de Armas']['creado_por'], 'ana')
+        # Sin creador: celda vacía en CSV, null en NDJSON
+        self.assertEqual(filas_csv['Mercado viejo']['creado_por_id'], '')
+        self.assertIsNone(filas_ndjson['Mercado viejo']['creado_por_id'])
+
+    def test_solo_activos_por_defecto(self):
+        self.assertEqual([fila['nombre'] for fila in self._csv()], ['Plaza de Armas'])
+        self.assertEqual(len(self._csv(solo_activos=False)), 2)
+
+    def test_lotes_pequenos_no_cambian_el_resultado(self):
+        self.assertEqual(
+            self._exportar('csv', solo_activos=False, tamano_lote=1),
+            self._exportar('csv', solo_activos=False)
+        )
+
+    def test_recurso_o_formato_desconocido(self):
+        self.assertFalse(ExportacionLogic.exportar('usuarios')['exito'])
+        self.assertFalse(ExportacionLogic.exportar('lugares', 'xlsx')['exito'])
@@ -0,0 +1,135 @@
+"""
+Pruebas de la importación masiva de lugares (app/business/importacion_logic.py)
+"""
+
+import io
+import json
+from django.test import TestCase
+from app.business.importacion_logic import ImportacionLogic
+from app.data.models import Lugar
+
+
+def archivo(texto):
+    return io.BytesIO(texto.encode('utf-8'))
+
+
+def feature(nombre, longitud=-75.99, latitud=-9.29, **otros):
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [longitud, latitud]},
+        'properties': {'nombre': nombre, 'descripcion': 'Descripción larga', 'direccion': 'Jr. Lima 123', **otros},
+    }
+
+
+def geojson(*features):
+    return archivo(json.dumps({'type': 'FeatureCollection', 'features': list(features)}))
+
+
+class ImportacionCsvTests(TestCase):
+
+    CABECERA = 'nombre,descripcion,direccion,latitud,longitud\n'
+
+    def _importar(self, texto, **opciones):
+        return ImportacionLogic.importar_lugares(archivo(texto), 'csv', **opciones)
+
+    def test_crea_las_filas_validas(self):
+        resultado = self._importar(
+            self.CABECERA
+            + 'Plaza de Armas,Centro de la ciudad,Jr. Lima 1,-9.2951,-75.9977\n'
+            + 'Parque Amazonas,Parque con juegos,Av. Raimondi 2,-9.3001,-75.9901\n'
+        )
+        self.assertTrue(resultado['exito'])
+        self.assertEqual(resultado['creados'], 2)
+        self.assertEqual(Lugar.objects.count(), 2)
+        self.assertTrue(Lugar.objects.get(nombre='Plaza de Armas').url_mapa)
+
+    def test_punto_y_coma_coma_decimal_y_bom(self):
+        resultado = self._importar(
+            '\ufeffnombre;descripcion;direccion;latitud;longitud\n'
+            'Plaza de Armas;Centro de la ciudad;Jr. Lima 1;-9,2951;-75,9977\n'
+        )
+        self.assertEqual(resultado['creados'], 1)
+        self.assertAlmostEqual(Lugar.objects.get().latitud, -9.2951)
+
+    def test_duplicados_en_el_archivo_y_en_la_base(self):
+        Lugar.objects.create(
+            nombre='Plaza de Armas', descripcion='Centro de la ciudad', direccion='Jr. Lima 1',
+            latitud=-9.2951, longitud=-75.9977
+        )
+        resultado = self._importar(
+            self.CABECERA
+            # Mismo nombre (sin distinguir mayúsculas ni espacios) a menos de ~11 m
+            + '  PLAZA  de armas ,Centro de la ciudad,Jr. Lima 1,-9.29512,-75.99771\n'
+            + 'Parque Amazonas,Parque con juegos,Av. Raimondi 2,-9.3001,-75.9901\n'
+            + 'parque amazonas,Parque con juegos,Av. Raimondi 2,-9.3001,-75.9901\n',
+            tamano_lote=1
+        )
+        self.assertTrue(resultado['exito'])
+        self.assertEqual((resultado['creados'], resultado['duplicados']), (1, 2))
+        self.assertEqual([error['fila'] for error in resultado['errores']], [2, 4])
+        self.assertEqual(Lugar.objects.count(), 2)
+
+    def test_filas_invalidas_se_informan_y_no_detienen_la_importacion(self):
+        resultado = self._importar(
+            self.CABECERA
+            + 'Plaza de Armas,Centro de la ciudad,Jr. Lima 1,norte,-75.9977\n'
+            + 'PA,Centro de la ciudad,Jr. Lima 1,-9.2951,-75.9977\n'
+            + 'Plaza Lejana,Fuera del planeta,Jr. Lima 1,-95,-75.9977\n'
+            + '\n'
+            + 'Parque Amazonas,Parque con juegos,Av. Raimondi 2,-9.3001,-75.9901\n'
+        )
+        self.assertTrue(resultado['exito'])
+        self.assertEqual((resultado['creados'], resultado['invalidos']), (1, 3))
+        self.assertEqual([error['fila'] for error in resultado['errores']], [2, 3, 4])
+        self.assertIn('Latitud no numérica', resultado['errores'][0]['mensaje'])
+
+    def test_faltan_columnas(self):
+        resultado = self._importar('nombre,direccion\nPlaza de Armas,Jr. Lima 1\n')
+        self.assertFalse(resultado['exito'])
+        self.assertIn('Faltan columnas: descripcion, latitud, longitud', resultado['mensaje'])
+        self.assertEqual(Lugar.objects.count(), 0)
+
+    def test_simular_no_inserta(self):
+        resultado = self._importar(
+            self.CABECERA + 'Plaza de Armas,Centro de la ciudad,Jr. Lima 1,-9.2951,-75.9977\n',
+            simular=True
+        )
+        self.assertEqual(resultado['creados'], 1)
+        self.assertEqual(Lugar.objects.count(), 0)
+
+    def test_formato_desconocido(self):
+        resultado = ImportacionLogic.importar_lugares(archivo(''), 'xlsx')
+        self.assertFalse(resultado['exito'])
+        self.assertEqual(ImportacionLogic.formato_de('lugares.GeoJSON'), 'geojson')
+        self.assertIsNone(ImportacionLogic.formato_de('lugares.xlsx'))
+
+
+class ImportacionGeojsonTests(TestCase):
+
+    def test_crea_los_puntos_con_longitud_primero(self):
+        resultado = ImportacionLogic.importar_lugares(geojson(feature('Plaza de Armas')), 'geojson')
+        self.assertTrue(resultado['exito'])
+        lugar = Lugar.objects.get()
+        self.assertEqual((lugar.latitud, lugar.longitud), (-9.29, -75.99))
+
+    def test_features_mal_formadas_se_informan(self):
+        sin_punto = feature('Sin punto')
+        sin_punto['geometry'] = {'type': 'Polygon', 'coordinates': [[[0, 0], [1, 1], [1, 0], [0, 0]]]}
+        propiedades_lista = feature('Propiedades lista')
+        propiedades_lista['properties'] = ['no', 'es', 'objeto']
+
+        resultado = ImportacionLogic.importar_lugares(
+            geojson(feature('Plaza de Armas'), 'texto', sin_punto, propiedades_lista, feature('Plaza de Armas')),
+            'geojson'
+        )
+        self.assertTrue(resultado['exito'])
+        self.assertEqual(
+            (resultado['creados'], resultado['invalidos'], resultado['duplicados']), (1, 3, 1)
+        )
+        self.assertEqual([error['fila'] for error in resultado['errores']], [2, 3, 4, 5])
+
+    def test_json_truncado(self):
+        resultado = ImportacionLogic.importar_lugares(archivo('{"type": "FeatureCollection", "features": ['), 'geojson')
+        self.assertFalse(resultado['exito'])
+        self.assertTrue(resultado['mensaje'].startswith('Archivo inválido'))
+        self.assertEqual(Lugar.objects.count(), 0)
@@ -0,0 +1,98 @@
+"""
+Pruebas de los routers de base de datos (réplicas y shards por campus)
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.models import Session
+from django.test import SimpleTestCase, override_settings
+from app.data import routers
+from app.data.models import Lugar, Evento
+
+
+class EstadoLimpioMixin:
+    """Cada prueba empieza sin primaria fijada ni campus activo"""
+
+    def setUp(self):
+        super().setUp()
+        token_fijado = routers.fijar_primaria(False)
+        token_campus = routers.activar_campus(None)
+        self.addCleanup(routers.restaurar_fijado, token_fijado)
+        self.addCleanup(routers.restaurar_campus, token_campus)
+
+
+@override_settings(DATABASE_REPLICAS={'default': ['replica_1']})
+class ReplicaRouterTests(EstadoLimpioMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.router = routers.ReplicaRouter()
+
+    def test_lugares_y_eventos_se_leen_de_la_replica(self):
+        self.assertEqual(self.router.db_for_read(Lugar), 'replica_1')
+        self.assertEqual(self.router.db_for_read(Evento), 'replica_1')
+
+    def test_usuarios_sesiones_y_contenttypes_se_leen_de_la_primaria(self):
+        for modelo in (get_user_model(), Session, ContentType):
+            with self.subTest(modelo=modelo.__name__):
+                self.assertIsNone(self.router.db_for_read(modelo))
+
+    def test_una_escritura_fija_las_lecturas_a_la_primaria(self):
+        self.assertEqual(self.router.db_for_write(Lugar), 'default')
+        self.assertTrue(routers.esta_fijado_primaria())
+        self.assertEqual(self.router.db_for_read(Lugar), 'default')
+
+    def test_usar_primaria(self):
+        with routers.usar_primaria():
+            self.assertEqual(self.router.db_for_read(Evento), 'default')
+        self.assertEqual(self.router.db_for_read(Evento), 'replica_1')
+
+    def test_las_replicas_no_se_migran(self):
+        self.assertFalse(self.router.allow_migrate('replica_1', 'app', 'lugar'))
+        self.assertIsNone(self.router.allow_migrate('default', 'app', 'lugar'))
+
+
+@override_settings(
+    CAMPUS_SHARDS={'tingo-maria': 'default', 'lima': 'campus_lima'},
+    DATABASE_REPLICAS={'default': [], 'campus_lima': ['campus_lima_replica']},
+)
+class ShardRouterTests(EstadoLimpioMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.router = routers.ShardRouter()
+
+    def test_datos_de_campus_van_al_shard_activo(self):
+        with routers.usar_campus('lima'):
+            self.assertEqual(self.router.db_for_write(Evento), 'campus_lima')
+            # Tras escribir, también las lecturas van a la primaria del shard
+            self.assertEqual(self.router.db_for_read(Evento), 'campus_lima')
+
+    def test_lecturas_de_campus_usan_las_replicas_del_shard(self):
+        with routers.usar_campus('lima'):
+            self.assertEqual(self.router.db_for_read(Lugar), 'campus_lima_replica')
+
+    def test_sin_campus_se_usa_el_campus_por_defecto(self):
+        self.assertEqual(routers.campus_actual(), 'tingo-maria')
+        self.assertEqual(self.router.db_for_write(Lugar), 'default')
+
+    def test_usuarios_los_decide_el_router_siguiente(self):
+        with routers.usar_campus('lima'):
+            self.assertIsNone(self.router.db_for_read(get_user_model()))
+            self.assertIsNone(self.router.db_for_write(Session))
+
+    def test_relaciones_de_un_objeto_van_a_su_shard(self):
+        lugar = Lugar(id=1)
+        lugar._state.db = 'campus_lima_replica'
+        self.assertEqual(self.router.db_for_write(Evento, instance=lugar), 'campus_lima')
+
+    def test_los_shards_solo_tienen_tablas_de_campus(self):
+        self.assertTrue(self.router.allow_migrate('campus_lima', 'app', 'evento'))
+        self.assertFalse(self.router.allow_migrate('campus_lima', 'app', 'customuser'))
+        self.assertFalse(self.router.allow_migrate('campus_lima', 'sessions', 'session'))
+        self.assertIsNone(self.router.allow_migrate('default', 'app', 'customuser'))
+
+    @override_settings(CAMPUS_SHARDS={'tingo-maria': 'default'})
+    def test_sin_shards_no_interviene(self):
+        self.assertIsNone(self.router.db_for_read(Evento))
+        self.assertIsNone(self.router.db_for_write(Evento))
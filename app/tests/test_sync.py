@@ -0,0 +1,96 @@
+"""
+Pruebas de la sincronización incremental (app/business/sync_logic.py)
+"""
+
+import base64
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from app.business.sync_logic import SyncLogic
+from app.data.models import Lugar, RegistroEliminacion
+
+
+class SyncCursorTests(TestCase):
+
+    def setUp(self):
+        self.hace_una_hora = timezone.now() - timedelta(hours=1)
+        self.ids = [self._lugar(f'Lugar {numero}').id for numero in range(5)]
+        # Misma fecha en todas: el ID desempata dentro del cursor
+        Lugar.objects.update(fecha_actualizacion=self.hace_una_hora)
+
+    def _lugar(self, nombre):
+        return Lugar.objects.create(nombre=nombre, descripcion='d', direccion='x', latitud=-9.3, longitud=-75.9)
+
+    def _sincronizar(self, cursor=None, limite=500):
+        resultado = SyncLogic.cambios_desde('lugares', cursor=cursor, limite=limite)
+        self.assertTrue(resultado['exito'], resultado.get('mensaje'))
+        return resultado
+
+    def test_recorre_las_paginas_con_fechas_empatadas(self):
+        vistos, cursor = [], None
+        while True:
+            pagina = self._sincronizar(cursor, limite=2)
+            vistos += [fila['id'] for fila in pagina['cambios']]
+            cursor = pagina['cursor']
+            if not pagina['hay_mas']:
+                break
+        self.assertEqual(vistos, self.ids)
+
+    def test_sin_cambios_devuelve_el_mismo_cursor(self):
+        cursor = self._sincronizar()['cursor']
+        siguiente = self._sincronizar(cursor)
+        self.assertEqual(siguiente['cambios'], [])
+        self.assertEqual(siguiente['eliminados'], [])
+        self.assertEqual(siguiente['cursor'], cursor)
+
+    def test_una_edicion_vuelve_a_enviarse(self):
+        cursor = self._sincronizar()['cursor']
+        Lugar.objects.filter(pk=self.ids[0]).update(
+            nombre='Renombrado', fecha_actualizacion=timezone.now() - timedelta(minutes=1)
+        )
+        cambios = self._sincronizar(cursor)['cambios']
+        self.assertEqual([(fila['id'], fila['nombre']) for fila in cambios], [(self.ids[0], 'Renombrado')])
+
+    def test_lo_modificado_dentro_del_margen_espera_a_la_siguiente(self):
+        cursor = self._sincronizar()['cursor']
+        reciente = self._lugar('Recién creado')
+        self.assertEqual(self._sincronizar(cursor)['cambios'], [])
+
+        Lugar.objects.filter(pk=reciente.pk).update(fecha_actualizacion=timezone.now() - timedelta(minutes=1))
+        self.assertEqual([fila['id'] for fila in self._sincronizar(cursor)['cambios']], [reciente.id])
+
+    def test_desactivado_viaja_como_tombstone(self):
+        cursor = self._sincronizar()['cursor']
+        Lugar.objects.filter(pk=self.ids[1]).update(
+            activo=False, fecha_actualizacion=timezone.now() - timedelta(minutes=1)
+        )
+        resultado = self._sincronizar(cursor)
+        self.assertEqual(resultado['cambios'], [])
+        self.assertEqual(resultado['eliminados'], [self.ids[1]])
+
+    def test_eliminado_viaja_como_tombstone_y_avanza_el_cursor(self):
+        cursor = self._sincronizar()['cursor']
+        Lugar.objects.get(pk=self.ids[2]).delete()
+        RegistroEliminacion.objects.update(fecha_eliminacion=timezone.now() - timedelta(minutes=1))
+
+        resultado = self._sincronizar(cursor)
+        self.assertEqual(resultado['eliminados'], [self.ids[2]])
+        self.assertNotEqual(resultado['cursor'], cursor)
+        # Y no se repite en la siguiente
+        self.assertEqual(self._sincronizar(resultado['cursor'])['eliminados'], [])
+
+    def test_primera_sincronizacion_no_envia_tombstones_antiguos(self):
+        Lugar.objects.get(pk=self.ids[3]).delete()
+        RegistroEliminacion.objects.update(fecha_eliminacion=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self._sincronizar()['eliminados'], [])
+
+    def test_cursor_invalido(self):
+        sin_zona = base64.urlsafe_b64encode(b'2026-01-01T00:00:00|3').decode()
+        for cursor in ('no-es-base64!', sin_zona, base64.urlsafe_b64encode(b'sin-separador').decode()):
+            with self.subTest(cursor=cursor):
+                resultado = SyncLogic.cambios_desde('lugares', cursor=cursor)
+                self.assertFalse(resultado['exito'])
+                self.assertEqual(resultado['mensaje'], 'Cursor inválido')
+
+    def test_recurso_desconocido(self):
+        self.assertFalse(SyncLogic.cambios_desde('usuarios')['exito'])
@@ -1,45 +1,65 @@
-"""
-URLs de la Aplicación - ARQUITECTURA EN CAPAS
-Rutas organizadas por módulo
-"""
-
-from django.urls import path
-from .presentation import auth_views, lugar_views, evento_views, user_views
-
-urlpatterns = [
-    # ========== AUTENTICACIÓN ==========
-    path('', auth_views.home_view, name='home'),
-    path('inicio/', auth_views.nueva_pagina_view, name='inicio'),  # Alias para inicio
-    path('nueva_pagina/', auth_views.nueva_pagina_view, name='nueva_pagina'),  # Página de inicio
-    path('login/', auth_views.login_view, name='login'),
-    path('register/', auth_views.register_view, name='register'),
-    path('logout/', auth_views.logout_view, name='logout'),
-    path('contact/', auth_views.contact_view, name='contacto'),  # Vista de contacto
-    
-    # ========== LUGARES ==========
-    path('lugares/', lugar_views.lista_lugares, name='lista_lugares'),
-    path('lugares/crear/', lugar_views.crear_lugar, name='crear_lugar'),
-    path('lugares/agregar/', lugar_views.crear_lugar, name='agregar_lugar_usuario'),  # Alias para compatibilidad
-    path('lugares/<int:lugar_id>/', lugar_views.detalle_lugar, name='detalle_lugar'),
-    path('lugares/<int:lugar_id>/editar/', lugar_views.editar_lugar, name='editar_lugar'),
-    path('lugares/<int:lugar_id>/eliminar/', lugar_views.eliminar_lugar, name='eliminar_lugar'),
-    path('lugares/cercanos/', lugar_views.lugares_cercanos, name='lugares_cercanos'),
-    
-    # ========== EVENTOS ==========
-    path('eventos/', evento_views.lista_eventos, name='eventos'),  # Nombre compatible
-    path('eventos/lista/', evento_views.lista_eventos, name='lista_eventos'),
-    path('eventos/crear/', evento_views.crear_evento, name='crear_evento'),
-    path('eventos/<int:evento_id>/', evento_views.detalle_evento, name='detalle_evento'),
-    path('eventos/<int:evento_id>/editar/', evento_views.editar_evento, name='editar_evento'),
-    path('eventos/<int:evento_id>/eliminar/', evento_views.eliminar_evento, name='eliminar_evento'),
-    path('eventos/<int:evento_id>/inscribir/', evento_views.inscribir_evento, name='inscribir_evento'),
-    path('eventos/<int:evento_id>/desinscribir/', evento_views.desinscribir_evento, name='desinscribir_evento'),
-    path('eventos/mis-eventos/', evento_views.mis_eventos, name='mis_eventos'),
-    
-    # ========== USUARIOS ==========
-    path('usuarios/', user_views.lista_usuarios, name='lista_usuarios'),
-    path('perfil/', user_views.perfil_usuario, name='perfil_usuario'),
-    path('usuarios/<int:user_id>/', user_views.detalle_usuario, name='detalle_usuario'),
-    path('usuarios/<int:user_id>/editar/', user_views.editar_usuario, name='editar_usuario'),
-    path('usuarios/<int:user_id>/eliminar/', user_views.eliminar_usuario, name='eliminar_usuario'),
-]
+"""
+URLs de la Aplicación - ARQUITECTURA EN CAPAS
+Rutas organizadas por módulo
+"""
+
+from django.conf import settings
+from django.urls import path
+from .presentation import auth_views, lugar_views, evento_views, user_views, api_views, metricas_views, exportacion_views
+
+
+def _vista(sincrona, asincrona):
+    """Vista async bajo ASGI si VISTAS_ASYNC está activo (mismo nombre de URL)"""
+    return asincrona if settings.VISTAS_ASYNC else sincrona
+
+
+urlpatterns = [
+    # ========== AUTENTICACIÓN ==========
+    path('', auth_views.home_view, name='home'),
+    path('inicio/', auth_views.nueva_pagina_view, name='inicio'),  # Alias para inicio
+    path('nueva_pagina/', auth_views.nueva_pagina_view, name='nueva_pagina'),  # Página de inicio
+    path('login/', auth_views.login_view, name='login'),
+    path('register/', auth_views.register_view, name='register'),
+    path('logout/', auth_views.logout_view, name='logout'),
+    path('contact/', auth_views.contact_view, name='contacto'),  # Vista de contacto
+
+    # ========== LUGARES ==========
+    path('lugares/', _vista(lugar_views.lista_lugares, lugar_views.lista_lugares_async), name='lista_lugares'),
+    path('lugares/crear/', lugar_views.crear_lugar, name='crear_lugar'),
+    path('lugares/agregar/', lugar_views.crear_lugar, name='agregar_lugar_usuario'),  # Alias para compatibilidad
+    path('lugares/<int:lugar_id>/', lugar_views.detalle_lugar, name='detalle_lugar'),
+    path('lugares/<int:lugar_id>/editar/', lugar_views.editar_lugar, name='editar_lugar'),
+    path('lugares/<int:lugar_id>/eliminar/', lugar_views.eliminar_lugar, name='eliminar_lugar'),
+    path('lugares/cercanos/', _vista(lugar_views.lugares_cercanos, lugar_views.lugares_cercanos_async), name='lugares_cercanos'),
+
+    # ========== EVENTOS ==========
+    path('eventos/', _vista(evento_views.lista_eventos, evento_views.lista_eventos_async), name='eventos'),  # Nombre compatible
+    path('eventos/lista/', _vista(evento_views.lista_eventos, evento_views.lista_eventos_async), name='lista_eventos'),
+    path('eventos/crear/', evento_views.crear_evento, name='crear_evento'),
+    path('eventos/<int:evento_id>/', evento_views.detalle_evento, name='detalle_evento'),
+    path('eventos/<int:evento_id>/editar/', evento_views.editar_evento, name='editar_evento'),
+    path('eventos/<int:evento_id>/eliminar/', evento_views.eliminar_evento, name='eliminar_evento'),
+    path('eventos/<int:evento_id>/inscribir/', evento_views.inscribir_evento, name='inscribir_evento'),
+    path('eventos/<int:evento_id>/desinscribir/', evento_views.desinscribir_evento, name='desinscribir_evento'),
+    path('eventos/mis-eventos/', evento_views.mis_eventos, name='mis_eventos'),
+    path('eventos/historial/', evento_views.historial_eventos, name='historial_eventos'),
+
+    # ========== USUARIOS ==========
+    path('usuarios/', user_views.lista_usuarios, name='lista_usuarios'),
+    path('perfil/', user_views.perfil_usuario, name='perfil_usuario'),
+    path('usuarios/<int:user_id>/', user_views.detalle_usuario, name='detalle_usuario'),
+    path('usuarios/<int:user_id>/editar/', user_views.editar_usuario, name='editar_usuario'),
+    path('usuarios/<int:user_id>/eliminar/', user_views.eliminar_usuario, name='eliminar_usuario'),
+
+    # ========== API ==========
+    path('api/sync/<str:recurso>/', api_views.sync_cambios, name='api_sync'),
+    path('api/lugares/', _vista(api_views.api_lugares, api_views.api_lugares_async), name='api_lugares'),
+    path('api/eventos/', _vista(api_views.api_eventos, api_views.api_eventos_async), name='api_eventos'),
+    path('api/mis-inscripciones/', api_views.api_mis_inscripciones, name='api_mis_inscripciones'),
+
+    # ========== EXPORTACIÓN (staff) ==========
+    path('exportar/<str:recurso>/', exportacion_views.exportar, name='exportar'),
+
+    # ========== MÉTRICAS ==========
+    path('metrics/', metricas_views.metricas_prometheus, name='metricas'),
+]
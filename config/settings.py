@@ -1,138 +1,349 @@
-"""
-Configuración de Django - ARQUITECTURA EN CAPAS
-
-Esta es una configuración mínima para demostración.
-En producción necesitarías configuraciones adicionales.
-"""
-
-import os
-from pathlib import Path
-
-# Build paths inside the project
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-demo-key-change-in-production'
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-ALLOWED_HOSTS = []
-
-
-# Application definition
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    
-    # Nuestra aplicación
-    'app',
-]
-
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'config.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        # Usar los templates del proyecto original
-        'DIRS': [
-            BASE_DIR.parent / 'app' / 'templates',  # Templates del proyecto original
-            BASE_DIR / 'templates',
-        ],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'config.wsgi.application'
-
-
-# Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-
-# Password validation
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-
-# Internationalization
-LANGUAGE_CODE = 'es-pe'
-TIME_ZONE = 'America/Lima'
-USE_I18N = True
-USE_TZ = True
-
-
-# Static files (CSS, JavaScript, Images)
-STATIC_URL = '/static/'
-STATIC_ROOT = BASE_DIR / 'staticfiles'
-
-# Usar los archivos estáticos del proyecto original
-STATICFILES_DIRS = [
-    BASE_DIR.parent / 'app' / 'static',  # Static del proyecto original
-    BASE_DIR.parent / 'staticfiles',     # Staticfiles del proyecto original
-    BASE_DIR / 'static',
-]
-
-
-# Default primary key field type
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-
-# Configuración de autenticación personalizada
-AUTH_USER_MODEL = 'app.CustomUser'
-
-# URLs de redirección
-LOGIN_URL = 'login'
-LOGIN_REDIRECT_URL = 'home'
-LOGOUT_REDIRECT_URL = 'login'
-
-
-# Configuración de mensajes
-from django.contrib.messages import constants as messages
-
-MESSAGE_TAGS = {
-    messages.DEBUG: 'alert-info',
-    messages.INFO: 'alert-info',
-    messages.SUCCESS: 'alert-success',
-    messages.WARNING: 'alert-warning',
-    messages.ERROR: 'alert-danger',
-}
+"""
+Configuración de Django - ARQUITECTURA EN CAPAS
+
+Esta es una configuración mínima para demostración.
+En producción necesitarías configuraciones adicionales.
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'django-insecure-demo-key-change-in-production'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+
+    # Nuestra aplicación
+    'app',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'app.presentation.middleware.ConsultasMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app.presentation.middleware.PrimariaTrasEscrituraMiddleware',
+    'app.presentation.middleware.CampusMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'app.presentation.middleware.PerfiladorMiddleware',
+]
+
+ROOT_URLCONF = 'config.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Usar los templates del proyecto original
+        'DIRS': [
+            BASE_DIR.parent / 'app' / 'templates',  # Templates del proyecto original
+            BASE_DIR / 'templates',
+        ],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+# Perfil de plantillas: 'desarrollo' (por defecto) o 'produccion'
+# En producción cada worker compila cada plantilla una sola vez (cached.Loader
+# explícito, sin volver a mirar los archivos) y sin información de depuración.
+# Ej: DJANGO_PERFIL_PLANTILLAS=produccion gunicorn config.wsgi
+PERFIL_PLANTILLAS = os.environ.get('DJANGO_PERFIL_PLANTILLAS', 'desarrollo')
+
+if PERFIL_PLANTILLAS == 'produccion':
+    TEMPLATES[0]['APP_DIRS'] = False  # Incompatible con 'loaders'
+    TEMPLATES[0]['OPTIONS']['debug'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+WSGI_APPLICATION = 'config.wsgi.application'
+
+# Vistas async para las listas y búsquedas (lista_lugares, lista_eventos,
+# lugares_cercanos, api_lugares, api_eventos): solo tiene sentido con un
+# servidor ASGI; con WSGI cada vista async se ejecuta en su propio bucle.
+# Ej: DJANGO_VISTAS_ASYNC=1 uvicorn config.asgi:application --workers 4
+VISTAS_ASYNC = os.environ.get('DJANGO_VISTAS_ASYNC', '') == '1'
+
+
+# Database
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+# Réplicas de lectura (opcional)
+# Ej: DJANGO_DB_REPLICAS="/srv/bd/replica1.sqlite3,/srv/bd/replica2.sqlite3"
+# Con SQLite, las copias se refrescan con: python manage.py sincronizar_replicas
+# Solo se leen de ellas lugares y eventos; usuarios y sesiones, siempre de la primaria
+DATABASE_REPLICAS = {'default': []}
+
+for numero, ruta in enumerate(filter(None, os.environ.get('DJANGO_DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica_{numero}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ruta.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS['default'].append(alias)
+
+# Sharding por campus (opcional): Lugar/Evento de cada campus en su propia base;
+# usuarios, sesiones y admin quedan en la base compartida ('default').
+# Ej: DJANGO_CAMPUS_SHARDS="huanuco=/srv/bd/huanuco.sqlite3,lima=/srv/bd/lima.sqlite3"
+# Cada shard se migra con: python manage.py migrate --database campus_huanuco
+CAMPUS_POR_DEFECTO = os.environ.get('DJANGO_CAMPUS_POR_DEFECTO', 'tingo-maria')
+CAMPUS_SHARDS = {CAMPUS_POR_DEFECTO: 'default'}
+
+for entrada in filter(None, os.environ.get('DJANGO_CAMPUS_SHARDS', '').split(',')):
+    campus, ruta = (parte.strip() for parte in entrada.split('=', 1))
+    alias = 'campus_' + campus.replace('-', '_')
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ruta,
+    }
+    CAMPUS_SHARDS[campus] = alias
+
+DATABASE_ROUTERS = [
+    'app.data.routers.ShardRouter',
+    'app.data.routers.ReplicaRouter',
+]
+
+# Perfil de base de datos: 'desarrollo' (por defecto) o 'produccion'
+# Ej: DJANGO_PERFIL_BD=produccion python manage.py runserver
+PERFIL_BD = os.environ.get('DJANGO_PERFIL_BD', 'desarrollo')
+
+# PRAGMAs del perfil de producción (ver app/data/sqlite_pragmas.py)
+SQLITE_PRAGMAS_PRODUCCION = {
+    'journal_mode': 'WAL',           # Lectores concurrentes con un escritor
+    'synchronous': 'NORMAL',         # Seguro con WAL, menos fsync por commit
+    'busy_timeout': 5000,            # Esperar el bloqueo (ms) en vez de fallar
+    'mmap_size': 268435456,          # 256 MB de lectura vía mmap
+    'cache_size': -65536,            # 64 MB de caché de páginas (KiB si es negativo)
+    'temp_store': 'MEMORY',
+}
+
+# PRAGMAs aplicados a cada conexión nueva
+SQLITE_PRAGMAS = {}
+
+if PERFIL_BD == 'produccion':
+    SQLITE_PRAGMAS = SQLITE_PRAGMAS_PRODUCCION
+
+    for bd in DATABASES.values():
+        bd['CONN_MAX_AGE'] = 600        # Conexiones persistentes
+        bd['CONN_HEALTH_CHECKS'] = True
+        # BEGIN IMMEDIATE: toma el bloqueo de escritura al inicio y evita
+        # los "database is locked" al promover una lectura a escritura
+        bd.setdefault('OPTIONS', {})['transaction_mode'] = 'IMMEDIATE'
+
+# Segundos que se siguen leyendo de la primaria tras una escritura
+REPLICA_RETRASO_MAXIMO = 5
+
+
+# Password validation
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+LANGUAGE_CODE = 'es-pe'
+TIME_ZONE = 'America/Lima'
+USE_I18N = True
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Usar los archivos estáticos del proyecto original
+STATICFILES_DIRS = [
+    BASE_DIR.parent / 'app' / 'static',  # Static del proyecto original
+    BASE_DIR.parent / 'staticfiles',     # Staticfiles del proyecto original
+    BASE_DIR / 'static',
+]
+
+# collectstatic (app/presentation/estaticos.py): nombres con hash en el manifiesto
+# (servir STATIC_ROOT con Cache-Control: max-age=31536000, immutable), .gz/.br
+# precomprimidos y variantes WebP/MP4 de imágenes y GIF animados (si están
+# instalados Pillow y ffmpeg). Con DEBUG se siguen sirviendo los originales.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'app.presentation.estaticos.EstaticosOptimizados'},
+}
+
+# Anchos (px) de las variantes WebP para srcset
+ESTATICOS_ANCHOS = (480, 960, 1440)
+
+
+# Default primary key field type
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Configuración de autenticación personalizada
+AUTH_USER_MODEL = 'app.CustomUser'
+
+# URLs de redirección
+LOGIN_URL = 'login'
+LOGIN_REDIRECT_URL = 'home'
+LOGOUT_REDIRECT_URL = 'login'
+
+
+# Configuración de mensajes
+from django.contrib.messages import constants as messages
+
+MESSAGE_TAGS = {
+    messages.DEBUG: 'alert-info',
+    messages.INFO: 'alert-info',
+    messages.SUCCESS: 'alert-success',
+    messages.WARNING: 'alert-warning',
+    messages.ERROR: 'alert-danger',
+}
+
+
+# Monitor de consultas SQL por petición (app.presentation.middleware.ConsultasMiddleware).
+# Instrumentación de desarrollo: por defecto solo con DEBUG; DJANGO_MONITOR_CONSULTAS=1
+# lo activa en cualquier entorno (p. ej. un servidor de pruebas de carga)
+MONITOR_CONSULTAS = os.environ.get('DJANGO_MONITOR_CONSULTAS', '1' if DEBUG else '0') == '1'
+
+# Veces que se repite una misma consulta en una petición para marcarla como N+1
+CONSULTAS_UMBRAL_N1 = 5
+
+# Métricas de LugarLogic/EventoLogic/UserLogic en /metrics/ (opt-in)
+INSTRUMENTAR_LOGICA = os.environ.get('DJANGO_INSTRUMENTAR_LOGICA', '0') == '1'
+
+# Token Bearer para que Prometheus lea /metrics/ (sin token: solo staff)
+METRICAS_TOKEN = os.environ.get('DJANGO_METRICAS_TOKEN', '')
+
+# Perfilador bajo demanda (?_perfil=1 o X-Perfilar: 1, solo staff).
+# Sin directorio el middleware queda desactivado.
+PERFILADOR_DIR = os.environ.get('DJANGO_PERFILADOR_DIR') or None
+PERFILADOR_INTERVALO = 0.001  # Segundos entre muestras de pila
+
+# Caché en dos niveles (app/data/cache_dos_niveles.py): LRU en cada proceso
+# delante de una caché en disco compartida por todos los workers. Los cambios
+# de un worker llegan a los demás por los sellos que se guardan en disco.
+# CacheArchivos: incr atómico entre procesos y limpieza cada CULL_CADA escrituras.
+CACHE_DIR = os.environ.get('DJANGO_CACHE_DIR') or str(BASE_DIR / 'cache')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'app.data.cache_dos_niveles.CacheDosNiveles',
+        'TIMEOUT': 600,
+        'OPTIONS': {
+            'L2': 'compartida',
+            'MAX_ENTRADAS_L1': int(os.environ.get('DJANGO_CACHE_MAX_L1', '1000')),
+        },
+    },
+    'compartida': {
+        'BACKEND': 'app.data.cache_dos_niveles.CacheArchivos',
+        'LOCATION': CACHE_DIR,
+        'TIMEOUT': 600,
+        'OPTIONS': {'MAX_ENTRIES': 50000, 'CULL_CADA': 100},
+    },
+}
+
+# Caché de listas y páginas (app/business/cache_versionada.py). Las entradas
+# se invalidan por versión al cambiar los modelos; esto es solo el máximo.
+CACHE_LISTAS_SEGUNDOS = int(os.environ.get('DJANGO_CACHE_LISTAS_SEGUNDOS', '600'))
+
+# HTML común de las tarjetas de eventos y lugares (app/templatetags/tarjetas.py).
+# La clave cambia con fecha_actualizacion, así que puede durar mucho.
+CACHE_FRAGMENTOS_SEGUNDOS = int(os.environ.get('DJANGO_CACHE_FRAGMENTOS_SEGUNDOS', '86400'))
+
+# Identificador del despliegue (p. ej. el commit). Forma parte del ETag de las
+# listas (app/presentation/condicional.py): con plantillas nuevas los
+# navegadores vuelven a descargar la página en vez de recibir 304.
+VERSION_DESPLIEGUE = os.environ.get('DJANGO_VERSION_DESPLIEGUE', '')
+
+# Registro de consultas lentas (app.data.consultas_lentas): SQL, parámetros,
+# origen y EXPLAIN QUERY PLAN de cada sentencia que tarde al menos este
+# umbral, en un JSONL rotativo. Opt-in: sin DJANGO_CONSULTAS_LENTAS_MS (p. ej. 100)
+# no se instala nada (cada conexión pagaría el envoltorio y el EXPLAIN).
+_consultas_lentas_ms = os.environ.get('DJANGO_CONSULTAS_LENTAS_MS', '')
+CONSULTAS_LENTAS_MS = float(_consultas_lentas_ms) if _consultas_lentas_ms else None
+CONSULTAS_LENTAS_LOG = os.environ.get('DJANGO_CONSULTAS_LENTAS_LOG') or str(BASE_DIR / 'logs' / 'consultas_lentas.jsonl')
+
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+        'jsonl': {
+            'format': '{message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'consola': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+        'consultas_lentas': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': CONSULTAS_LENTAS_LOG,
+            'formatter': 'jsonl',
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,  # El directorio lo crea consultas_lentas.instalar si hace falta
+        },
+    },
+    'loggers': {
+        'app': {
+            'handlers': ['consola'],
+            'level': 'INFO',
+        },
+        'app.consultas_lentas': {
+            'handlers': ['consultas_lentas'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -1,11 +1,11 @@
-"""
-URLs Principales - ARQUITECTURA EN CAPAS
-"""
-
-from django.contrib import admin
-from django.urls import path, include
-
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('', include('app.urls')),
-]
+"""
+URLs Principales - ARQUITECTURA EN CAPAS
+"""
+
+from django.contrib import admin
+from django.urls import path, include
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include('app.urls')),
+]